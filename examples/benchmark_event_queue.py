@@ -0,0 +1,20 @@
+import random
+import timeit
+
+from foronoi import Voronoi, BoundingBox
+from foronoi.events import SiteStreamEventQueue, HeapEventQueue, PriorityEventQueue
+
+# Define some random points (a.k.a sites or cell points)
+random.seed(0)
+points = [(random.uniform(0, 100), random.uniform(0, 100)) for _ in range(2000)]
+
+
+def run(event_queue_class):
+    v = Voronoi(BoundingBox(-1, 101, -1, 101), numeric="float64", event_queue_class=event_queue_class)
+    v.create_diagram(points=points)
+
+
+# Compare the sorted site stream and the heapq based queue with the queue.PriorityQueue based queue
+for event_queue_class in [SiteStreamEventQueue, HeapEventQueue, PriorityEventQueue]:
+    seconds = min(timeit.repeat(lambda: run(event_queue_class), number=1, repeat=3))
+    print(f"{event_queue_class.__name__:>20}: {seconds:.3f}s")
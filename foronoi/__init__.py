@@ -1,8 +1,12 @@
 from foronoi.algorithm import Algorithm as Voronoi
 from foronoi.graph.coordinate import Coordinate
+from foronoi.graph.numeric import Numeric
 from foronoi.graph.bounding_box import BoundingBox
 from foronoi.graph.point import Point
 from foronoi.graph.polygon import Polygon
+from foronoi.graph.voronoi_arrays import VoronoiArrays
+from foronoi.graph.unbounded_diagram import UnboundedDiagram
+from foronoi.lloyd import Lloyd
 from foronoi.visualization import Visualizer
 from foronoi.observers.tree_observer import TreeObserver
 from foronoi.observers.debug_observer import DebugObserver
@@ -1,25 +1,35 @@
-from queue import PriorityQueue
+import math
 from typing import List
 
+import numpy as np
+
 from foronoi.observers.message import Message
 from foronoi.observers.subject import Subject
 from foronoi.graph.point import Point
 from foronoi.graph.half_edge import HalfEdge
 from foronoi.graph.vertex import Vertex
-from foronoi.graph.algebra import Algebra
 from foronoi.graph.polygon import Polygon
+from foronoi.graph.numeric import Numeric
+from foronoi.graph.predicates import Predicates
+from foronoi.graph.dcel import DCEL
+from foronoi.graph.voronoi_arrays import CellMetrics
+from foronoi.graph.voronoi_arrays import VoronoiArrays
+from foronoi.graph.unbounded_diagram import UnboundedDiagram
+from foronoi.graph.diagram_editor import DiagramEditor
 from foronoi.nodes.leaf_node import LeafNode
 from foronoi.nodes.arc import Arc
 from foronoi.nodes.breakpoint import Breakpoint
 from foronoi.nodes.internal_node import InternalNode
 from foronoi.events.circle_event import CircleEvent
 from foronoi.events.site_event import SiteEvent
+from foronoi.events.event_queue import HeapEventQueue
 from foronoi.tree.node import Node
 from foronoi.tree.tree import Tree
 
 
 class Algorithm(Subject):
-    def __init__(self, bounding_poly: Polygon = None, remove_zero_length_edges=True):
+    def __init__(self, bounding_poly: Polygon = None, remove_zero_length_edges=True, numeric=Numeric.DECIMAL,
+                 event_queue_class=HeapEventQueue, zero_length_tolerance=0):
         """
         A Python implementation of Fortune's algorithm based on the description of "Computational Geometry:
         Algorithms and Applications" by de Berg et al.
@@ -27,15 +37,27 @@ class Algorithm(Subject):
         Parameters
         ----------
         bounding_poly: Polygon
-            The bounding box or bounding polygon around the voronoi diagram
+            The bounding box or bounding polygon around the voronoi diagram. Without it, the diagram is not clipped,
+            and can be exported with :func:`get_unbounded` or clipped afterwards with :func:`clip`.
         remove_zero_length_edges: bool
             Removes zero length edges and combines vertices with the same location into one
+        zero_length_tolerance: float
+            Vertices of which both coordinates differ by at most this distance are combined into one when removing
+            zero length edges. By default, only vertices with exactly the same location are combined.
+        numeric: str
+            The numeric backend used for the sweep, clipping and clean-up. Either "decimal" (the default and
+            reference mode) or "float64", which uses native Python floats and takes a little over half of the time
+            (see :class:`foronoi.graph.Numeric`).
+        event_queue_class: type
+            The class of the event queue. Either :class:`foronoi.events.HeapEventQueue` (the default),
+            :class:`foronoi.events.SiteStreamEventQueue` or :class:`foronoi.events.PriorityEventQueue`, which is based
+            on :class:`queue.PriorityQueue`.
 
         Attributes
         ----------
         bounding_poly: Polygon
             The bounding box (or polygon) around the edge
-        event_queue: PriorityQueue
+        event_queue: HeapEventQueue
             Event queue for upcoming site and circle events
         status_tree: Node
             The status structure is a data structure that stores the relevant situation at the current position of
@@ -55,10 +77,11 @@ class Algorithm(Subject):
 
         # The bounding box around the edge
         self.bounding_poly: Polygon = bounding_poly
-        self.bounding_poly.inherit_observers_from(self)
+        if self.bounding_poly is not None:
+            self.bounding_poly.inherit_observers_from(self)
 
         # Event queue for upcoming site and circle events
-        self.event_queue = PriorityQueue()
+        self.event_queue = event_queue_class()
         self.event = None
 
         # Root of beach line
@@ -82,8 +105,21 @@ class Algorithm(Subject):
         # List of vertices
         self._vertices = set()
 
-        # Whether to remove zero length edges
+        # Whether to remove zero length edges, and the distance below which vertices are combined
         self.remove_zero_length_edges = remove_zero_length_edges
+        self.zero_length_tolerance = zero_length_tolerance
+
+        # The numeric backend that is used for all coordinates
+        self.numeric = Numeric.validate(numeric)
+
+        # Whether the diagram has been clipped against the bounding polygon
+        self._finished = False
+
+        # Makes local changes to the finished diagram
+        self._editor = None
+
+        # The arrays of the finished diagram, until one of its sites changes
+        self._arrays = None
 
     @property
     def arcs(self) -> List[Arc]:
@@ -104,18 +140,15 @@ class Algorithm(Subject):
 
         Returns
         -------
-        event_queue: PriorityQueue
+        event_queue: HeapEventQueue
             Event queue for upcoming site and circle events
         """
 
         # Store the points for visualization
         self.sites = points
 
-        # Initialize event queue with all site events.
-        for index, point in enumerate(points):
-            # Create site event
-            site_event = SiteEvent(point=point)
-            self.event_queue.put(site_event)
+        # Initialize event queue with all site events at once
+        self.event_queue.extend(SiteEvent(point=point) for point in points)
 
         return self.event_queue
 
@@ -140,86 +173,473 @@ class Algorithm(Subject):
 
         Parameters
         ----------
-        points: list(Point)
-            A set of point sites in the plane.
+        points: list(tuple) or numpy.ndarray
+            A set of point sites in the plane, either as a list of (x, y)-tuples or as an (N, 2) array.
 
         Returns
         -------
         Output. The Voronoi diagram `Vor(P)` given inside a bounding box in a doublyconnected edge list `D`.
         """
 
-        points = [Point(x, y) for x, y in points]
+        self.sweep(points)
 
-        # Initialize all points
-        self.initialize(points)
-        index = 0
+        # Without a bounding polygon, the diagram stays unbounded
+        if self.bounding_poly is None:
+            self._finish_unbounded()
+        else:
+            self._finish()
 
-        # The first point (needed for bounding box)
-        genesis_point = None
+    def sweep(self, points: list):
+        """
+        Run the sweep of :func:`create_diagram` (steps 1-6), without clipping the result.
 
-        while not self.event_queue.empty():
+        The edges that are still being traced out when the sweep finishes are half-infinite. Their origins remain
+        breakpoints, which describe the ray along which the edge runs off to infinity. The unclipped diagram can be
+        clipped against any number of polygons with :func:`clip`, without running the sweep again.
 
-            # Pop the event queue with the highest priority
-            event = self.event_queue.get()
+        Examples
+        --------
+        >>> v = Voronoi()
+        >>> v.sweep(points)
+        >>> regions = [v.clip(polygon) for polygon in polygons]
 
-            # Set genesis point
-            genesis_point = genesis_point or event.point
+        Parameters
+        ----------
+        points: list(tuple) or numpy.ndarray
+            A set of point sites in the plane, either as a list of (x, y)-tuples or as an (N, 2) array.
+        """
 
-            # Handle circle events
-            if isinstance(event, CircleEvent) and event.is_valid:
-                # Update sweep line position
-                self.sweep_line = event.yd
+        if isinstance(points, np.ndarray):
+            if points.ndim != 2 or points.shape[1] != 2:
+                raise ValueError(f"Expected an array of shape (N, 2), got an array of shape {points.shape}.")
 
-                # Debugging
-                self.notify_observers(
-                    Message.DEBUG,
-                    payload=f"# Handle circle event at {event.yd:.3f} with center= {event.center} and arcs= {event.point_triple}"
-                )
+            # Converting the array to Python floats at once is much faster than converting every element
+            points = points.astype(float).tolist()
 
-                # Handle the event
-                self.handle_circle_event(event)
+        with Numeric.use(self.numeric):
 
-            # Handle site events
-            elif isinstance(event, SiteEvent):
+            points = [Point(x, y) for x, y in points]
 
-                # Give the points a simple name
-                event.point.name = index
-                index += 1
+            # Initialize all points
+            self.initialize(points)
+            index = 0
 
-                # Update sweep line position
-                self.sweep_line = event.yd
+            # The first point (needed for bounding box)
+            genesis_point = None
 
-                # Debugging
-                self.notify_observers(
-                    Message.DEBUG,
-                    payload=f"# Handle site event at y={event.yd:.3f} with point {event.point}"
-                )
+            while not self.event_queue.empty():
 
-                # Handle the event
-                self.handle_site_event(event)
-            else:
-                # Skip the step if circle event is no longer valid
-                continue
+                # Pop the event queue with the highest priority
+                event = self.event_queue.get()
+
+                # Set genesis point
+                genesis_point = genesis_point or event.point
+
+                # Handle circle events
+                if isinstance(event, CircleEvent) and event.is_valid:
+                    # Update sweep line position
+                    self.sweep_line = event.yd
+
+                    # Debugging
+                    if self._observers:
+                        self.notify_observers(
+                            Message.DEBUG,
+                            payload=f"# Handle circle event at {event.yd:.3f} with center= {event.center} and arcs= {event.point_triple}"
+                        )
+
+                    # Handle the event
+                    self.handle_circle_event(event)
+
+                # Handle the first row of sites with the same y-coordinate at once
+                elif isinstance(event, SiteEvent) and self.status_tree is None:
+                    row = self._get_row(event)
+
+                    # Give the points a simple name
+                    for site_event in row:
+                        site_event.point.name = index
+                        index += 1
+
+                    # Update sweep line position
+                    self.sweep_line = event.yd
+
+                    # Debugging
+                    self.notify_observers(
+                        Message.DEBUG,
+                        payload=f"# Handle {len(row)} site events at y={event.yd:.3f}"
+                    )
+
+                    # Handle the events
+                    self.handle_first_row(row)
+                    event = row[-1]
+
+                # Handle site events
+                elif isinstance(event, SiteEvent):
+
+                    # Give the points a simple name
+                    event.point.name = index
+                    index += 1
 
-            self.event = event
-            self.notify_observers(Message.STEP_FINISHED)
+                    # Update sweep line position
+                    self.sweep_line = event.yd
 
-        self.notify_observers(Message.DEBUG, payload="# Sweep finished")
-        self.notify_observers(Message.SWEEP_FINISHED)
+                    # Debugging
+                    if self._observers:
+                        self.notify_observers(
+                            Message.DEBUG,
+                            payload=f"# Handle site event at y={event.yd:.3f} with point {event.point}"
+                        )
 
-        # Finish with the bounding box
-        self.edges = self.bounding_poly.finish_edges(
-            edges=self.edges, vertices=self._vertices, points=self.sites, event_queue=self.event_queue
+                    # Handle the event
+                    self.handle_site_event(event)
+                else:
+                    # Skip the step if circle event is no longer valid
+                    continue
+
+                self.event = event
+                self.notify_observers(Message.STEP_FINISHED)
+
+            # Leave out the edges that were deleted during the sweep
+            self.edges = [edge for edge in self.edges if not edge.removed]
+
+            self.notify_observers(Message.DEBUG, payload="# Sweep finished")
+            self.notify_observers(Message.SWEEP_FINISHED)
+
+    def clip(self, bounding_poly: Polygon):
+        """
+        Clip the unclipped diagram of :func:`sweep` against a bounding polygon. The diagram itself is left untouched,
+        so that it can be clipped against other polygons as well.
+
+        The region has to contain all sites, since every site keeps its cell. Sites on its border are allowed.
+
+        Parameters
+        ----------
+        bounding_poly: Polygon
+            The bounding box or bounding polygon. Like the bounding polygon of a new :class:`Algorithm`, it becomes
+            part of the result and should not be used for any other diagram.
+
+        Returns
+        -------
+        algorithm: Algorithm
+            A new, finished diagram with its own sites, edges and vertices
+        """
+        if self._finished:
+            raise ValueError("Only a diagram that has not been clipped yet can be clipped. Use sweep() instead of "
+                             "create_diagram().")
+
+        with Numeric.use(self.numeric):
+            bounding_poly.convert_coordinates()
+            outside = bounding_poly._outside(self.sites)
+        if outside:
+            raise ValueError(f"The bounding polygon does not contain all sites, for example ({outside[0].x}, "
+                             f"{outside[0].y}). Clip with a polygon around all sites.")
+
+        result = Algorithm(bounding_poly, remove_zero_length_edges=self.remove_zero_length_edges, numeric=self.numeric,
+                           event_queue_class=type(self.event_queue), zero_length_tolerance=self.zero_length_tolerance)
+        result.sweep_line = self.sweep_line
+        with Numeric.use(self.numeric):
+            result.sites, result.edges, result._vertices = self._copy_diagram()
+        result._finish()
+        return result
+
+    def _copy_diagram(self):
+        """
+        Copy the sites, half edges and vertices of the unclipped diagram, with all pointers between them. The
+        breakpoints at the origins of half-infinite edges are shared, because clipping only reads them.
+
+        Returns
+        -------
+        sites: list(Point)
+        edges: list(HalfEdge)
+        vertices: set(Vertex)
+        """
+        sites = {site: Point(site.xd, site.yd, name=site.name) for site in self.sites}
+        half_edges = {}
+        for edge in self.edges:
+            for half_edge in (edge, edge.twin):
+                half_edges[half_edge] = HalfEdge(None)
+
+        vertices = {}
+        for vertex in self._vertices:
+            vertices[vertex] = Vertex(vertex.xd, vertex.yd)
+        for half_edge in half_edges:
+            if isinstance(half_edge.origin, Vertex) and half_edge.origin not in vertices:
+                vertices[half_edge.origin] = Vertex(half_edge.origin.xd, half_edge.origin.yd)
+
+        # Relink the copies by following the pointers of the originals
+        for site, copied in sites.items():
+            copied.first_edge = half_edges.get(site.first_edge)
+        for vertex, copied in vertices.items():
+            copied.connected_edges = [half_edges[edge] for edge in vertex.connected_edges]
+        for half_edge, copied in half_edges.items():
+            copied.incident_point = sites.get(half_edge.incident_point)
+            copied.twin = half_edges.get(half_edge.twin)
+            copied.next = half_edges.get(half_edge.next)
+            copied.prev = half_edges.get(half_edge.prev)
+            copied.origin = vertices.get(half_edge.origin, half_edge.origin)
+            copied.removed = half_edge.removed
+
+        return (
+            [sites[site] for site in self.sites],
+            [half_edges[edge] for edge in self.edges],
+            {vertices[vertex] for vertex in self._vertices},
         )
 
-        self.edges, self._vertices = self.bounding_poly.finish_polygon(self.edges, self._vertices, self.sites)
+    def _finish(self):
+        """
+        Clip the swept diagram against :attr:`bounding_poly` (steps 7-9 of :func:`create_diagram`).
+        """
+        with Numeric.use(self.numeric):
+
+            # Store the bounding polygon in the same numeric backend as the points
+            self.bounding_poly.convert_coordinates()
+
+            # Finish with the bounding box
+            self.edges = self.bounding_poly.finish_edges(
+                edges=self.edges, vertices=self._vertices, points=self.sites, event_queue=self.event_queue
+            )
+
+            self.edges, self._vertices = self.bounding_poly.finish_polygon(self.edges, self._vertices, self.sites)
+
+            if self.remove_zero_length_edges:
+                self.clean_up_zero_length_edges()
+
+            self._finished = True
+            self._arrays = None
+
+            # Final visualization
+            self.notify_observers(Message.DEBUG, payload="# Voronoi finished")
+            self.notify_observers(Message.VORONOI_FINISHED)
+
+    def _finish_unbounded(self):
+        """
+        Finish the swept diagram without a bounding polygon. The half-infinite edges keep their breakpoints as origin.
+        """
+        with Numeric.use(self.numeric):
+            if self.remove_zero_length_edges:
+                self.clean_up_zero_length_edges()
+
+            self.notify_observers(Message.DEBUG, payload="# Voronoi finished")
+            self.notify_observers(Message.VORONOI_FINISHED)
+
+    def insert_site(self, x, y) -> Point:
+        """
+        Insert a site into the finished diagram, without running the sweep again. The cell of the new site is carved
+        out of the cells around it, and only these cells are changed (see :class:`foronoi.graph.DiagramEditor`).
+
+        Examples
+        --------
+        >>> v = Voronoi(BoundingBox(0, 10, 0, 10))
+        >>> v.create_diagram(points)
+        >>> site = v.insert_site(2.5, 7.5)
+        >>> site.area()
+
+        Parameters
+        ----------
+        x: float
+            The x-coordinate of the new site
+        y: float
+            The y-coordinate of the new site
+
+        Returns
+        -------
+        site: Point
+            The new site, which is appended to :attr:`sites`
+        """
+        return self._get_editor().insert_site(x, y)
+
+    def remove_site(self, point: Point):
+        """
+        Remove a site from the finished diagram, without running the sweep again. The cell of the site is divided
+        among its neighbors, and only these cells are changed.
+
+        Parameters
+        ----------
+        point: Point
+            The site to remove, which is taken out of :attr:`sites`
+        """
+        self._get_editor().remove_site(point)
+
+    def move_site(self, point: Point, x, y):
+        """
+        Move a site of the finished diagram to a new location, without running the sweep again. Only the cells
+        around the old and the new location are changed.
+
+        Parameters
+        ----------
+        point: Point
+            The site to move, which keeps its place in :attr:`sites`
+        x: float
+            The new x-coordinate
+        y: float
+            The new y-coordinate
+        """
+        self._get_editor().move_site(point, x, y)
+
+    def move_sites(self, positions) -> List[Point]:
+        """
+        Move all sites of the finished diagram at once, for example in every frame of a simulation. Where the
+        structure of the diagram stays the same, the vertices are updated in one vectorized pass. Only the cells
+        around the edges that flip are repaired (see :class:`foronoi.graph.KineticTopology`). When too many sites
+        would change, the diagram is built again instead (see :attr:`foronoi.graph.DiagramEditor.rebuild_fraction`).
+        The sites stay the same objects either way.
+
+        Only straight bounding polygons are supported.
+
+        Examples
+        --------
+        >>> v = Voronoi(BoundingBox(0, 10, 0, 10))
+        >>> v.create_diagram(points)
+        >>> for frame in range(100):
+        ...     points = points + velocities
+        ...     v.move_sites(points)
+
+        Parameters
+        ----------
+        positions: numpy.ndarray
+            The (N, 2) array of the new positions, in the order of :attr:`sites`
+
+        Returns
+        -------
+        changed: list(Point)
+            The sites of which the structure of the cell changed
+        """
+        return self._get_editor().move_sites(positions)
+
+    def _get_editor(self):
+        if not self._finished:
+            raise ValueError("Sites can only be changed in a finished diagram that is clipped by a bounding polygon.")
+
+        # The sites are about to change
+        self._arrays = None
+
+        if self._editor is None:
+            self._editor = DiagramEditor(self)
+        return self._editor
+
+    def get_unbounded(self) -> UnboundedDiagram:
+        """
+        Get the swept diagram as arrays, before it is clipped, with the half-infinite edges as rays. Use it after
+        :func:`sweep`, or after :func:`create_diagram` without a bounding polygon.
+
+        Returns
+        -------
+        diagram: UnboundedDiagram
+            The vertices, finite edges, rays and hull sites of the diagram, with the sites in the order of the input
+            points
+        """
+        if self._finished:
+            raise ValueError("The diagram has been clipped already. Use sweep(), or leave out the bounding polygon.")
+
+        return UnboundedDiagram.from_edges(self.sites, self.edges)
 
-        if self.remove_zero_length_edges:
-            self.clean_up_zero_length_edges()
+    def get_arrays(self) -> VoronoiArrays:
+        """
+        Get the finished diagram as NumPy arrays, with the cells in the order of the input points. The arrays are
+        kept until a site is inserted, removed or moved, and are read-only, since later calls return the same arrays.
 
-        # Final visualization
-        self.notify_observers(Message.DEBUG, payload="# Voronoi finished")
-        self.notify_observers(Message.VORONOI_FINISHED)
+        Returns
+        -------
+        arrays: VoronoiArrays
+            The vertices, the edges, the sites on both sides of each edge, and the vertices of each cell
+        """
+        if self._arrays is not None:
+            return self._arrays
+
+        arrays = VoronoiArrays.from_dcel(self.get_dcel())
+        if self._finished:
+            for array in arrays:
+                array.flags.writeable = False
+            self._arrays = arrays
+        return arrays
+
+    def cell_metrics(self) -> CellMetrics:
+        """
+        Calculate the area, centroid, perimeter and bounding box of every cell of the finished diagram at once.
+
+        Returns
+        -------
+        metrics: CellMetrics
+            The metrics of the cells, in the order of the input points
+        """
+        return self.get_arrays().cell_metrics()
+
+    def get_dcel(self) -> DCEL:
+        """
+        Export the doubly connected edge list of the finished diagram to contiguous arrays. The export is a copy,
+        that does not follow later edits of the diagram.
+
+        Returns
+        -------
+        dcel: DCEL
+            The array-backed doubly connected edge list, with the sites in the order of the input points
+        """
+        return DCEL.from_sites(self.sites)
+
+    def _get_row(self, event):
+        """
+        Take all site events with the same y-coordinate as `event` from the event queue.
+
+        Parameters
+        ----------
+        event: SiteEvent
+            The first event of the row, which has already been taken from the queue
+
+        Returns
+        -------
+        row: list(SiteEvent)
+            The events of the row, in the order of the queue
+        """
+        row = [event]
+        while True:
+            next_event = self.event_queue.peek()
+            if not isinstance(next_event, SiteEvent) or next_event.yd != event.yd:
+                return row
+            row.append(self.event_queue.get())
+
+    def handle_first_row(self, row):
+        """
+        Handle the site events of the first row of sites, which all have the highest y-coordinate. The beach line is
+        still empty, and the arcs of these sites are vertical half-lines, so the beach line is a sequence of the arcs
+        from left to right, separated by the vertical bisectors between neighboring sites. This sequence is built as
+        a balanced tree at once (see :func:`Tree.build`), instead of inserting the sites one by one.
+
+        Rows with two sites at the same location are handled one site at a time by :func:`handle_site_event`.
+
+        Parameters
+        ----------
+        row: list(SiteEvent)
+            The site events with the highest y-coordinate
+        """
+        points = sorted((event.point for event in row), key=lambda point: point.xd)
+        if any(left.xd == right.xd for left, right in zip(points, points[1:])):
+            for event in row:
+                self.handle_site_event(event)
+            return
+
+        arcs = [Arc(origin=point) for point in points]
+        self._arcs.update(arcs)
+        leaves = [LeafNode(arc) for arc in arcs]
+        internal_nodes = []
+
+        for left_leaf, right_leaf, A, B in zip(leaves, leaves[1:], points, points[1:]):
+
+            # Only the breakpoint with A on the left lies between the arcs. The bisector runs up to infinity, which is
+            # where the breakpoint with B on the left stays.
+            AB = Breakpoint(breakpoint=(A, B))
+            BA = Breakpoint(breakpoint=(B, A))
+            internal_nodes.append(InternalNode(AB))
+            left_leaf.link(right_leaf, AB)
+
+            # Edge AB -> BA with incident point B, and edge BA -> AB with incident point A
+            AB.edge = HalfEdge(B, origin=AB)
+            BA.edge = HalfEdge(A, origin=BA, twin=AB.edge)
+            self.edges.append(AB.edge)
+
+            # Add first edges
+            B.first_edge = B.first_edge or AB.edge
+            A.first_edge = A.first_edge or BA.edge
+
+        self.status_tree = Tree.build(leaves, internal_nodes)
 
     def handle_site_event(self, event: SiteEvent):
         """
@@ -266,7 +686,7 @@ class Algorithm(Subject):
 
         # Remove potential false alarm
         if arc_above_point.circle_event is not None:
-            arc_above_point.circle_event.remove()
+            self.event_queue.remove(arc_above_point.circle_event)
 
         # 3. Replace leaf with new sub tree that represents the two new intersections on the arc above the point
         #
@@ -281,18 +701,26 @@ class Algorithm(Subject):
         breakpoint_left = Breakpoint(breakpoint=(point_j, point_i))
         breakpoint_right = Breakpoint(breakpoint=(point_i, point_j))
 
+        node_b = LeafNode(Arc(origin=point_j, circle_event=None))
+        node_c = LeafNode(new_arc)
+        node_d = LeafNode(Arc(origin=point_j, circle_event=None))
+
         root = InternalNode(breakpoint_left)
-        root.left = LeafNode(Arc(origin=point_j, circle_event=None))
+        root.left = node_b
 
         # Only insert right breakpoint into the tree if it actually intersects
         if breakpoint_right.does_intersect():
             root.right = InternalNode(breakpoint_right)
-            root.right.left = LeafNode(new_arc)
-            root.right.right = LeafNode(Arc(origin=point_j, circle_event=None))
+            root.right.left = node_c
+            root.right.right = node_d
         else:
-            root.right = LeafNode(new_arc)
+            root.right = node_c
 
-        self.status_tree = arc_node_above_point.replace_leaf(replacement=root, root=self.status_tree)
+        # The heights are updated while rebalancing, straight after the replacement
+        self.status_tree = arc_node_above_point.replace_leaf(
+            replacement=root, root=self.status_tree, update_heights=False
+        )
+        self.status_tree = Tree.balance_and_propagate(root)
 
         # 4. Create half edge records
         A, B = point_j, point_i
@@ -327,14 +755,10 @@ class Algorithm(Subject):
         if not breakpoint_right.does_intersect():
             return
 
-        node_a, node_b, node_c = root.left.predecessor, root.left, root.right.left
-        node_c, node_d, node_e = node_c, root.right.right, root.right.right.successor
+        node_a, node_e = node_b.predecessor, node_d.successor
 
         self._check_circles((node_a, node_b, node_c), (node_c, node_d, node_e))
 
-        # X. Rebalance the tree
-        self.status_tree = Tree.balance_and_propagate(root)
-
     def handle_circle_event(self, event: CircleEvent):
         """
         Handle a circle event.
@@ -375,7 +799,7 @@ class Algorithm(Subject):
 
         # Update breakpoints
         self.status_tree, updated, removed, left, right = self._update_breakpoints(
-            self.status_tree, self.sweep_line, arc_node, predecessor, successor)
+            self.status_tree, arc_node, predecessor, successor)
 
         if updated is None:
             # raise Exception("Oh.")
@@ -385,8 +809,9 @@ class Algorithm(Subject):
         def remove(neighbor_event):
             if neighbor_event is None:
                 return None
-            self.notify_observers(Message.DEBUG, payload=f"Circle event for {neighbor_event.yd} removed.")
-            return neighbor_event.remove()
+            if self._observers:
+                self.notify_observers(Message.DEBUG, payload=f"Circle event for {neighbor_event.yd} removed.")
+            return self.event_queue.remove(neighbor_event)
 
         remove(predecessor.get_value().circle_event)
         remove(successor.get_value().circle_event)
@@ -399,9 +824,10 @@ class Algorithm(Subject):
         # Create a new edge for the new breakpoint, where the edge originates in the new breakpoint
         # Note: we only create the new edge if the vertex is still inside the bounding box
         # if self.bounding_poly.inside(event.center):
-        # Create a vertex
-        v = Vertex(convergence_point.xd, convergence_point.yd)
-        self._vertices.add(v)
+        # Create a vertex, or reuse the vertex of an earlier circle event with the same center (cocircular sites)
+        old_edges = (updated.edge, removed.edge)
+        sites = (predecessor.get_value().origin, arc.origin, successor.get_value().origin)
+        v = self._get_center_vertex(convergence_point, old_edges, sites)
 
         # Connect the two old edges to the vertex
         updated.edge.origin = v
@@ -431,6 +857,11 @@ class Algorithm(Subject):
         # Let the updated breakpoint point back to the new edge
         updated.edge = new_edge.twin
 
+        # Edges between two circle events at the same center have zero length
+        for edge in old_edges:
+            if edge.twin.origin is v:
+                self._delete_edge(edge)
+
         # 3. Check if breakpoints converge for the triples with former left and former right as middle arcs
         former_left = predecessor
         former_right = successor
@@ -440,25 +871,59 @@ class Algorithm(Subject):
 
         self._check_circles((node_a, node_b, node_c), (node_d, node_e, node_f))
 
+    def _get_center_vertex(self, center, edges, sites):
+        """
+        Get the vertex at the center of a circle event. Cocircular sites cause a cascade of circle events with the same
+        center, which all share one vertex of higher degree. The vertex of an earlier event in the cascade is the end
+        of one of the edges that meet in the event, and the exact in-circle test tells whether its sites lie on the
+        same circle. The rounded centers of the events are not compared, since they may differ in float64.
+
+        Parameters
+        ----------
+        center: Coordinate
+            The center of the circle event
+        edges: tuple(HalfEdge)
+            The edges of the two breakpoints that meet in the event
+        sites: tuple(Point)
+            The sites of the disappearing arc and its neighbors, from left to right
+
+        Returns
+        -------
+        vertex: Vertex
+        """
+        for edge in edges:
+            vertex = edge.twin.origin
+            if not isinstance(vertex, Vertex):
+                continue
+            for connected in vertex.connected_edges:
+                site = connected.incident_point
+                if all(site is not other for other in sites):
+                    if Predicates.incircle(*sites, site) == 0:
+                        return vertex
+                    break
+
+        v = Vertex(center.xd, center.yd)
+        self._vertices.add(v)
+        return v
+
+    @staticmethod
+    def _delete_edge(edge):
+        """
+        Delete both halves of an edge of zero length. The edge is marked as removed, and left out of :attr:`edges`
+        when the sweep finishes.
+        """
+        edge.delete()
+        edge.twin.delete()
+        edge.removed = edge.twin.removed = True
+
     def _check_circles(self, triple_left, triple_right):
         node_a, node_b, node_c = triple_left
         node_d, node_e, node_f = triple_right
 
-        left_event = CircleEvent.create_circle_event(node_a, node_b, node_c, sweep_line=self.sweep_line)
-        right_event = CircleEvent.create_circle_event(node_d, node_e, node_f, sweep_line=self.sweep_line)
-
-        # Check if the circles converge
-        if left_event:
-            if not Algebra.check_clockwise(node_a.data.origin, node_b.data.origin, node_c.data.origin,
-                                           left_event.center):
-                self.notify_observers(Message.DEBUG, payload=f"Circle {left_event.point_triple} not clockwise.")
-                left_event = None
-
-        if right_event:
-            if not Algebra.check_clockwise(node_d.data.origin, node_e.data.origin, node_f.data.origin,
-                                           right_event.center):
-                self.notify_observers(Message.DEBUG, payload=f"Circle {right_event.point_triple} not clockwise.")
-                right_event = None
+        # The circles only converge when the arcs' sites are in clockwise order, which is checked before the circle is
+        # calculated
+        left_event = self._create_converging_circle_event(node_a, node_b, node_c)
+        right_event = self._create_converging_circle_event(node_d, node_e, node_f)
 
         if left_event is not None:
             self.event_queue.put(left_event)
@@ -468,73 +933,65 @@ class Algorithm(Subject):
             self.event_queue.put(right_event)
             node_e.data.circle_event = right_event
 
-        if left_event is not None:
+        if left_event is not None and self._observers:
             self.notify_observers(Message.DEBUG,
                                   payload=f"Left circle event created for {left_event.yd}. Arcs: {left_event.point_triple}")
-        if right_event is not None:
+        if right_event is not None and self._observers:
             self.notify_observers(Message.DEBUG,
                                   payload=f"Right circle event created for {right_event.yd}. Arcs: {right_event.point_triple}")
 
         return left_event, right_event
 
-    @staticmethod
-    def _update_breakpoints(root, sweep_line, arc_node, predecessor, successor):
+    def _create_converging_circle_event(self, left_node, middle_node, right_node):
+        if left_node is None or middle_node is None or right_node is None:
+            return None
 
-        # If the arc node is a left child, then its parent is the node with right_breakpoint
-        if arc_node.is_left_child():
+        triple = (left_node.data.origin, middle_node.data.origin, right_node.data.origin)
+        if Predicates.orientation(*triple) >= 0:
+            if self._observers:
+                self.notify_observers(Message.DEBUG, payload=f"Circle {triple} not clockwise.")
+            return None
 
-            # Replace the right breakpoint by the right node
-            root = arc_node.parent.replace_leaf(arc_node.parent.right, root)
+        return CircleEvent.create_circle_event(left_node, middle_node, right_node, sweep_line=self.sweep_line)
 
-            # Mark the right breakpoint as removed and right breakpoint
-            removed = arc_node.parent.data
-            right = removed
+    @staticmethod
+    def _update_breakpoints(root, arc_node, predecessor, successor):
 
-            # Rebalance the tree
-            root = Tree.balance_and_propagate(root)
+        # The breakpoints on both sides of the arc are stored in the doubly linked list of leaves
+        left_breakpoint = arc_node.left_breakpoint
+        right_breakpoint = arc_node.right_breakpoint
 
-            # Find the left breakpoint
-            left_breakpoint = Breakpoint(breakpoint=(predecessor.get_value().origin, arc_node.get_value().origin))
-            query = InternalNode(left_breakpoint)
-            compare = lambda x, y: hasattr(x, "breakpoint") and x.breakpoint == y.breakpoint
-            breakpoint: InternalNode = Tree.find_value(root, query, compare, sweep_line=sweep_line)
+        # If the arc node is a left child, then its parent is the node with right_breakpoint
+        if arc_node.is_left_child():
 
-            # Update the breakpoint
-            # assert(breakpoint is not None)
-            if breakpoint is not None:
-                breakpoint.data.breakpoint = (breakpoint.get_value().breakpoint[0], successor.get_value().origin)
+            # Replace the right breakpoint by the right node
+            sibling = arc_node.parent.right
+            root = arc_node.parent.replace_leaf(sibling, root, update_heights=False)
 
-            # Mark this breakpoint as updated and left breakpoint
-            updated = breakpoint.data if breakpoint is not None else None
-            left = updated
+            # Mark the right breakpoint as removed and the left breakpoint as updated
+            removed, updated = right_breakpoint, left_breakpoint
+            right, left = removed, updated
 
         # If the arc node is a right child, then its parent is the breakpoint on the left
         else:
 
             # Replace the left breakpoint by the left node
-            root = arc_node.parent.replace_leaf(arc_node.parent.left, root)
+            sibling = arc_node.parent.left
+            root = arc_node.parent.replace_leaf(sibling, root, update_heights=False)
 
-            # Mark the left breakpoint as removed
-            removed = arc_node.parent.data
-            left = removed
+            # Mark the left breakpoint as removed and the right breakpoint as updated
+            removed, updated = left_breakpoint, right_breakpoint
+            left, right = removed, updated
 
-            # Rebalance the tree
-            root = Tree.balance_and_propagate(root)
+        # Rebalance the tree, starting from the node that took the place of the removed breakpoint
+        root = Tree.balance_and_propagate(sibling.parent or sibling)
 
-            # Find the right breakpoint
-            right_breakpoint = Breakpoint(breakpoint=(arc_node.get_value().origin, successor.get_value().origin))
-            query = InternalNode(right_breakpoint)
-            compare = lambda x, y: hasattr(x, "breakpoint") and x.breakpoint == y.breakpoint
-            breakpoint: InternalNode = Tree.find_value(root, query, compare, sweep_line=sweep_line)
+        # Update the breakpoint, which now lies between the predecessor and the successor
+        if updated is not None:
+            updated.breakpoint = (predecessor.get_value().origin, successor.get_value().origin)
 
-            # Update the breakpoint
-            # assert(breakpoint is not None)
-            if breakpoint is not None:
-                breakpoint.data.breakpoint = (predecessor.get_value().origin, breakpoint.get_value().breakpoint[1])
-
-            # Mark this breakpoint as updated and right breakpoint
-            updated = breakpoint.data if breakpoint is not None else None
-            right = updated
+        # Remove the arc from the doubly linked list of leaves
+        arc_node.unlink(breakpoint=updated)
 
         return root, updated, removed, left, right
 
@@ -542,31 +999,100 @@ class Algorithm(Subject):
         """
         Removes zero length edges and vertices with the same coordinate
         that are produced when two site-events happen at the same time.
-        """
-
-        resulting_edges = []
-        for edge in self.edges:
-            start = edge.get_origin()
-            end = edge.twin.get_origin()
-            if start.xd == end.xd and start.yd == end.yd:
 
-                # Combine the vertices
-                v1: Vertex = edge.origin
-                v2: Vertex = edge.twin.origin
+        Vertices that lie within :attr:`zero_length_tolerance` of each other are merged (see
+        :func:`merge_vertices`), all edges are moved to the remaining vertex at once, and the edges whose two ends
+        ended up at the same vertex are deleted.
+        """
+        half_edges = [half_edge for edge in self.edges for half_edge in (edge, edge.twin)]
 
-                # Move connected edges from v1 to v2
-                for connected in v1.connected_edges:
-                    connected.origin = v2
-                    v1.connected_edges.remove(connected)
-                    v2.connected_edges.append(connected)
+        # Half-infinite edges of an unbounded diagram still have a breakpoint as origin
+        vertices = dict.fromkeys(
+            half_edge.origin for half_edge in half_edges if isinstance(half_edge.origin, Vertex)
+        )
+        representatives = self.merge_vertices(list(vertices), self.zero_length_tolerance)
 
-                # Remove vertex v1
-                self._vertices.remove(v1)
+        # Move the connected edges of merged vertices to their representative
+        for vertex, representative in representatives.items():
+            if vertex is not representative:
+                for connected in vertex.connected_edges:
+                    connected.origin = representative
+                representative.connected_edges.extend(vertex.connected_edges)
+                vertex.connected_edges = []
 
+        resulting_edges = []
+        for edge in self.edges:
+            if isinstance(edge.origin, Vertex) and edge.origin is edge.twin.origin:
                 # Delete the edge
                 edge.delete()
                 edge.twin.delete()
-
             else:
                 resulting_edges.append(edge)
-            self.edges = resulting_edges
+
+        self.edges = resulting_edges
+        self._vertices = type(self._vertices)(
+            dict.fromkeys(representatives.get(vertex, vertex) for vertex in self._vertices)
+        )
+
+    @staticmethod
+    def merge_vertices(vertices, tolerance=0):
+        """
+        Find groups of vertices that lie at (almost) the same location.
+
+        The vertices are bucketed into a hash grid with cells of size `tolerance`, so that every vertex is only
+        compared with the vertices in the neighboring cells, and the groups are formed with union-find. Without a
+        tolerance, the buckets are the exact coordinates.
+
+        Parameters
+        ----------
+        vertices: list(Vertex)
+            The vertices to merge
+        tolerance: float
+            Vertices of which both coordinates differ by at most `tolerance` are merged
+
+        Returns
+        -------
+        representatives: dict
+            The vertex that every vertex is merged into, which is the first vertex of its group
+        """
+        parents = {vertex: vertex for vertex in vertices}
+
+        def find(vertex):
+            root = vertex
+            while parents[root] is not root:
+                root = parents[root]
+
+            # Path compression
+            while parents[vertex] is not root:
+                parents[vertex], vertex = root, parents[vertex]
+            return root
+
+        def union(vertex, other):
+            root, other_root = find(vertex), find(other)
+            if root is other_root:
+                return
+
+            # The vertex that came first stays
+            if order[other_root] < order[root]:
+                root, other_root = other_root, root
+            parents[other_root] = root
+
+        order = {vertex: index for index, vertex in enumerate(vertices)}
+        grid = {}
+
+        if not tolerance:
+            for vertex in vertices:
+                first = grid.setdefault((vertex.xd, vertex.yd), vertex)
+                union(first, vertex)
+        else:
+            for vertex in vertices:
+                x, y = float(vertex.xd), float(vertex.yd)
+                column, row = math.floor(x / tolerance), math.floor(y / tolerance)
+                for neighbor_column in (column - 1, column, column + 1):
+                    for neighbor_row in (row - 1, row, row + 1):
+                        for other in grid.get((neighbor_column, neighbor_row), ()):
+                            if abs(float(other.xd) - x) <= tolerance and abs(float(other.yd) - y) <= tolerance:
+                                union(other, vertex)
+                grid.setdefault((column, row), []).append(vertex)
+
+        return {vertex: find(vertex) for vertex in vertices}
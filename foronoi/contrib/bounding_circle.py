@@ -1,210 +1,162 @@
+import math
 import warnings
-from decimal import Decimal
 
-from foronoi import Polygon
-from foronoi.algorithm import Algorithm
-from foronoi.graph import Point, Coordinate, Vertex
-
-DEBUG = False
+import numpy as np
 
-if DEBUG:
-    from foronoi.visualization import Visualizer
+from foronoi import Polygon
+from foronoi.graph import Coordinate, Vertex, Numeric
+from foronoi.graph.clipping import Clipping
+from foronoi.observers.subject import Subject
 
 
 class BoundingCircle(Polygon):
 
     def __init__(self, x, y, radius):
-        self.xd = Decimal(str(x))
-        self.yd = Decimal(str(y))
-        self.radius = Decimal(str(radius))
+        """
+        A bounding circle that will clip the edges and fit around the Voronoi diagram.
+
+        All edges are clipped against the circle at once (see :func:`foronoi.graph.Clipping.clip_circle`). The
+        cells are closed by straight edges between the vertices on the circle; :func:`cell_area` adds the circular
+        segments between these edges and the circle to get the exact area of a cell.
+
+        Examples
+        --------
+        >>> circle = BoundingCircle(5., 5., 9.)
+        >>> v = Voronoi(circle)
+        >>> v.create_diagram(points=[(1, 2), (7, 13), (12, 6), (5, 5)])
+        >>> [circle.cell_area(site) for site in v.sites]
+
+        Parameters
+        ----------
+        x: float
+            The x-coordinate of the center
+        y: float
+            The y-coordinate of the center
+        radius: float
+            The radius of the circle
+        """
+        Subject.__init__(self)
+        self.xd = Numeric.convert(x)
+        self.yd = Numeric.convert(y)
+        self.radius = Numeric.convert(radius)
+        self.points = []
         self.polygon_vertices = []
-        self.center = Coordinate(self.xd, self.yd)
-        self.max_x = self.xd + 2 * self.radius
-        self.min_x = self.xd - 2 * self.radius
-        self.max_y = self.yd + 2 * self.radius
-        self.min_y = self.yd - 2 * self.radius
-        self.voronoi = Algorithm(self)  # A dummy for visualization
-        self.voronoi.sweep_line = self.min_y - abs(self.max_y)
+        self._prepared = None
+        self._set_bounds()
 
         # Important warning about visualization
         warnings.warn("""
-        Warning! The bounding circle has a few limitations:
-        
-        1) The edges point towards the correct node, and get correctly clipped by the circle, 
-           but do not follow the shape of the circle during visualization. Instead, they follow 
-           a straight line towards the other node.
-        2) Because of the above, cell size calculation is not supported for bounding circles. 
-        """)
+        Warning! The bounding circle has a limitation:
 
-    def inside(self, point):
-        return (self.xd - point.xd) ** 2 + (self.yd - point.yd) ** 2 < self.radius ** 2
+        The edges point towards the correct node, and get correctly clipped by the circle,
+        but do not follow the shape of the circle during visualization. Instead, they follow
+        a straight line towards the other node. Use BoundingCircle.cell_area for the exact cell size.
+        """)
 
-    def finish_edges(self, edges, vertices=None, points=None, event_queue=None):
-        resulting_edges = []
-        for edge in edges:
-            result = True
-            A = edge.get_origin(y=-1000)
-            B = edge.twin.get_origin(y=-1000)
-
-            if DEBUG:
-                Visualizer(self.voronoi, 1) \
-                    .plot_sites(points) \
-                    .plot_vertices(vertices + self.polygon_vertices) \
-                    .plot_edges(edges) \
-                    .plot_edges([edge], color="green") \
-                    .plot_polygon()\
-                    .show()
-
-            if A is None:
-                if B is None:
-                    continue
-                result = result and self.trim_edge(edge)
-            elif not self.inside(A):
-                result = result and self.trim_edge(edge)
-            if result:
-                resulting_edges.append(edge)
-
-            if DEBUG:
-                Visualizer(self.voronoi, 1) \
-                    .plot_sites(points) \
-                    .plot_vertices(vertices + self.polygon_vertices) \
-                    .plot_edges(edges) \
-                    .plot_edges([edge], color="green") \
-                    .plot_polygon() \
-                    .show()
-
-            if B is None or not self.inside(B):
-                result = self.trim_edge(edge.twin)
-                if result:
-                    resulting_edges.append(edge.twin)
-
-            if DEBUG:
-                Visualizer(self.voronoi, 1) \
-                    .plot_sites(points) \
-                    .plot_vertices(vertices + self.polygon_vertices) \
-                    .plot_edges(edges) \
-                    .plot_edges([edge], color="green") \
-                    .plot_polygon() \
-                    .show()
-
-        # Re-order polygon vertices
-        self.polygon_vertices = self._get_ordered_vertices(self.polygon_vertices)
-
-        if DEBUG:
-            Visualizer(self.voronoi, 1) \
-                .plot_sites(points) \
-                .plot_vertices(vertices + self.polygon_vertices) \
-                .plot_edges(edges) \
-                .plot_polygon() \
-                .show()
-
-        return resulting_edges, self.polygon_vertices
-
-    def trim_edge(self, edge, twisted=False):
-
-        point = self.cut_line(edge)
-
-        if point is None:
-            return False
-        # Create vertex
-        v = Vertex(point.x, point.y)
-        v.connected_edges.append(edge)
-        edge.origin = v
-        self.polygon_vertices.append(v)
-
-        return True
-
-    def get_line(self, A, B):
-        if (B.yd - A.yd) == 0:
-            a = Decimal("0")
-            b = Decimal("1")
-            c = A.yd
-        elif (B.xd - A.xd) == 0:
-            a = Decimal("1")
-            b = Decimal("0")
-            c = A.xd
-        else:
-            a = -(B.yd - A.yd) / (B.xd - A.xd)
-            b = Decimal("1")
-            c = A.xd * a + A.yd
+    def _set_bounds(self):
+        self.center = Coordinate(self.xd, self.yd)
+        self.min_x, self.max_x = self.xd - self.radius, self.xd + self.radius
+        self.min_y, self.max_y = self.yd - self.radius, self.yd + self.radius
 
-        return a, b, c
+    def convert_coordinates(self):
+        self.xd, self.yd, self.radius = Numeric.convert(self.xd), Numeric.convert(self.yd), Numeric.convert(self.radius)
+        self._set_bounds()
 
-    def get_ray(self, edge):
-        A = edge.origin.breakpoint[0]
-        B = edge.origin.breakpoint[1]
-        center = Point(x=(A.xd + B.xd) / 2, y=(A.yd + B.yd) / 2)
+    def inside(self, point):
+        """Tests whether a point is inside the circle.
+
+        Parameters
+        ----------
+        point: Point
+            The point for which to check if it it is inside the circle
+
+        Returns
+        -------
+        inside: bool
+            Whether the point is inside or not
+        """
+        return (self.xd - point.xd) ** 2 + (self.yd - point.yd) ** 2 < self.radius ** 2
 
-        if edge.twin.get_origin() is None:
-            ray_start = center
-        else:
-            ray_start = edge.twin.origin
-        a, b, c = self.get_line(ray_start, center)
-
-        if DEBUG:
-            Visualizer(self.voronoi, 1) \
-                .plot_sites([A, B, center, ray_start, a, b, c]) \
-                .plot_polygon() \
-                .show()
-
-        return ray_start, center, a, b, c
-
-    def on_line(self, A, B, C):
-        def is_on(a, b, c):
-            "Return true iff point c intersects the line segment from a to b."
-            # (or the degenerate case that all 3 points are coincident)
-            return ((within(a.xd, c.xd, b.xd) if a.xd != b.xd else
-                     within(a.yd, c.yd, b.yd)))
-
-        def within(p, q, r):
-            "Return true iff q is between p and r (inclusive)."
-            return (p <= q <= r) or (r <= q <= p)
-
-        return is_on(A, B, C)
-
-    def cut_line(self, edge):
-        A = edge.get_origin(-1000)
-        B = edge.twin.get_origin(-1000)
-        a, b, c = self.get_line(A, B)
-
-        point1, point2 = self.cut_circle(a, b, c)
-        if DEBUG:
-            Visualizer(self.voronoi, 1) \
-                .plot_sites([point1, point2]) \
-                .plot_polygon() \
-                .show()
-        if point1 is None:
-            return None
-        points = []
-        if self.on_line(A, B, point1):
-            points.append(point1)
-        if self.on_line(A, B, point2):
-            points.append(point2)
-        if len(points) == 0:
-            return None
-        elif len(points) == 1:
-            return points[0]
+    def _inside_all(self, coordinates):
+        return np.array([self.inside(coordinate) for coordinate in coordinates], dtype=bool)
+
+    def _on_edge(self, point):
+        return (self.xd - point.xd) ** 2 + (self.yd - point.yd) ** 2 == self.radius ** 2
+
+    def _clip(self, starts, ends, polygon):
+        return Clipping.clip_circle(starts, ends, (float(self.xd), float(self.yd)), float(self.radius))
+
+    def _border_crossing(self, start, end, site, other):
+        # The bisector crosses the straight border between two vertices on the circle, and then the circle just
+        # outside of it, at the root closest to the straight border
+        x, y = super()._border_crossing(start, end, site, other)
+        dx, dy = other.yd - site.yd, site.xd - other.xd
+        ex, ey = x - self.xd, y - self.yd
+
+        a = dx ** 2 + dy ** 2
+        b = 2 * (ex * dx + ey * dy)
+        c = ex ** 2 + ey ** 2 - self.radius ** 2
+        root = Numeric.sqrt(max(b ** 2 - 4 * a * c, 0 * a))
+        s = min((-b + root) / (2 * a), (-b - root) / (2 * a), key=abs)
+
+        return x + s * dx, y + s * dy
+
+    def finish_polygon(self, edges, existing_vertices, points):
+        # Without any edge crossing the circle, one vertex on the circle closes the only cell
+        if not any(vertex.xd is not None for vertex in self.polygon_vertices):
+            self.polygon_vertices.append(Vertex(self.xd - self.radius, self.yd))
+
+        return super().finish_polygon(edges, existing_vertices, points)
+
+    def segment_area(self, edge):
+        """
+        Calculate the area between a border edge of a cell and the arc of the circle that it cuts off, going
+        clockwise from the origin to the target of the edge.
+
+        Parameters
+        ----------
+        edge: HalfEdge
+            A half edge between two vertices on the circle
+
+        Returns
+        -------
+        area: float
+            The area of the circular segment
+        """
+        origin, target = edge.origin, edge.twin.origin
+        if origin is target:
+            angle = 2 * math.pi
         else:
-            dist_0 = (A.xd - points[0].xd) ** 2 + (A.yd - points[0].yd) ** 2
-            dist_1 = (A.xd - points[1].xd) ** 2 + (A.yd - points[1].yd) ** 2
-            if dist_0 < dist_1:
-                return points[0]
-            else:
-                return points[1]
-
-    def cut_circle(self, a, b, c):
-        d = c - a * self.xd - b * self.yd
-        a_sq_b_sq = a ** 2 + b ** 2
-        try:
-            big_sqrt = Decimal.sqrt(self.radius ** 2 * a_sq_b_sq - d ** 2).real
-        except ValueError:
-            return None, None
-
-        x1 = self.xd + (a * d + b * big_sqrt) / a_sq_b_sq
-        y1 = self.yd + (b * d - a * big_sqrt) / a_sq_b_sq
-        point1 = Point(x=x1, y=y1)
-        x2 = self.xd + (a * d - b * big_sqrt) / a_sq_b_sq
-        y2 = self.yd + (b * d + a * big_sqrt) / a_sq_b_sq
-        point2 = Point(x=x2, y=y2)
-
-        return point1, point2
\ No newline at end of file
+            x, y, radius = float(self.xd), float(self.yd), float(self.radius)
+            start = math.atan2(origin.y - y, origin.x - x)
+            end = math.atan2(target.y - y, target.x - x)
+            angle = (start - end) % (2 * math.pi)
+
+        return 0.5 * float(self.radius) ** 2 * (angle - math.sin(angle))
+
+    def cell_area(self, point, digits=None):
+        """
+        Calculate the exact area of a cell, including the parts between its straight borders and the circle.
+
+        Parameters
+        ----------
+        point: Point
+            The cell point
+        digits: int
+            The number of digits to round to
+
+        Returns
+        -------
+        area: float
+            The area of the cell
+        """
+        area = point.area()
+        for edge in point.borders():
+            # The borders along the circle are the only borders without a cell on their other side
+            if edge.twin is not None and edge.twin.incident_point is None and edge.origin is not None:
+                area += self.segment_area(edge)
+
+        if digits is not None:
+            return round(area, digits)
+
+        return area
@@ -1,3 +1,6 @@
 from foronoi.events.circle_event import CircleEvent
 from foronoi.events.event import Event
-from foronoi.events.site_event import SiteEvent
\ No newline at end of file
+from foronoi.events.site_event import SiteEvent
+from foronoi.events.event_queue import HeapEventQueue
+from foronoi.events.event_queue import PriorityEventQueue
+from foronoi.events.event_queue import SiteStreamEventQueue
@@ -1,13 +1,16 @@
-import math
-from decimal import *
+from decimal import Decimal
 
 from foronoi.events.event import Event
 from foronoi.graph.coordinate import Coordinate
+from foronoi.graph.numeric import Numeric
+from foronoi.graph.predicates import Predicates
 from foronoi.nodes.leaf_node import LeafNode
 from foronoi.nodes.arc import Arc
 
 
 class CircleEvent(Event):
+    __slots__ = ("center", "radius", "arc_pointer", "is_valid", "point_triple", "arc_triple")
+
     circle_event = True
 
     def __init__(self, center: Coordinate, radius: Decimal, arc_node: LeafNode, point_triple=None, arc_triple=None):
@@ -112,9 +115,10 @@ class CircleEvent(Event):
         a, b, c = left_arc.origin, middle_arc.origin, right_arc.origin
 
         # Check if we can create a circle event
-        if CircleEvent.create_circle(a, b, c):
+        circle = CircleEvent.create_circle(a, b, c)
+        if circle:
             # Create the circle
-            x, y, radius = CircleEvent.create_circle(a, b, c)
+            x, y, radius = circle
 
             # Return circle event
             return CircleEvent(center=Coordinate(x, y), radius=radius, arc_node=middle_node, point_triple=(a, b, c),
@@ -152,7 +156,7 @@ class CircleEvent(Event):
         F = (c.xd - a.xd) * (a.xd + c.xd) + (c.yd - a.yd) * (a.yd + c.yd)
         G = 2 * ((b.xd - a.xd) * (c.yd - b.yd) - (b.yd - a.yd) * (c.xd - b.xd))
 
-        if G == 0:
+        if G == 0 or Predicates.orientation(a, b, c) == 0:
             # Points are all on one line (collinear), so no circle can be made
             return False
 
@@ -160,6 +164,6 @@ class CircleEvent(Event):
         x = (D * E - B * F) / G
         y = (A * F - C * E) / G
 
-        radius = Decimal.sqrt((a.xd - x) ** 2 + (a.yd - y) ** 2)
+        radius = Numeric.sqrt((a.xd - x) ** 2 + (a.yd - y) ** 2)
 
         return x, y, radius
@@ -1,5 +1,8 @@
 class Event:
+    __slots__ = ()
+
     circle_event = False
+    is_valid = True
 
     @property
     def xd(self):
@@ -9,6 +12,18 @@ class Event:
     def yd(self):
         return 0
 
+    @property
+    def priority(self):
+        """
+        A sort key that orders events in the same way as :func:`__lt__`: highest `y`-coordinate first, then lowest
+        `x`-coordinate, and circle events before site events.
+
+        Returns
+        -------
+        priority: tuple
+        """
+        return -self.yd, self.xd, not self.circle_event
+
     def __lt__(self, other):
         if self.yd == other.yd and self.xd == other.xd:
             return self.circle_event and not other.circle_event
@@ -0,0 +1,294 @@
+import heapq
+from itertools import count
+from queue import PriorityQueue
+
+
+class PriorityEventQueue(PriorityQueue):
+    """
+    Event queue based on :class:`queue.PriorityQueue`, which orders the events using :func:`Event.__lt__`.
+
+    Invalidated circle events stay in the queue until they are popped, so the caller has to skip them.
+    """
+
+    def extend(self, events):
+        """
+        Add multiple events to the queue.
+
+        Parameters
+        ----------
+        events: iterable(Event)
+            The events to add
+        """
+        for event in events:
+            self.put(event)
+
+    def peek(self):
+        """
+        Return the event with the highest priority without removing it. Invalidated circle events are not skipped.
+
+        Returns
+        -------
+        event: Event or None
+        """
+        return self.queue[0] if self.queue else None
+
+    def remove(self, event):
+        """
+        Mark a circle event as a false alarm.
+
+        Parameters
+        ----------
+        event: CircleEvent
+            The event to invalidate
+
+        Returns
+        -------
+        event: CircleEvent
+        """
+        return event.remove()
+
+
+class HeapEventQueue:
+    def __init__(self, compaction_threshold=0.5, min_compaction_size=64):
+        """
+        Lock-free event queue based on :mod:`heapq`.
+
+        Every event is stored as a precomputed priority tuple (see :attr:`Event.priority`), followed by an insertion
+        sequence number that breaks ties, so that events never have to be compared with each other. Invalidated circle
+        events are deleted lazily: they are skipped when they reach the top of the heap, and the heap is rebuilt
+        without them as soon as they make up more than `compaction_threshold` of the heap.
+
+        Parameters
+        ----------
+        compaction_threshold: float
+            The fraction of invalid events at which the heap is rebuilt
+        min_compaction_size: int
+            Heaps smaller than this size are never rebuilt
+
+        Attributes
+        ----------
+        heap: list
+            The heap of priority tuples
+        invalid: int
+            The number of invalidated events that are still in the heap
+        """
+        self.heap = []
+        self.invalid = 0
+        self.compaction_threshold = compaction_threshold
+        self.min_compaction_size = min_compaction_size
+        self._sequence = count()
+
+    def __len__(self):
+        return len(self.heap) - self.invalid
+
+    def put(self, event):
+        """
+        Add an event to the queue.
+
+        Parameters
+        ----------
+        event: Event
+            The event to add
+        """
+        heapq.heappush(self.heap, (event.priority, next(self._sequence), event))
+
+    def extend(self, events):
+        """
+        Add multiple events to the queue at once, which takes linear time.
+
+        Parameters
+        ----------
+        events: iterable(Event)
+            The events to add
+        """
+        self.heap.extend((event.priority, next(self._sequence), event) for event in events)
+        heapq.heapify(self.heap)
+
+    def get(self):
+        """
+        Remove and return the event with the highest priority, skipping invalidated circle events.
+
+        Returns
+        -------
+        event: Event
+        """
+        self._discard_invalid()
+        return heapq.heappop(self.heap)[-1]
+
+    def peek(self):
+        """
+        Return the event with the highest priority without removing it, skipping invalidated circle events.
+
+        Returns
+        -------
+        event: Event or None
+        """
+        self._discard_invalid()
+        return self.heap[0][-1] if self.heap else None
+
+    def empty(self):
+        """
+        Check if there are any valid events left.
+
+        Returns
+        -------
+        empty: bool
+        """
+        self._discard_invalid()
+        return not self.heap
+
+    def remove(self, event):
+        """
+        Mark a circle event as a false alarm, and rebuild the heap if too many invalid events have accumulated.
+
+        Parameters
+        ----------
+        event: CircleEvent
+            The event to invalidate
+
+        Returns
+        -------
+        event: CircleEvent
+        """
+        if event.is_valid:
+            event.remove()
+            self.invalid += 1
+
+            if len(self.heap) >= self.min_compaction_size and \
+                    self.invalid > self.compaction_threshold * len(self.heap):
+                self.compact()
+
+        return event
+
+    def compact(self):
+        """
+        Rebuild the heap without the invalidated events.
+        """
+        self.heap = [item for item in self.heap if item[-1].is_valid]
+        heapq.heapify(self.heap)
+        self.invalid = 0
+
+    def _discard_invalid(self):
+        heap = self.heap
+        while heap and not heap[0][-1].is_valid:
+            heapq.heappop(heap)
+            self.invalid = max(self.invalid - 1, 0)
+
+
+class SiteStreamEventQueue(HeapEventQueue):
+    def __init__(self, compaction_threshold=0.5, min_compaction_size=64):
+        """
+        Event queue that keeps the site events and the circle events apart. The site events are known in advance, so
+        they are sorted once by their exact :attr:`Event.priority` and consumed with a cursor. Only circle events
+        live in the heap. When an event is requested, the two streams are merged by comparing the next site event with
+        the top of the heap.
+
+        Parameters
+        ----------
+        compaction_threshold: float
+            The fraction of invalid events at which the heap is rebuilt
+        min_compaction_size: int
+            Heaps smaller than this size are never rebuilt
+
+        Attributes
+        ----------
+        sites: list(SiteEvent)
+            The site events, sorted from top to bottom and from left to right
+        cursor: int
+            The index of the next site event to handle
+        """
+        super().__init__(compaction_threshold=compaction_threshold, min_compaction_size=min_compaction_size)
+        self.sites = []
+        self.cursor = 0
+
+    def __len__(self):
+        return super().__len__() + len(self.sites) - self.cursor
+
+    def put(self, event):
+        """
+        Add an event to the queue. Site events are merged into the sorted site stream, circle events are pushed on the
+        heap.
+
+        Parameters
+        ----------
+        event: Event
+            The event to add
+        """
+        if event.circle_event:
+            super().put(event)
+        elif self.cursor == len(self.sites) or self.sites[-1].priority <= event.priority:
+            # A site that comes after all others is appended without sorting
+            self.sites.append(event)
+        else:
+            self.extend([event])
+
+    def extend(self, events):
+        """
+        Add multiple site events to the sorted site stream. Circle events are pushed on the heap.
+
+        Parameters
+        ----------
+        events: iterable(Event)
+            The events to add
+        """
+        sites = []
+        for event in events:
+            if event.circle_event:
+                super().put(event)
+            else:
+                sites.append(event)
+
+        if not sites:
+            return
+
+        # Merge with the site events that have not been handled yet. The stream is already sorted, which the sort
+        # takes advantage of.
+        del self.sites[:self.cursor]
+        self.sites.extend(sites)
+        self.sites.sort(key=lambda site: site.priority)
+        self.cursor = 0
+
+    def get(self):
+        """
+        Remove and return the event with the highest priority, skipping invalidated circle events.
+
+        Returns
+        -------
+        event: Event
+        """
+        self._discard_invalid()
+
+        if self.cursor < len(self.sites):
+            site = self.sites[self.cursor]
+            if not self.heap or site.priority < self.heap[0][0]:
+                self.cursor += 1
+                return site
+
+        return heapq.heappop(self.heap)[-1]
+
+    def peek(self):
+        """
+        Return the event with the highest priority without removing it, skipping invalidated circle events.
+
+        Returns
+        -------
+        event: Event or None
+        """
+        self._discard_invalid()
+
+        if self.cursor < len(self.sites):
+            site = self.sites[self.cursor]
+            if not self.heap or site.priority < self.heap[0][0]:
+                return site
+
+        return self.heap[0][-1] if self.heap else None
+
+    def empty(self):
+        """
+        Check if there are any valid events left.
+
+        Returns
+        -------
+        empty: bool
+        """
+        return self.cursor >= len(self.sites) and super().empty()
@@ -1,9 +1,10 @@
 from foronoi.graph.point import Point
 from foronoi.events.event import Event
-from foronoi.observers.subject import Subject
 
 
-class SiteEvent(Event, Subject):
+class SiteEvent(Event):
+    __slots__ = ("point",)
+
     circle_event = False
 
     def __init__(self, point: Point):
@@ -15,7 +16,6 @@ class SiteEvent(Event, Subject):
         point: Point
             The point that causes the site event.
         """
-        super().__init__()
         self.point = point
 
     @property
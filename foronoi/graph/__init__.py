@@ -1,7 +1,19 @@
+from foronoi.graph.numeric import Numeric
 from foronoi.graph.half_edge import HalfEdge
 from foronoi.graph.coordinate import Coordinate
 from foronoi.graph.point import Point
 from foronoi.graph.vertex import Vertex
 from foronoi.graph.polygon import Polygon
 from foronoi.graph.algebra import Algebra
-from foronoi.graph.bounding_box import BoundingBox
\ No newline at end of file
+from foronoi.graph.predicates import Predicates
+from foronoi.graph.clipping import Clipping
+from foronoi.graph.prepared_polygon import PreparedPolygon
+from foronoi.graph.bounding_box import BoundingBox
+from foronoi.graph.dcel import DCEL
+from foronoi.graph.dcel import DCELHalfEdge
+from foronoi.graph.dcel import DCELVertex
+from foronoi.graph.voronoi_arrays import CellMetrics
+from foronoi.graph.voronoi_arrays import VoronoiArrays
+from foronoi.graph.unbounded_diagram import UnboundedDiagram
+from foronoi.graph.diagram_editor import DiagramEditor
+from foronoi.graph.kinetic_topology import KineticTopology
@@ -59,6 +59,34 @@ class Algebra:
 
         return Coordinate(point[0][0], point[0][1])
 
+    @staticmethod
+    def bisector_crossing(start, end, site, other):
+        """
+        Find where the segment from `start` to `end` crosses the bisector of two sites, in the active numeric
+        backend. The difference between the squared distances to both sites is linear along the segment.
+
+        Parameters
+        ----------
+        start: Coordinate
+            The start of the segment, on one side of the bisector
+        end: Coordinate
+            The end of the segment, on the other side of the bisector (or on it)
+        site: Coordinate
+        other: Coordinate
+
+        Returns
+        -------
+        crossing: (Decimal, Decimal)
+            The x,y-coordinates of the crossing
+        """
+        def power(coordinate):
+            return ((coordinate.xd - site.xd) ** 2 + (coordinate.yd - site.yd) ** 2 -
+                    (coordinate.xd - other.xd) ** 2 - (coordinate.yd - other.yd) ** 2)
+
+        power_start, power_end = power(start), power(end)
+        t = power_start / (power_start - power_end)
+        return start.xd + t * (end.xd - start.xd), start.yd + t * (end.yd - start.yd)
+
     @staticmethod
     def calculate_angle(point, center):
         dx = point.xd - center.xd
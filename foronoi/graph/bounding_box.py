@@ -1,4 +1,7 @@
+import numpy as np
+
 from foronoi.graph import Polygon, Coordinate
+from foronoi.graph.clipping import Clipping
 
 
 class BoundingBox(Polygon):
@@ -7,6 +10,10 @@ class BoundingBox(Polygon):
         """
         Convenience method to create a bounding box. Extends :class:`foronoi.graph.Polygon`.
 
+        The box replaces the generic polygon operations by axis-aligned ones: containment is tested by comparing
+        intervals, edges are clipped with Liang-Barsky clipping, and the vertices on the border are ordered by their
+        position along the perimeter instead of by their angle.
+
         Parameters
         ----------
         left_x: float
@@ -26,3 +33,58 @@ class BoundingBox(Polygon):
         ]
 
         super().__init__(points)
+
+    def _get_ordered_vertices(self, vertices):
+        vertices = [vertex for vertex in vertices if vertex.xd is not None]
+        return sorted(vertices, key=lambda vertex: self._perimeter_position(vertex.xd, vertex.yd))
+
+    def _perimeter_position(self, x, y):
+        """
+        The clockwise distance along the border from the middle of the left side, which gives the same order as the
+        angle around the center that is used by :class:`Polygon`.
+        """
+        width, height = self.max_x - self.min_x, self.max_y - self.min_y
+        dx, dy = (x - self.center.xd) * height, (y - self.center.yd) * width
+
+        if abs(dy) >= abs(dx):
+            if dy >= 0:
+                # Top, from left to right
+                return height / 2 + (x - self.min_x)
+
+            # Bottom, from right to left
+            return height / 2 + width + height + (self.max_x - x)
+
+        if dx > 0:
+            # Right, from top to bottom
+            return height / 2 + width + (self.max_y - y)
+
+        # Left, from bottom to top
+        if y >= self.center.yd:
+            return y - self.center.yd
+        return 2 * (width + height) + (y - self.center.yd)
+
+    def _inside_all(self, coordinates):
+        return np.array([self._contains(coordinate) for coordinate in coordinates], dtype=bool)
+
+    def _contains(self, point):
+        # Same outcome as the crossing number test, which counts the left and bottom border as inside
+        return self.min_x <= point.xd < self.max_x and self.min_y <= point.yd < self.max_y
+
+    def inside(self, point):
+        """Tests whether a point is inside the box.
+
+        Parameters
+        ----------
+        point: Point
+            The point for which to check if it it is inside the box
+
+        Returns
+        -------
+        inside: bool
+            Whether the point is inside or not
+        """
+        return self._contains(point)
+
+    def _clip(self, starts, ends, polygon):
+        box = tuple(float(value) for value in (self.min_x, self.min_y, self.max_x, self.max_y))
+        return Clipping.clip_box(starts, ends, box)
@@ -0,0 +1,370 @@
+import numpy as np
+
+# Relative tolerance below which the float point-in-polygon test can not be trusted for non-float coordinates
+_INSIDE_TOLERANCE = 1e-9
+
+# Relative tolerance by which a crossing may lie beyond the end of a segment, and still be its end
+_END_TOLERANCE = 1e-9
+
+
+class Clipping:
+    """
+    Vectorized clipping of many edges against a polygon at once.
+
+    All functions take the polygon as a (K, 2) array of its vertices, and handle M points or rays in one go, by
+    broadcasting them against all K sides of the polygon. The arithmetic follows :func:`Polygon.inside` and
+    :func:`Algebra.line_ray_intersection_point` operation by operation, so the vectorized results are identical to
+    the results of the scalar functions.
+
+    Examples
+    --------
+    >>> polygon = np.array([(0, 10), (10, 10), (10, 0), (0, 0)], dtype=float)
+    >>> Clipping.inside(np.array([(5, 5), (15, 5)], dtype=float), polygon)
+    array([ True, False])
+    """
+
+    @staticmethod
+    def inside(points, polygon):
+        """
+        Test for every point whether it lies inside the polygon, using the crossing number.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            The (M, 2) array of points
+        polygon: numpy.ndarray
+            The (K, 2) array of polygon vertices
+
+        Returns
+        -------
+        inside: numpy.ndarray
+            The (M,) boolean array
+        """
+        x, y = points[:, 0:1], points[:, 1:2]
+        xi, yi = polygon[:, 0], polygon[:, 1]
+        xj, yj = np.roll(xi, -1), np.roll(yi, -1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intersect = ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+
+        return np.count_nonzero(intersect, axis=1) % 2 == 1
+
+    @staticmethod
+    def ambiguous(points, polygon):
+        """
+        Find the points for which the float test of :func:`inside` could differ from an exact test, because they
+        lie (almost) on the boundary of the polygon, or at (almost) the same height as one of its vertices.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            The (M, 2) array of points
+        polygon: numpy.ndarray
+            The (K, 2) array of polygon vertices
+
+        Returns
+        -------
+        ambiguous: numpy.ndarray
+            The (M,) boolean array
+        """
+        x, y = points[:, 0:1], points[:, 1:2]
+        xi, yi = polygon[:, 0], polygon[:, 1]
+        xj, yj = np.roll(xi, -1), np.roll(yi, -1)
+        tolerance = _INSIDE_TOLERANCE * (np.abs(points).max(axis=1, initial=0) + np.abs(polygon).max())[:, None]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = (xj - xi) * (y - yi) / (yj - yi) + xi
+
+        near_vertex = (np.abs(y - yi) <= tolerance) | (np.abs(y - yj) <= tolerance)
+        near_side = ((yi > y) != (yj > y)) & (np.abs(x - crossing) <= tolerance)
+        return (near_vertex | near_side).any(axis=1)
+
+    @staticmethod
+    def ray_intersections(origins, ends, polygon):
+        """
+        Intersect the rays from `origins` through `ends` with all sides of the polygon.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of ray origins
+        ends: numpy.ndarray
+            The (M, 2) array of points that give the direction of the rays
+        polygon: numpy.ndarray
+            The (K, 2) array of polygon vertices
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, K, 2) array of intersection points
+        hit: numpy.ndarray
+            The (M, K) boolean array that tells if the ray intersects the side
+        """
+        return Clipping.side_intersections(origins, ends, polygon, np.roll(polygon, -1, axis=0))
+
+    @staticmethod
+    def side_intersections(origins, ends, point_1, point_2, tolerance=0.0):
+        """
+        Intersect the rays from `origins` through `ends` with the sides from `point_1` to `point_2`.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of ray origins
+        ends: numpy.ndarray
+            The (M, 2) array of points that give the direction of the rays
+        point_1: numpy.ndarray
+            The (K, 2) array of the starts of the sides
+        point_2: numpy.ndarray
+            The (K, 2) array of the ends of the sides
+        tolerance: float
+            The part of the length of a side by which an intersection may lie beyond either end of the side
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, K, 2) array of intersection points
+        hit: numpy.ndarray
+            The (M, K) boolean array that tells if the ray intersects the side
+        """
+        directions = Clipping._directions(origins, ends)
+        return Clipping._intersect(origins[:, None, :], directions[:, None, :], point_1[None, :, :],
+                                   point_2[None, :, :], tolerance)
+
+    @staticmethod
+    def _directions(origins, ends):
+        # Normalized directions, where rays of length zero keep their zero direction
+        vectors = ends - origins
+        magnitudes = np.sqrt(vectors[:, 0] * vectors[:, 0] + vectors[:, 1] * vectors[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(magnitudes[:, None] == 0, vectors, vectors / magnitudes[:, None])
+
+    @staticmethod
+    def _intersect(origins, directions, point_1, point_2, tolerance):
+        # Ray-Line Segment Intersection Test in 2D, for arrays that broadcast against each other
+        v1 = origins - point_1
+        v2 = point_2 - point_1
+        v3x, v3y = -directions[..., 1], directions[..., 0]
+
+        denominator = v2[..., 0] * v3x + v2[..., 1] * v3y
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t1 = (v2[..., 0] * v1[..., 1] - v2[..., 1] * v1[..., 0]) / denominator
+            t2 = (v1[..., 0] * v3x + v1[..., 1] * v3y) / denominator
+
+        # Rays that miss a side get their origin, instead of a point at infinity
+        hit = (denominator != 0) & (t1 > 0.0) & (-tolerance <= t2) & (t2 <= 1.0 + tolerance)
+        points = origins + np.where(hit, t1, 0.0)[..., None] * directions
+        return points, hit
+
+    @staticmethod
+    def clip(origins, ends, polygon):
+        """
+        For every segment from `origins` to `ends`, find the intersection with the boundary of the polygon that lies
+        furthest from the origin, without passing the end.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of segment origins, which lie inside the polygon
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends, which lie outside the polygon
+        polygon: numpy.ndarray
+            The (K, 2) array of polygon vertices
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        return Clipping.clip_sides(origins, ends, polygon, np.roll(polygon, -1, axis=0))
+
+    @staticmethod
+    def clip_sides(origins, ends, point_1, point_2):
+        """
+        Same as :func:`clip`, but for the sides from `point_1` to `point_2`, which can be a subset of the sides of
+        the polygon.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of segment origins
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends
+        point_1: numpy.ndarray
+            The (K, 2) array of the starts of the sides
+        point_2: numpy.ndarray
+            The (K, 2) array of the ends of the sides
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        # A ray through a corner of the polygon hits the sides on both sides of it, even when rounding puts the
+        # intersections just beyond the ends of the sides
+        points, hit = Clipping.side_intersections(origins, ends, point_1, point_2, _END_TOLERANCE)
+
+        # Only intersections that do not lie beyond the end are considered. An end that lies on a side is an
+        # intersection, even when rounding puts it just beyond the end.
+        offsets = points - origins[:, None, :]
+        distances = np.sqrt(offsets[..., 0] ** 2 + offsets[..., 1] ** 2)
+        vector = ends - origins
+        max_distances = np.sqrt(vector[:, 0] ** 2 + vector[:, 1] ** 2)
+        hit &= distances <= max_distances[:, None] * (1 + _END_TOLERANCE)
+
+        # Find the intersection point that is furthest away from the origin
+        distances = np.where(hit, distances, -np.inf)
+        furthest = np.argmax(distances, axis=1)
+        rows = np.arange(len(origins))
+        return points[rows, furthest], hit[rows, furthest]
+
+    @staticmethod
+    def clip_pairs(origins, ends, owners, point_1, point_2):
+        """
+        Same as :func:`clip_sides`, where every segment is only intersected with its own sides. The side from
+        `point_1[i]` to `point_2[i]` belongs to the segment with index `owners[i]`.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of segment origins
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends
+        owners: numpy.ndarray
+            The (P,) array of the index of the segment of every side
+        point_1: numpy.ndarray
+            The (P, 2) array of the starts of the sides
+        point_2: numpy.ndarray
+            The (P, 2) array of the ends of the sides
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        directions = Clipping._directions(origins, ends)
+        points, hit = Clipping._intersect(origins[owners], directions[owners], point_1, point_2, _END_TOLERANCE)
+
+        offsets = points - origins[owners]
+        distances = np.sqrt(offsets[:, 0] ** 2 + offsets[:, 1] ** 2)
+        vector = ends - origins
+        max_distances = np.sqrt(vector[:, 0] ** 2 + vector[:, 1] ** 2)
+        hit &= distances <= max_distances[owners] * (1 + _END_TOLERANCE)
+
+        # Find the intersection point that is furthest away from the origin, which is the last one of its segment in
+        # this order. Of equally far intersections, the first side is taken, like in clip_sides.
+        distances = np.where(hit, distances, -np.inf)
+        order = np.lexsort((-np.arange(len(owners)), distances, owners))
+        last = order[np.append(owners[order][1:] != owners[order][:-1], True)] if len(order) else order
+
+        clipped = np.zeros((len(origins), 2))
+        found = np.zeros(len(origins), dtype=bool)
+        clipped[owners[last]] = points[last]
+        found[owners[last]] = hit[last]
+        return clipped, found
+
+    @staticmethod
+    def clip_box(origins, ends, box):
+        """
+        Same as :func:`clip`, for an axis-aligned box, using Liang-Barsky clipping instead of intersecting every side.
+        The coordinate of an intersection point that lies on a side of the box is set to the exact coordinate of that
+        side.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of segment origins
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends
+        box: (float, float, float, float)
+            The (min x, min y, max x, max y) of the box
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        min_x, min_y, max_x, max_y = box
+        delta = ends - origins
+
+        # The parameters at which the segment crosses the lines through the left, right, bottom and top side
+        p = np.stack((-delta[:, 0], delta[:, 0], -delta[:, 1], delta[:, 1]), axis=1)
+        q = np.stack((origins[:, 0] - min_x, max_x - origins[:, 0], origins[:, 1] - min_y, max_y - origins[:, 1]),
+                     axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = q / p
+
+        # Parallel segments outside of a side never enter the box
+        parallel_outside = ((p == 0) & (q < 0)).any(axis=1)
+        entering = np.where(p < 0, t, -np.inf)
+        exiting = np.where(p > 0, t, np.inf)
+        enter_side, exit_side = np.argmax(entering, axis=1), np.argmin(exiting, axis=1)
+        rows = np.arange(len(origins))
+        t_enter, t_exit = entering[rows, enter_side], exiting[rows, exit_side]
+
+        # The intersection furthest from the origin is the exit, unless the segment ends inside the box
+        crosses = ~parallel_outside & (np.maximum(t_enter, 0.0) <= t_exit) & np.isfinite(delta).all(axis=1)
+        use_exit = t_exit <= 1.0
+        t_found = np.where(use_exit, t_exit, t_enter)
+        side = np.where(use_exit, exit_side, enter_side)
+        found = crosses & (t_found > 0.0) & (t_found <= 1.0)
+
+        with np.errstate(invalid="ignore"):
+            points = origins + np.where(found, t_found, 0.0)[:, None] * delta
+        bounds = np.array([min_x, max_x, min_y, max_y], dtype=float)
+        points[rows[found], side[found] // 2] = bounds[side[found]]
+        return points, found
+
+    @staticmethod
+    def clip_circle(origins, ends, center, radius):
+        """
+        Same as :func:`clip`, for a circle. The segments are written as `origin + t * (end - origin)`, and the
+        quadratic equation for the parameters `t` at which they cross the circle is solved for all segments at once.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of segment origins
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends
+        center: (float, float)
+            The center of the circle
+        radius: float
+            The radius of the circle
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        delta = ends - origins
+        offsets = origins - np.asarray(center, dtype=float)
+
+        a = delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1]
+        b = delta[:, 0] * offsets[:, 0] + delta[:, 1] * offsets[:, 1]
+        c = offsets[:, 0] * offsets[:, 0] + offsets[:, 1] * offsets[:, 1] - radius * radius
+        discriminant = b * b - a * c
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = np.sqrt(discriminant)
+            t_far, t_near = (-b + root) / a, (-b - root) / a
+
+        # The furthest crossing from the origin that does not lie beyond the end. An end that lies on the circle is a
+        # crossing, even when the rounding of the square root puts it just beyond the end.
+        valid = (a > 0) & (discriminant >= 0)
+        far = valid & (t_far > 0.0) & (t_far <= 1.0 + _END_TOLERANCE)
+        near = valid & ~far & (t_near > 0.0) & (t_near <= 1.0 + _END_TOLERANCE)
+        found = far | near
+
+        t = np.minimum(np.where(far, t_far, np.where(near, t_near, 0.0)), 1.0)
+        return origins + t[:, None] * delta, found
@@ -1,7 +1,11 @@
 from decimal import Decimal
 
+from foronoi.graph.numeric import Numeric
+
 
 class Coordinate:
+    __slots__ = ("_xd", "_yd")
+
     def __init__(self, x=None, y=None):
         """
         A point in 2D space
@@ -24,7 +28,16 @@ class Coordinate:
 
     @staticmethod
     def _to_dec(value):
-        return Decimal(str(value)) if value is not None else None
+        if value is None:
+            return None
+
+        # Values that are already stored in the active backend don't need to be converted again, which is the case
+        # for all arithmetic results during the sweep
+        state = Numeric._state
+        if type(value) is state.number_type:
+            return value
+
+        return state.convert(value)
 
     @property
     def x(self):
@@ -53,7 +66,7 @@ class Coordinate:
     @x.setter
     def x(self, value):
         """
-        Stores the x-coordinate as Decimal
+        Stores the x-coordinate as Decimal (or float when the float64 backend is active)
 
         Parameters
         ----------
@@ -65,7 +78,7 @@ class Coordinate:
     @y.setter
     def y(self, value):
         """
-        Stores the y-coordinate as Decimal
+        Stores the y-coordinate as Decimal (or float when the float64 backend is active)
 
         Parameters
         ----------
@@ -0,0 +1,291 @@
+import numpy as np
+
+from foronoi.graph.vertex import Vertex
+
+
+class DCEL:
+    def __init__(self, sites, vertices, origin, twin, next, prev, site, site_edge):
+        """
+        Array-backed export of a finished doubly connected edge list. Every half edge is a row in a handful of
+        contiguous integer arrays, and every vertex is a row in a float array. Pointers between records are stored as
+        indices, and -1 stands for a missing pointer.
+
+        The sweep and the :class:`DiagramEditor` work on the :class:`HalfEdge` and :class:`Vertex` objects. A DCEL is
+        a copy of those objects at the time it was exported, and does not follow later changes of the diagram.
+
+        The :class:`DCELHalfEdge` and :class:`DCELVertex` views offer the same navigation as :class:`HalfEdge` and
+        :class:`Vertex`, while bulk operations can work on the arrays directly.
+
+        Examples
+        --------
+        Walk around the first cell
+
+        >>> dcel = v.get_dcel()
+        >>> edge = dcel.site_edge_view(0)
+        >>> edge.origin.xy, edge.target.xy, edge.next.origin.xy
+
+        Parameters
+        ----------
+        sites: list(Point)
+            The sites, in the order of the input points
+        vertices: numpy.ndarray
+            The (V, 2) array of vertex coordinates
+        origin: numpy.ndarray
+            The vertex index of the origin of each half edge
+        twin: numpy.ndarray
+            The index of the twin of each half edge
+        next: numpy.ndarray
+            The index of the next half edge
+        prev: numpy.ndarray
+            The index of the previous half edge
+        site: numpy.ndarray
+            The index of the incident site of each half edge
+        site_edge: numpy.ndarray
+            The index of the first half edge of each site
+        """
+        self.sites = sites
+        self.vertices = vertices
+        self.origin = origin
+        self.twin = twin
+        self.next = next
+        self.prev = prev
+        self.site = site
+        self.site_edge = site_edge
+
+        # Half edges grouped by origin (CSR), to look up the connected edges of a vertex
+        order = np.argsort(origin, kind="stable")
+        self._vertex_edges = order[origin[order] >= 0]
+        self._vertex_offsets = np.searchsorted(origin[self._vertex_edges], np.arange(len(vertices) + 1))
+
+    def __len__(self):
+        return len(self.origin)
+
+    @staticmethod
+    def from_sites(sites):
+        """
+        Pack the half edges around the sites of a finished diagram into arrays.
+
+        Parameters
+        ----------
+        sites: list(Point)
+            The sites, in the order of the input points
+
+        Returns
+        -------
+        dcel: DCEL
+        """
+        site_indices = {site: index for index, site in enumerate(sites)}
+
+        # Number the half edges cell by cell, so that the borders of a cell are numbered consecutively
+        edge_indices = {}
+        for site in sites:
+            for border in site.borders():
+                edge_indices.setdefault(border, len(edge_indices))
+        edges = list(edge_indices)
+
+        # Number the twins, and the records they point to, that are not on the border of any cell
+        index = 0
+        while index < len(edges):
+            edge = edges[index]
+            for other in (edge.twin, edge.next, edge.prev):
+                if other is not None and other not in edge_indices:
+                    edge_indices[other] = len(edges)
+                    edges.append(other)
+            index += 1
+
+        vertex_indices = {}
+        vertices = []
+
+        def vertex_index(vertex):
+            if not isinstance(vertex, Vertex):
+                return -1
+            index = vertex_indices.get(vertex)
+            if index is None:
+                index = vertex_indices[vertex] = len(vertices)
+                vertices.append((vertex.x, vertex.y))
+            return index
+
+        count = len(edges)
+        get = edge_indices.get
+        origin = np.fromiter((vertex_index(edge.origin) for edge in edges), dtype=np.int32, count=count)
+        return DCEL(
+            sites=sites,
+            vertices=np.array(vertices, dtype=float).reshape(-1, 2),
+            origin=origin,
+            twin=np.fromiter((get(edge.twin, -1) for edge in edges), dtype=np.int32, count=count),
+            next=np.fromiter((get(edge.next, -1) for edge in edges), dtype=np.int32, count=count),
+            prev=np.fromiter((get(edge.prev, -1) for edge in edges), dtype=np.int32, count=count),
+            site=np.fromiter((site_indices.get(edge.incident_point, -1) for edge in edges), dtype=np.int32,
+                             count=count),
+            site_edge=np.fromiter((get(site.first_edge, -1) for site in sites), dtype=np.int32, count=len(sites)),
+        )
+
+    def target(self):
+        """
+        Get the vertex index of the target of every half edge. This is the origin of the twin, or the origin of the
+        next edge for half edges without a twin.
+
+        Returns
+        -------
+        target: numpy.ndarray
+        """
+        twin_origin = np.where(self.twin >= 0, self.origin[self.twin], -1)
+        next_origin = np.where(self.next >= 0, self.origin[self.next], -1)
+        return np.where(twin_origin >= 0, twin_origin, next_origin)
+
+    def cells(self):
+        """
+        Walk around all cells in one pass over the `next` pointers, starting at the first edge of every site.
+
+        Returns
+        -------
+        cell_offsets: numpy.ndarray
+            The (N + 1,) array of offsets into `cell_edges`
+        cell_edges: numpy.ndarray
+            The half edge indices of all cells, concatenated in the order of the sites
+        """
+        following = self.next.tolist()
+        cell_offsets, cell_edges = [0], []
+        for start in self.site_edge.tolist():
+            edge = start
+
+            # A cell can never have more borders than there are half edges
+            for _ in range(len(following)):
+                if edge < 0:
+                    break
+                cell_edges.append(edge)
+                edge = following[edge]
+                if edge == start:
+                    break
+            cell_offsets.append(len(cell_edges))
+
+        return np.array(cell_offsets, dtype=np.intp), np.array(cell_edges, dtype=np.intp)
+
+    def half_edge(self, index):
+        """
+        Get a view of a half edge.
+
+        Parameters
+        ----------
+        index: int
+
+        Returns
+        -------
+        edge: DCELHalfEdge or None
+        """
+        return DCELHalfEdge(self, index) if index >= 0 else None
+
+    def vertex(self, index):
+        """
+        Get a view of a vertex.
+
+        Parameters
+        ----------
+        index: int
+
+        Returns
+        -------
+        vertex: DCELVertex or None
+        """
+        return DCELVertex(self, index) if index >= 0 else None
+
+    def site_edge_view(self, index):
+        """
+        Get a view of the first half edge of a site.
+
+        Parameters
+        ----------
+        index: int
+            The index of the site
+
+        Returns
+        -------
+        edge: DCELHalfEdge or None
+        """
+        return self.half_edge(int(self.site_edge[index]))
+
+
+class DCELHalfEdge:
+    """
+    A view of a half edge in a :class:`DCEL`, with the navigation of :class:`HalfEdge`.
+    """
+
+    __slots__ = ("dcel", "index")
+
+    def __init__(self, dcel, index):
+        self.dcel = dcel
+        self.index = index
+
+    def __repr__(self):
+        return f"DCELHalfEdge({self.index})"
+
+    def __eq__(self, other):
+        return isinstance(other, DCELHalfEdge) and self.dcel is other.dcel and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.dcel), self.index))
+
+    @property
+    def origin(self):
+        return self.dcel.vertex(int(self.dcel.origin[self.index]))
+
+    @property
+    def twin(self):
+        return self.dcel.half_edge(int(self.dcel.twin[self.index]))
+
+    @property
+    def next(self):
+        return self.dcel.half_edge(int(self.dcel.next[self.index]))
+
+    @property
+    def prev(self):
+        return self.dcel.half_edge(int(self.dcel.prev[self.index]))
+
+    @property
+    def target(self):
+        twin = self.twin
+        return twin.origin if twin is not None else None
+
+    @property
+    def incident_point(self):
+        site = int(self.dcel.site[self.index])
+        return self.dcel.sites[site] if site >= 0 else None
+
+
+class DCELVertex:
+    """
+    A view of a vertex in a :class:`DCEL`, with the coordinates and connected edges of :class:`Vertex`.
+    """
+
+    __slots__ = ("dcel", "index")
+
+    def __init__(self, dcel, index):
+        self.dcel = dcel
+        self.index = index
+
+    def __repr__(self):
+        return f"DCELVertex({self.x:.2f}, {self.y:.2f})"
+
+    def __eq__(self, other):
+        return isinstance(other, DCELVertex) and self.dcel is other.dcel and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.dcel), self.index))
+
+    @property
+    def x(self):
+        return float(self.dcel.vertices[self.index, 0])
+
+    @property
+    def y(self):
+        return float(self.dcel.vertices[self.index, 1])
+
+    @property
+    def xy(self):
+        return self.x, self.y
+
+    @property
+    def connected_edges(self):
+        dcel = self.dcel
+        start, stop = dcel._vertex_offsets[self.index], dcel._vertex_offsets[self.index + 1]
+        return [DCELHalfEdge(dcel, int(index)) for index in dcel._vertex_edges[start:stop]]
@@ -0,0 +1,892 @@
+import numpy as np
+
+from foronoi.graph.half_edge import HalfEdge
+from foronoi.graph.point import Point
+from foronoi.graph.vertex import Vertex
+from foronoi.graph.algebra import Algebra
+from foronoi.graph.numeric import Numeric
+from foronoi.graph.coordinate import Coordinate
+from foronoi.graph.predicates import Predicates
+from foronoi.graph.kinetic_topology import KineticTopology
+
+
+# The errors of a local edit that can not be completed, after which the diagram is built again
+_LOCAL_ERRORS = (ValueError, KeyError, ArithmeticError)
+
+
+class DiagramEditor:
+    # All sites are moved by building the diagram again when more than this part of the sites would be repaired
+    rebuild_fraction = 0.2
+
+    # The difference in (squared) distance and area, relative to the size of the polygon, that a local edit may make
+    # before it is rejected, and the diagram is built again
+    tolerance = 1e-9
+
+    def __init__(self, algorithm):
+        """
+        Edits a finished (clipped) diagram in place, by only touching the cells around the edit instead of running
+        the sweep again. Used by :func:`foronoi.algorithm.Algorithm.insert_site`.
+
+        The cells are assumed to be convex, which holds for a convex bounding polygon.
+
+        Parameters
+        ----------
+        algorithm: Algorithm
+            The finished diagram to edit
+
+        Attributes
+        ----------
+        algorithm: Algorithm
+            The diagram that is edited
+        """
+        self.algorithm = algorithm
+
+        # The positions of the edges in the edge list, so that edges can be removed without searching the list
+        self._edges = None
+        self._positions = {}
+
+        # The site where the next search for the cell of a location starts
+        self._hint = None
+
+        # The structure of the diagram, with the sites of which the cell changed since it was last collected
+        self._topology = None
+        self._site_indices = None
+        self._collected = 0
+        self._changed = set()
+
+    @staticmethod
+    def _distance(a, b):
+        return (a.xd - b.xd) ** 2 + (a.yd - b.yd) ** 2
+
+    def _borders(self, site):
+        """
+        The borders of a cell, like :func:`foronoi.graph.Point.borders`, but with a ValueError instead of an endless
+        walk when the borders do not form a ring. A ring has at most as many borders as the diagram has edges.
+        """
+        if site.first_edge is None:
+            return []
+
+        edges = []
+        edge = site.first_edge
+        limit = len(self.algorithm.edges) + 1
+        while edge is not None and len(edges) <= limit:
+            edges.append(edge)
+            edge = edge.next
+            if edge is site.first_edge:
+                return edges
+        raise ValueError(f"The borders of {site} do not form a ring.")
+
+    def locate(self, point, start=None):
+        """
+        Find the site whose cell contains a location, by walking from neighbor to neighbor towards the location.
+
+        Parameters
+        ----------
+        point: Coordinate
+            The location
+        start: Point
+            The site where the walk starts. By default, the walk starts at the site of the last edit.
+
+        Returns
+        -------
+        site: Point
+            The site closest to the location
+        """
+        with Numeric.use(self.algorithm.numeric):
+            point = Point(point.xd, point.yd)
+            site = start or self._hint or self.algorithm.sites[0]
+            distance = self._distance(site, point)
+
+            while True:
+                closest = None
+                for edge in self._borders(site):
+                    neighbor = edge.twin.incident_point
+                    if neighbor is not None and self._distance(neighbor, point) < distance:
+                        closest, distance = neighbor, self._distance(neighbor, point)
+
+                if closest is None:
+                    return site
+                site = closest
+
+    def insert_site(self, x, y):
+        """
+        Insert a new site into the diagram. The cell of the new site is carved out of the cells around it, and only
+        the part of the bounding polygon that now borders the new cell is clipped again.
+
+        The changed cells are checked afterwards (see :func:`_verify`). When they can not be carved locally, for
+        example because the new site lies on the circle through the sites of a vertex, the diagram is built again.
+
+        Parameters
+        ----------
+        x: float
+            The x-coordinate of the new site
+        y: float
+            The y-coordinate of the new site
+
+        Returns
+        -------
+        site: Point
+            The new site, which is appended to the sites of the diagram
+        """
+        algorithm = self.algorithm
+        with Numeric.use(algorithm.numeric):
+            point = Point(x, y, name=len(algorithm.sites))
+            if not algorithm.bounding_poly.inside(point):
+                raise ValueError(f"The site ({x}, {y}) lies outside of the bounding polygon.")
+
+            closest = self.locate(point)
+            if self._distance(closest, point) == 0:
+                raise ValueError(f"There is already a site at ({x}, {y}).")
+
+            algorithm.sites.append(point)
+            try:
+                self._insert(point, closest)
+                self._hint = point
+            except _LOCAL_ERRORS:
+                self._rebuild_sites()
+            self._topology = None
+
+        return point
+
+    def _insert(self, point, start):
+        # Carve the cell of the new site, and check that it took its area from the cells around it
+        cells = self._find_conflicts(point, start)[1]
+        area = self._area(cells)
+        self._carve(point, start)
+        self._verify([point] + cells, area)
+
+    def remove_site(self, point):
+        """
+        Remove a site from the diagram. Its cell is divided among its neighbors, and only the neighbors change.
+
+        The division is found by carving the neighbors one by one into the cell of the removed site, as a small
+        diagram of its own (see :class:`_Hole`), and then stitched into the cells of the neighbors. Like in
+        :func:`insert_site`, the diagram is built again when the cell can not be divided locally.
+
+        Parameters
+        ----------
+        point: Point
+            The site to remove, which is taken out of the sites of the diagram
+        """
+        with Numeric.use(self.algorithm.numeric):
+            self._check_site(point)
+            self.algorithm.sites.remove(point)
+            try:
+                self._remove(point)
+            except _LOCAL_ERRORS:
+                point.first_edge = None
+                self._rebuild_sites()
+            self._topology = None
+
+    def _remove(self, point):
+        # Divide the cell among the neighbors, but leave the site in the list of sites
+        hole = _Hole(point, self.algorithm.bounding_poly, self._borders(point))
+        area = self._area([point] + hole.neighbors)
+        hole.divide()
+        self._stitch(point, hole)
+
+        point.first_edge = None
+        if self._hint is None or self._hint is point:
+            self._hint = hole.neighbors[0]
+        self._verify(hole.neighbors, area)
+        return hole.neighbors
+
+    def move_site(self, point, x, y):
+        """
+        Move a site to a new location, by removing it and inserting it again at the new location. The site keeps its
+        place in the sites of the diagram. When either step can not be done locally, the diagram is built again with
+        the site at its new location, so that it is never left half edited.
+
+        Parameters
+        ----------
+        point: Point
+            The site to move
+        x: float
+            The new x-coordinate
+        y: float
+            The new y-coordinate
+        """
+        algorithm = self.algorithm
+        with Numeric.use(algorithm.numeric):
+            self._check_site(point)
+            target = Point(x, y)
+            if not algorithm.bounding_poly.inside(target):
+                raise ValueError(f"The site ({x}, {y}) lies outside of the bounding polygon.")
+
+            closest = self.locate(target, start=point)
+            if closest is not point and self._distance(closest, target) == 0:
+                raise ValueError(f"There is already a site at ({x}, {y}).")
+
+            try:
+                neighbors = self._remove(point)
+                point.xd, point.yd = target.xd, target.yd
+                self._insert(point, self.locate(point, start=neighbors[0] if closest is point else closest))
+                self._hint = point
+                self._changed.update(neighbors, self._get_neighbors(point), [point])
+            except _LOCAL_ERRORS:
+                point.xd, point.yd = target.xd, target.yd
+                self._rebuild_sites()
+
+    def move_sites(self, positions):
+        """
+        Move all sites at once. The vertices are updated in one vectorized pass, as long as the structure of the
+        diagram stays the same (see :class:`KineticTopology`). The sites around the edges that flip are taken out
+        at their old positions, and carved in again at their new positions once all other sites have moved.
+
+        When more than :attr:`rebuild_fraction` of the sites would be taken out, the diagram is built again instead,
+        keeping the same sites. The positions are checked before the diagram is changed.
+
+        Parameters
+        ----------
+        positions: numpy.ndarray
+            The (N, 2) array of the new positions, in the order of the sites
+
+        Returns
+        -------
+        changed: list(Point)
+            The sites of which the structure of the cell changed, and that were carved in again
+        """
+        algorithm = self.algorithm
+        if not algorithm.bounding_poly.points:
+            raise ValueError("All sites can only be moved at once in a diagram with a straight bounding polygon.")
+
+        positions = np.asarray(positions, dtype=float)
+        if positions.shape != (len(algorithm.sites), 2):
+            raise ValueError(f"Expected an array of shape ({len(algorithm.sites)}, 2), got an array of shape "
+                             f"{positions.shape}.")
+        if not np.isfinite(positions).all():
+            raise ValueError("All positions should be finite.")
+        if len(np.unique(positions, axis=0)) < len(positions):
+            raise ValueError("Two sites can not move to the same position.")
+
+        with Numeric.use(algorithm.numeric):
+            coordinates = [Coordinate(x, y) for x, y in positions.tolist()]
+            if not algorithm.bounding_poly._inside_all(coordinates).all():
+                raise ValueError("All sites should stay inside the bounding polygon.")
+
+            changed = self._repair(positions, coordinates)
+            if changed is None:
+                self._rebuild(positions)
+                changed = list(algorithm.sites)
+
+        return changed
+
+    def _repair(self, positions, coordinates):
+        """
+        Move the sites by taking out and carving in again the sites around the flipped edges. Returns None when too
+        many sites would change, or when a site can not be carved in again (for example because it lies exactly on a
+        vertex), after which the diagram has to be built again.
+        """
+        algorithm = self.algorithm
+        limit = self.rebuild_fraction * len(algorithm.sites)
+
+        # Take out the sites around flipped edges, until the rest of the diagram keeps its structure
+        changed, neighbors = [], {}
+        try:
+            while True:
+                topology = self._get_topology()
+                vertex_coordinates, flipped = topology.update(positions)
+                if len(flipped) == 0:
+                    break
+                if len(changed) + len(flipped) > limit:
+                    return None
+                for index in flipped.tolist():
+                    site = algorithm.sites[index]
+                    self._check_site(site)
+                    neighbors[site] = self._remove(site)
+                    self._changed.update(neighbors[site], [site])
+                    changed.append(site)
+
+            self._topology = topology._replace(coordinates=vertex_coordinates)
+            for vertex, (x, y) in zip(topology.vertices, vertex_coordinates.tolist()):
+                vertex.xd, vertex.yd = x, y
+            for site, coordinate in zip(algorithm.sites, coordinates):
+                site.xd, site.yd = coordinate.xd, coordinate.yd
+
+            # Search for the new cells from the old neighbors, which are close by when the sites move slowly
+            for site in changed:
+                start = next((neighbor for neighbor in neighbors[site] if neighbor.first_edge is not None), None)
+                self._carve(site, self.locate(site, start=start))
+                self._changed.update(self._get_neighbors(site), [site])
+            self._verify(list(dict.fromkeys(
+                cell for site in changed for cell in [site] + self._get_neighbors(site)
+            )))
+        except _LOCAL_ERRORS:
+            return None
+
+        return changed
+
+    def _rebuild(self, positions):
+        """
+        Build the diagram again at the given positions. The sites and the bounding polygon stay the same objects, and
+        the polygon is only used to clip the new diagram. The sites keep their names.
+        """
+        algorithm = self.algorithm
+        polygon = algorithm.bounding_poly
+        polygon.polygon_vertices = [Vertex(point.xd, point.yd) for point in polygon.points]
+
+        rebuilt = type(algorithm)(remove_zero_length_edges=algorithm.remove_zero_length_edges,
+                                  numeric=algorithm.numeric, event_queue_class=type(algorithm.event_queue),
+                                  zero_length_tolerance=algorithm.zero_length_tolerance)
+        rebuilt.sweep(positions)
+        rebuilt.bounding_poly = polygon
+        rebuilt._finish()
+
+        # Hand the new cells to the old sites
+        sites = dict(zip(rebuilt.sites, algorithm.sites))
+        for edge in rebuilt.edges:
+            for half_edge in (edge, edge.twin):
+                half_edge.incident_point = sites.get(half_edge.incident_point)
+        for rebuilt_site, site in sites.items():
+            site.xd, site.yd = rebuilt_site.xd, rebuilt_site.yd
+            site.first_edge = rebuilt_site.first_edge
+
+        algorithm.edges, algorithm._vertices = rebuilt.edges, rebuilt._vertices
+        self._hint, self._topology, self._changed = None, None, set()
+
+    def cell_metrics(self):
+        """
+        Calculate the area, centroid, perimeter and bounding box of every cell at once, from the structure that
+        :func:`move_sites` keeps up to date (see :func:`KineticTopology.cell_metrics`). Unlike
+        :func:`foronoi.algorithm.Algorithm.cell_metrics`, the cells are not packed into arrays again, unless their
+        structure changed.
+
+        Returns
+        -------
+        metrics: CellMetrics
+            The metrics of the cells, in the order of the sites
+        """
+        return self._get_topology().cell_metrics(len(self.algorithm.sites))
+
+    def _get_topology(self):
+        algorithm = self.algorithm
+
+        # Collect the structure from scratch once the vertices that were taken out outnumber the others
+        if self._topology is not None and self._changed and len(self._topology.vertices) <= 2 * self._collected:
+            edges, seen = [], set()
+            for site in self._changed:
+                for edge in self._borders(site):
+                    if edge.twin not in seen:
+                        seen.add(edge)
+                        edges.append(edge)
+            changed = np.array([self._site_indices[site] for site in self._changed], dtype=np.intp)
+            self._topology = self._topology.patch(self._site_indices, edges, algorithm.bounding_poly, changed)
+        elif self._topology is None or self._changed:
+            self._site_indices = {site: index for index, site in enumerate(algorithm.sites)}
+            self._topology = KineticTopology.from_diagram(algorithm.sites, algorithm.edges, algorithm.bounding_poly)
+            self._collected = len(self._topology.vertices)
+
+        self._changed = set()
+        return self._topology
+
+    def _get_neighbors(self, point):
+        return [edge.twin.incident_point for edge in self._borders(point) if edge.twin.incident_point is not None]
+
+    def _area(self, sites):
+        # The bounding circle knows the exact area of the cells along it
+        polygon = self.algorithm.bounding_poly
+        area = getattr(polygon, "cell_area", Point.area)
+        return sum(area(site) for site in sites)
+
+    def _verify(self, sites, area=None):
+        """
+        Check that a local edit left a valid diagram behind, and raise a ValueError otherwise. The cells of the given
+        sites should be closed rings of edges that are consistent with their twins, every vertex should lie at least
+        as close to its own site as to any site nearby, no cell should have a zero-length edge (which building the
+        diagram again would remove) or a vertex on the polygon without a cell behind it, and together the cells
+        should still cover `area`.
+        """
+        algorithm = self.algorithm
+        polygon = algorithm.bounding_poly
+        corners = {(corner.xd, corner.yd) for corner in polygon.points}
+        scale = max(abs(float(value)) for value in (polygon.min_x, polygon.max_x, polygon.min_y, polygon.max_y))
+        tolerance = self.tolerance * max(scale, 1) ** 2
+
+        rings = {site: self._borders(site) for site in sites}
+        nearby = dict.fromkeys(sites)
+        for site, borders in rings.items():
+            for edge in borders:
+                next_edge, neighbor = edge.next, edge.twin.incident_point
+                if edge.removed or edge.incident_point is not site or edge.twin.twin is not edge \
+                        or next_edge.prev is not edge or (next_edge.origin.xd, next_edge.origin.yd) != (edge.twin.origin.xd, edge.twin.origin.yd):
+                    raise ValueError(f"The borders of {site} are not consistent.")
+                if algorithm.remove_zero_length_edges and \
+                        abs(edge.origin.xd - next_edge.origin.xd) <= algorithm.zero_length_tolerance and \
+                        abs(edge.origin.yd - next_edge.origin.yd) <= algorithm.zero_length_tolerance:
+                    raise ValueError(f"The cell of {site} has an edge of zero length.")
+                if neighbor is not None and neighbor is next_edge.twin.incident_point or \
+                        neighbor is None and next_edge.twin.incident_point is None and \
+                        (next_edge.origin.xd, next_edge.origin.yd) not in corners:
+                    raise ValueError(f"The cell of {site} has a vertex that does not separate cells.")
+                if neighbor is not None:
+                    nearby[neighbor] = None
+
+        for site, borders in rings.items():
+            for edge in borders:
+                distance = self._distance(edge.origin, site)
+                if any(float(distance - self._distance(edge.origin, other)) > tolerance for other in nearby):
+                    raise ValueError(f"A vertex of the cell of {site} lies closer to another site.")
+
+        if area is not None and abs(self._area(sites) - area) > tolerance:
+            raise ValueError("The changed cells do not cover the same area as before.")
+
+    def _rebuild_sites(self):
+        # Build the diagram again from the sites, when a local edit could not be completed
+        self._rebuild([(site.xd, site.yd) for site in self.algorithm.sites])
+
+    def _check_site(self, point):
+        if point.first_edge is None or point.first_edge.incident_point is not point:
+            raise ValueError(f"The site {point} is not part of the diagram.")
+        if all(edge.twin.incident_point is None for edge in self._borders(point)):
+            raise ValueError("The last site of the diagram can not be removed.")
+
+    def _find_conflicts(self, point, start):
+        """
+        Find the vertices that lie closer to the new site than to the sites around them, and the cells that have such
+        vertices. These are the only cells that lose area to the new cell.
+
+        Returns
+        -------
+        conflicts: dict
+            Whether a vertex lies closer to the new site, for the vertices of all affected cells
+        cells: list(Point)
+            The affected cells, starting with the cell that contains the new site
+        """
+        conflicts = {}
+        cells = {start: None}
+        queue = [start]
+
+        while queue:
+            site = queue.pop()
+            borders = self._borders(site)
+            for edge in borders:
+                if edge.origin not in conflicts:
+                    conflicts[edge.origin] = self._in_conflict(edge, point)
+
+            # The cell on the other side shares the vertices of the edge
+            for edge in borders:
+                neighbor = edge.twin.incident_point
+                if neighbor is not None and neighbor not in cells and (
+                        conflicts[edge.origin] or conflicts[edge.next.origin]):
+                    cells[neighbor] = None
+                    queue.append(neighbor)
+
+        return conflicts, list(cells)
+
+    def _in_conflict(self, edge, point):
+        """
+        Whether the origin of a border lies closer to the new site than to the sites around it. A vertex between three
+        cells is the center of the circle through their sites, so that the exact in-circle test decides. A vertex on
+        the bounding polygon is compared by distance.
+        """
+        vertex, site = edge.origin, edge.incident_point
+        before, after = edge.prev.twin.incident_point, edge.twin.incident_point
+        if before is not None and after is not None and before is not after:
+            orientation = Predicates.orientation(site, after, before)
+            if orientation != 0:
+                return orientation * Predicates.incircle(site, after, before, point) > 0
+
+        return self._distance(vertex, point) < self._distance(vertex, site)
+
+    def _get_run(self, site, conflicts):
+        """
+        Find the part of the border of a cell that lies closer to the new site: the edge that enters it, the edges
+        that lie fully inside it, and the edge that leaves it.
+        """
+        borders = self._borders(site)
+        inside = [conflicts[edge.origin] for edge in borders]
+        enter = [i for i in range(len(borders)) if not inside[i] and inside[(i + 1) % len(borders)]]
+        leave = [i for i in range(len(borders)) if inside[i] and not inside[(i + 1) % len(borders)]]
+        if len(enter) != 1 or len(leave) != 1:
+            raise ValueError(f"The cell of {site} can not be carved locally, because it is not convex.")
+
+        first, last = enter[0], leave[0]
+        inner = [borders[i % len(borders)] for i in range(first + 1, last + (last < first) * len(borders))]
+        return borders[first], inner, borders[last]
+
+    def _next_border(self, edge):
+        """
+        The border of the next cell along the bounding polygon, after the border `edge`.
+        """
+        edge = edge.next
+        for _ in range(len(self.algorithm.edges) + 1):
+            if edge is None:
+                break
+            if edge.twin.incident_point is None:
+                return edge
+            edge = edge.twin.next
+        raise ValueError("The borders along the bounding polygon do not form a ring.")
+
+    def _carve(self, point, start):
+        """
+        Carve the cell of a new site out of the cells around it.
+
+        The vertices that lie closer to the new site form one connected region. Every edge that leaves this region is
+        cut where it crosses the bisector with the new site, and the cuts are connected by one new edge per affected
+        cell. The borders along the polygon that lie fully inside the region move to the new cell, keeping only the
+        corners of the polygon as vertices.
+        """
+        algorithm = self.algorithm
+        conflicts, cells = self._find_conflicts(point, start)
+        if not any(conflicts.values()):
+            raise ValueError(f"The site {point} lies on a vertex of the diagram.")
+
+        runs = {site: self._get_run(site, conflicts) for site in cells}
+
+        # Cut the edges that leave the region, once for both halves
+        cuts = {}
+        for site, (enter, _, leave) in runs.items():
+            for edge in (enter.twin, leave):
+                if edge not in cuts:
+                    start_vertex, end_vertex = edge.twin.origin, edge.origin
+                    if edge.twin.incident_point is None or edge.incident_point is None:
+                        x, y = algorithm.bounding_poly._border_crossing(start_vertex, end_vertex, site, point)
+                    else:
+                        x, y = Algebra.bisector_crossing(start_vertex, end_vertex, site, point)
+                    cuts[edge] = Vertex(x, y)
+
+        # Walk around the new cell, going from cell to cell, and along the polygon where the new cell borders it
+        corners = {(corner.xd, corner.yd) for corner in algorithm.bounding_poly.points}
+        order, paths = [], []
+        site = start
+        while site in runs and len(order) < len(cells):
+            enter = runs[site][0]
+            path = None
+            if enter.twin.incident_point is not None:
+                next_site = enter.twin.incident_point
+            else:
+                # The borders along the polygon that lie inside the region all have their vertices in the conflicts
+                path = [cuts[enter.twin]]
+                edge = self._next_border(enter)
+                for _ in range(len(conflicts)):
+                    if not conflicts.get(edge.twin.origin):
+                        break
+                    if (edge.origin.xd, edge.origin.yd) in corners:
+                        path.append(edge.origin)
+                    edge = self._next_border(edge)
+                if edge not in cuts:
+                    break
+                if (edge.origin.xd, edge.origin.yd) in corners:
+                    path.append(edge.origin)
+                next_site = edge.incident_point
+                path.append(cuts[edge])
+
+            order.append(site)
+            paths.append(path)
+            site = next_site
+            if site is start:
+                break
+
+        if site is not start or len(order) != len(cells):
+            raise ValueError(f"The cell of {point} can not be carved locally.")
+
+        # From here on, the diagram is changed
+        vertices = self._get_vertices()
+        for vertex in cuts.values():
+            vertices[vertex] = None
+        for vertex, conflict in conflicts.items():
+            if conflict and (vertex.xd, vertex.yd) not in corners:
+                vertices.pop(vertex, None)
+
+        for edge, vertex in cuts.items():
+            self._set_origin(edge, vertex)
+
+        borders = []
+        for site, path in zip(order, paths):
+            enter, inner, leave = runs[site]
+            for edge in inner:
+                self._remove_edge(edge)
+
+            # The new edge between the cell and the new cell
+            edge = HalfEdge(site, origin=cuts[enter.twin], twin=HalfEdge(point, origin=cuts[leave]))
+            edge.origin.connected_edges.append(edge)
+            edge.twin.origin.connected_edges.append(edge.twin)
+            enter.set_next(edge)
+            edge.set_next(leave)
+            self._add_edge(edge)
+            if site.first_edge.removed:
+                site.first_edge = enter
+
+            borders.append(edge.twin)
+            for origin, end in zip((path or [])[:-1], (path or [])[1:]):
+                border = HalfEdge(point, origin=origin, twin=HalfEdge(None, origin=end))
+                origin.connected_edges.append(border)
+                end.connected_edges.append(border.twin)
+                self._add_edge(border)
+                borders.append(border)
+
+        for edge, next_edge in zip(borders, borders[1:] + borders[:1]):
+            edge.set_next(next_edge)
+        point.first_edge = borders[0]
+
+    def _stitch(self, point, hole):
+        """
+        Replace the cell of a removed site by the pieces that its neighbors got in the divided hole.
+        """
+        borders = self._borders(point)
+        sides = hole.sides()
+
+        # Every neighbor borders the hole along its former edge with the removed site
+        for edge in borders:
+            if edge.twin.incident_point is not None:
+                side = sides.get(edge)
+                if side is None or hole.proxies[edge.twin.incident_point] is not side.incident_point:
+                    raise ValueError(f"The cell of {point} can not be divided locally.")
+
+        # Connect the rest of every piece to the cell of its neighbor
+        for edge, side in sides.items():
+            neighbor_edge = edge.twin
+            neighbor_edge.prev.set_next(side.next)
+            side.prev.set_next(neighbor_edge.next)
+            if neighbor_edge.incident_point.first_edge is neighbor_edge:
+                neighbor_edge.incident_point.first_edge = side.next
+
+        corners = {hole.corner(edge.origin): edge.origin for edge in borders}
+        vertices = self._get_vertices()
+        for vertex in hole.vertices:
+            if vertex not in corners:
+                vertex.connected_edges = []
+                vertices[vertex] = None
+
+        for edge in borders:
+            self._remove_edge(edge)
+
+        replaced = set(sides.values())
+        for edge in hole.edges:
+            if edge in replaced:
+                continue
+            for half_edge in (edge, edge.twin):
+                half_edge.incident_point = hole.originals.get(half_edge.incident_point)
+                half_edge.origin = corners.get(half_edge.origin, half_edge.origin)
+                half_edge.origin.connected_edges.append(half_edge)
+            self._add_edge(edge)
+
+        # The corners where the cell of the removed site met two neighbors are now in the middle of a straight edge
+        polygon_corners = {(corner.xd, corner.yd) for corner in self.algorithm.bounding_poly.points}
+        for vertex in corners.values():
+            if (vertex.xd, vertex.yd) not in polygon_corners:
+                self._dissolve(vertex)
+
+    def _dissolve(self, vertex):
+        """
+        Remove a vertex between two edges that separate the same two cells, by joining the edges.
+        """
+        edges = vertex.connected_edges
+        if len(edges) != 2:
+            return
+
+        edge = edges[0] if edges[0].incident_point is not None else edges[1]
+        previous = edge.prev
+        if previous is None or previous.twin.incident_point is not edge.twin.incident_point:
+            return
+
+        # The previous edge runs on to the end of the edge, and its twin starts there. The twins outside of the
+        # polygon are not linked to each other.
+        if edge.twin.incident_point is not None:
+            edge.twin.prev.set_next(previous.twin)
+        previous.set_next(edge.next)
+        self._set_origin(previous.twin, edge.twin.origin)
+        for half_edge, replacement in ((edge, previous), (edge.twin, previous.twin)):
+            if half_edge.incident_point is not None and half_edge.incident_point.first_edge is half_edge:
+                half_edge.incident_point.first_edge = replacement
+
+        self._remove_edge(edge)
+        self._get_vertices().pop(vertex, None)
+
+    def _get_vertices(self):
+        # An ordered set, from which vertices can be removed at once
+        if not isinstance(self.algorithm._vertices, dict):
+            self.algorithm._vertices = dict.fromkeys(self.algorithm._vertices)
+        return self.algorithm._vertices
+
+    @staticmethod
+    def _set_origin(edge, vertex):
+        if isinstance(edge.origin, Vertex) and edge in edge.origin.connected_edges:
+            edge.origin.connected_edges.remove(edge)
+        edge.origin = vertex
+        vertex.connected_edges.append(edge)
+
+    def _get_positions(self):
+        edges = self.algorithm.edges
+        if self._edges is not edges or len(self._positions) != len(edges):
+            self._edges = edges
+            self._positions = {edge: index for index, edge in enumerate(edges)}
+        return self._positions
+
+    def _add_edge(self, edge):
+        positions = self._get_positions()
+        positions[edge] = len(self._edges)
+        self._edges.append(edge)
+
+    def _remove_edge(self, edge):
+        """
+        Remove both halves of an edge from the diagram. The last edge of the edge list takes its place.
+        """
+        if edge.removed:
+            return
+
+        for half_edge in (edge, edge.twin):
+            if isinstance(half_edge.origin, Vertex) and half_edge in half_edge.origin.connected_edges:
+                half_edge.origin.connected_edges.remove(half_edge)
+        edge.removed = edge.twin.removed = True
+
+        positions = self._get_positions()
+        index = positions.pop(edge, None)
+        if index is None:
+            index = positions.pop(edge.twin)
+
+        last = self._edges.pop()
+        if index < len(self._edges):
+            self._edges[index] = last
+            positions[last] = index
+
+
+class _Hole:
+    def __init__(self, point, polygon, borders):
+        """
+        The cell of a site that is removed, as a small diagram of its own. It starts out as one cell that belongs to
+        the first neighbor, and the other neighbors are carved into it one by one with :class:`DiagramEditor`.
+
+        The neighbors and the vertices of the cell are copied, so that the diagram itself is left alone until the
+        pieces are stitched into it.
+
+        Parameters
+        ----------
+        point: Point
+            The site that is removed
+        polygon: Polygon
+            The bounding polygon of the diagram
+        borders: list(HalfEdge)
+            The borders of the cell of the site
+        """
+        self.polygon = polygon
+        self.numeric = Numeric.get_mode()
+        self._borders = borders
+
+        self.neighbors = list(dict.fromkeys(
+            edge.twin.incident_point for edge in self._borders if edge.twin.incident_point is not None
+        ))
+        self.proxies = {neighbor: Point(neighbor.xd, neighbor.yd, name=neighbor.name) for neighbor in self.neighbors}
+        self.originals = {proxy: neighbor for neighbor, proxy in self.proxies.items()}
+        # The corners are found by location, because a vertex on the polygon can be shared by more than one border
+        self.corners = {(edge.origin.xd, edge.origin.yd): Vertex(edge.origin.xd, edge.origin.yd)
+                        for edge in self._borders}
+
+        # The corners of the hole, and whether each side lies on the bounding polygon
+        self.points = list(self.corners.values())
+        self._on_polygon = {}
+        for edge in self._borders:
+            origin, end = self.corner(edge.origin), self.corner(edge.twin.origin)
+            self._on_polygon[(origin, end)] = self._on_polygon[(end, origin)] = edge.twin.incident_point is None
+        self._cuts = {}
+
+        # The diagram inside the hole
+        first = self.proxies[self.neighbors[0]]
+        ring = []
+        for edge in self._borders:
+            origin, end = self.corner(edge.origin), self.corner(edge.twin.origin)
+            border = HalfEdge(first, origin=origin, twin=HalfEdge(None, origin=end))
+            origin.connected_edges.append(border)
+            end.connected_edges.append(border.twin)
+            ring.append(border)
+        for edge, next_edge in zip(ring, ring[1:] + ring[:1]):
+            edge.set_next(next_edge)
+        first.first_edge = ring[0]
+
+        self.bounding_poly = self
+        self.sites = [first]
+        self.edges = ring
+        self._vertices = dict.fromkeys(self.points)
+
+    @property
+    def vertices(self):
+        return list(self._vertices)
+
+    def corner(self, vertex):
+        """
+        The copy in the hole of a vertex of the removed cell.
+        """
+        corner = self.corners.get((vertex.xd, vertex.yd))
+        if corner is None:
+            raise ValueError(f"The vertex {vertex} is not a corner of the removed cell.")
+        return corner
+
+    def divide(self):
+        """
+        Carve the other neighbors into the hole, and combine the vertices that end up at (almost) the same location,
+        such as the vertices near the corners where two neighbors meet.
+        """
+        editor = DiagramEditor(self)
+        for neighbor in self.neighbors[1:]:
+            proxy = self.proxies[neighbor]
+
+            # The neighbors lie outside the hole, so the carving starts at any cell that loses area
+            start = next((
+                site for site in self.sites
+                if any(editor._distance(edge.origin, proxy) < editor._distance(edge.origin, site)
+                       for edge in editor._borders(site))
+            ), None)
+            if start is None:
+                raise ValueError(f"The cell of {neighbor} can not be divided locally.")
+            editor._carve(proxy, start)
+            self.sites.append(proxy)
+
+        self._snap(editor)
+
+    def _snap(self, editor):
+        corners = set(self.points)
+        scale = max(max(abs(corner.xd), abs(corner.yd)) for corner in self.points)
+        tolerance = 1e-9 * max(float(scale), 1)
+
+        representatives = {}
+        kept = list(self.points)
+        for vertex in self.vertices:
+            if vertex in corners:
+                continue
+            representatives[vertex] = next((
+                other for other in kept
+                if abs(float(other.xd - vertex.xd)) <= tolerance and abs(float(other.yd - vertex.yd)) <= tolerance
+            ), vertex)
+            if representatives[vertex] is vertex:
+                kept.append(vertex)
+            else:
+                for edge in list(vertex.connected_edges):
+                    editor._set_origin(edge, representatives[vertex])
+                del self._vertices[vertex]
+
+        for edge in list(self.edges):
+            if edge.origin is edge.twin.origin:
+                edge.delete()
+                edge.twin.delete()
+                editor._remove_edge(edge)
+
+    def sides(self):
+        """
+        Find the borders of the pieces along the former edges between the removed site and its neighbors.
+
+        Returns
+        -------
+        sides: dict
+            The border in the hole for every edge of the removed site that has a neighbor on its other side
+        """
+        edges = {(self.corner(edge.origin), self.corner(edge.twin.origin)): edge for edge in self._borders
+                 if edge.twin.incident_point is not None}
+        return {
+            edges[(border.origin, border.twin.origin)]: border for border in self.edges
+            if border.twin.incident_point is None and (border.origin, border.twin.origin) in edges
+        }
+
+    def _border_crossing(self, start, end, site, other):
+        # Sides on the bounding polygon are cut like the polygon would cut them, other sides are straight edges
+        on_polygon = None
+        for vertex in (start, end):
+            on_polygon = self._cuts.get((vertex.xd, vertex.yd), on_polygon)
+        if on_polygon is None:
+            on_polygon = self._on_polygon[(start, end)]
+
+        if on_polygon:
+            crossing = self.polygon._border_crossing(start, end, site, other)
+        else:
+            crossing = Algebra.bisector_crossing(start, end, site, other)
+        self._cuts[crossing] = on_polygon
+        return crossing
@@ -3,6 +3,8 @@ from foronoi.graph.vertex import Vertex
 
 
 class HalfEdge:
+    __slots__ = ("origin", "incident_point", "_twin", "next", "prev", "removed")
+
     def __init__(self, incident_point, twin=None, origin=None):
         """
         Edges are normally treated as undirected and shared between faces. However, for some tasks (such as simplifying
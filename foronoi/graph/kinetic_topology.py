@@ -0,0 +1,388 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from foronoi.graph.voronoi_arrays import CellMetrics
+
+
+class KineticTopology(NamedTuple):
+    """
+    The combinatorial structure of a finished diagram: which sites define every vertex, and which vertices and sites
+    belong to every edge. As long as the structure stays the same, the vertices follow from the sites alone, so that
+    moving all sites only takes one vectorized pass (see :func:`foronoi.algorithm.Algorithm.move_sites`).
+
+    Examples
+    --------
+    Find the sites around the edges that flip when the sites move
+
+    >>> topology = KineticTopology.from_diagram(v.sites, v.edges, v.bounding_poly)
+    >>> coordinates, flipped = topology.update(positions)
+
+    Attributes
+    ----------
+    vertices: list(Vertex)
+        The vertices of the diagram, including the vertices that were taken out since the structure was collected
+        from scratch
+    indices: dict(Vertex, int)
+        The index of every vertex
+    coordinates: numpy.ndarray
+        The (V, 2) array of the current vertex coordinates
+    inner: numpy.ndarray
+        The (I,) array of indices of the vertices inside the polygon
+    inner_sites: numpy.ndarray
+        The (I, 3) array of indices of the three sites around each inner vertex, whose circumcenter it is
+    border: numpy.ndarray
+        The (B,) array of indices of the vertices on the sides of the polygon, except the corners
+    border_sites: numpy.ndarray
+        The (B, 2) array of indices of the two sites whose bisector crosses the side at each border vertex
+    border_sides: numpy.ndarray
+        The (B, 2, 2) array of the start and end of the side of each border vertex, clockwise
+    edges: numpy.ndarray
+        The (E, 2) array of vertex indices of the start and end of each edge
+    edge_sites: numpy.ndarray
+        The (E, 2) array of indices of the sites to the right and to the left of each edge, looking from its start to
+        its end. The index is -1 at the side of the polygon.
+    edge_sides: numpy.ndarray
+        The (E, 2) array with the direction of the side of the polygon under each edge along the polygon, and zeros
+        for the other edges and the edges between two corners
+    degenerate: numpy.ndarray
+        The (D,) array of indices of the vertices where more sites meet than the vertex is computed from, like the
+        center of four cocircular sites
+    degenerate_sites: numpy.ndarray
+        The (D, K) array of indices of the sites around each degenerate vertex, padded with -1
+    degenerate_sides: numpy.ndarray
+        The (D, 2, 2) array of the start and end of the side of each degenerate vertex on the polygon, clockwise, and
+        NaN for the degenerate vertices inside the polygon
+    """
+
+    vertices: list
+    indices: dict
+    coordinates: np.ndarray
+    inner: np.ndarray
+    inner_sites: np.ndarray
+    border: np.ndarray
+    border_sites: np.ndarray
+    border_sides: np.ndarray
+    edges: np.ndarray
+    edge_sites: np.ndarray
+    edge_sides: np.ndarray
+    degenerate: np.ndarray
+    degenerate_sites: np.ndarray
+    degenerate_sides: np.ndarray
+
+    # The sites around a degenerate vertex still meet in it while their distances to it differ by at most this part
+    tolerance = 1e-9
+
+    @classmethod
+    def from_diagram(cls, sites, edges, polygon):
+        """
+        Collect the structure of a finished diagram with a straight bounding polygon.
+
+        Parameters
+        ----------
+        sites: list(Point)
+            The sites, in the order of the input points
+        edges: list(HalfEdge)
+            One half edge of every edge
+        polygon: Polygon
+            The bounding polygon
+
+        Returns
+        -------
+        topology: KineticTopology
+        """
+        return cls._collect({site: index for index, site in enumerate(sites)}, {}, edges, polygon)
+
+    def patch(self, site_indices, edges, polygon, changed):
+        """
+        Collect the structure again around the cells that changed, and keep the rest. The vertices keep their
+        indices, and the new vertices are added at the end, so that the vertices that are no longer part of the
+        diagram stay behind until the structure is collected from scratch.
+
+        Parameters
+        ----------
+        site_indices: dict(Point, int)
+            The index of every site
+        edges: list(HalfEdge)
+            One half edge of every edge of the cells that changed
+        polygon: Polygon
+            The bounding polygon
+        changed: numpy.ndarray
+            The indices of the sites of which the cell changed, or was taken out
+
+        Returns
+        -------
+        topology: KineticTopology
+        """
+        around = self._collect(site_indices, self.indices, edges, polygon)
+
+        # The vertices that were collected again take their coordinates from the diagram
+        coordinates = around.coordinates
+        untouched = np.ones(len(self.coordinates), dtype=bool)
+        untouched[around.edges[around.edges < len(self.coordinates)]] = False
+        coordinates[:len(self.coordinates)][untouched] = self.coordinates[untouched]
+
+        def keep(sites):
+            return ~np.isin(sites, changed).any(axis=1)
+
+        inner, border, edge = keep(self.inner_sites), keep(self.border_sites), keep(self.edge_sites)
+        degenerate = keep(self.degenerate_sites)
+        width = max(self.degenerate_sites.shape[1], around.degenerate_sites.shape[1])
+        return self._replace(
+            vertices=around.vertices,
+            coordinates=coordinates,
+            inner=np.concatenate((self.inner[inner], around.inner)),
+            inner_sites=np.concatenate((self.inner_sites[inner], around.inner_sites)),
+            border=np.concatenate((self.border[border], around.border)),
+            border_sites=np.concatenate((self.border_sites[border], around.border_sites)),
+            border_sides=np.concatenate((self.border_sides[border], around.border_sides)),
+            edges=np.concatenate((self.edges[edge], around.edges)),
+            edge_sites=np.concatenate((self.edge_sites[edge], around.edge_sites)),
+            edge_sides=np.concatenate((self.edge_sides[edge], around.edge_sides)),
+            degenerate=np.concatenate((self.degenerate[degenerate], around.degenerate)),
+            degenerate_sites=np.concatenate((self._pad(self.degenerate_sites[degenerate], width),
+                                             self._pad(around.degenerate_sites, width))),
+            degenerate_sides=np.concatenate((self.degenerate_sides[degenerate], around.degenerate_sides)),
+        )
+
+    @staticmethod
+    def _pad(sites, width):
+        return np.pad(sites, ((0, 0), (0, width - sites.shape[1])), constant_values=-1)
+
+    @classmethod
+    def _collect(cls, site_indices, vertex_indices, edges, polygon):
+        # The vertices that are already known keep their index, and only the vertices of the edges get their sites
+        known = len(vertex_indices)
+        cells = {}
+        on_border = set()
+
+        def vertex_index(vertex):
+            index = vertex_indices.setdefault(vertex, len(vertex_indices))
+            if index not in cells:
+                cells[index] = {}
+            return index
+
+        edge_vertices, edge_sites = [], []
+        for edge in edges:
+            # The site of a half edge lies to its right, and the polygon has no site
+            if edge.incident_point is None:
+                edge = edge.twin
+            # Both ends of an edge belong to the cells on both of its sides, also when only some edges are collected
+            ends = vertex_index(edge.origin), vertex_index(edge.twin.origin)
+            for index in ends:
+                cells[index][site_indices[edge.incident_point]] = None
+                if edge.twin.incident_point is None:
+                    on_border.add(index)
+                else:
+                    cells[index][site_indices[edge.twin.incident_point]] = None
+
+            edge_vertices.append(ends)
+            edge_sites.append((site_indices[edge.incident_point], site_indices.get(edge.twin.incident_point, -1)))
+
+        vertices = list(vertex_indices)
+        coordinates = np.array([(vertex.xd, vertex.yd) for vertex in vertices[known:]], dtype=float).reshape(-1, 2)
+        coordinates = np.concatenate((np.zeros((known, 2)), coordinates))
+        for index in cells:
+            if index < known:
+                coordinates[index] = vertices[index].xd, vertices[index].yd
+        corners = {(point.xd, point.yd) for point in polygon.points}
+        sides = np.array([(point.xd, point.yd) for point in polygon.points], dtype=float)
+
+        inner, inner_sites, border, border_sites, degenerate, degenerate_sites = [], [], [], [], [], []
+        for index, around in cells.items():
+            if index in on_border:
+                # The corners, and the vertices along a side with only one cell, never move
+                vertex = vertices[index]
+                if (vertex.xd, vertex.yd) in corners or len(around) < 2:
+                    continue
+                if len(around) == 2:
+                    border.append(index)
+                    border_sites.append(list(around))
+                    continue
+            elif len(around) == 3:
+                inner.append(index)
+                inner_sites.append(list(around))
+                continue
+            degenerate.append(index)
+            degenerate_sites.append(list(around))
+
+        # The side of every border vertex is the side closest to it
+        border, degenerate = np.array(border, dtype=np.intp), np.array(degenerate, dtype=np.intp)
+        starts, ends = sides, np.roll(sides, -1, axis=0)
+        direction = ends - starts
+        on_side = np.array([index in on_border for index in degenerate.tolist()], dtype=bool)
+        side = cls._nearest_sides(coordinates[border], starts, ends)
+        degenerate_side = cls._nearest_sides(coordinates[degenerate[on_side]], starts, ends)
+        border_side_of = dict(zip(border.tolist() + degenerate[on_side].tolist(),
+                                  side.tolist() + degenerate_side.tolist()))
+
+        # Every degenerate vertex gets at least three sites, so that a circumcenter can be computed for it
+        width = max([3] + [len(around) for around in degenerate_sites])
+        padded = np.full((len(degenerate), width), -1, dtype=np.intp)
+        for row, around in enumerate(degenerate_sites):
+            padded[row, :len(around)] = around
+        degenerate_sides = np.full((len(degenerate), 2, 2), np.nan)
+        degenerate_sides[on_side] = np.stack((starts[degenerate_side], ends[degenerate_side]), axis=1).reshape(-1, 2, 2)
+
+        edge_vertices = np.array(edge_vertices, dtype=np.intp).reshape(-1, 2)
+        edge_sites = np.array(edge_sites, dtype=np.intp).reshape(-1, 2)
+        edge_sides = np.zeros((len(edge_vertices), 2))
+        for position in np.flatnonzero(edge_sites[:, 1] < 0):
+            for index in edge_vertices[position]:
+                if index in border_side_of:
+                    edge_sides[position] = direction[border_side_of[index]]
+
+        return cls(
+            vertices=vertices,
+            indices=vertex_indices,
+            coordinates=coordinates,
+            inner=np.array(inner, dtype=np.intp),
+            inner_sites=np.array(inner_sites, dtype=np.intp).reshape(-1, 3),
+            border=border,
+            border_sites=np.array(border_sites, dtype=np.intp).reshape(-1, 2),
+            border_sides=np.stack((starts[side], ends[side]), axis=1).reshape(-1, 2, 2),
+            edges=edge_vertices,
+            edge_sites=edge_sites,
+            edge_sides=edge_sides,
+            degenerate=degenerate,
+            degenerate_sites=padded,
+            degenerate_sides=degenerate_sides,
+        )
+
+    @staticmethod
+    def _nearest_sides(points, starts, ends):
+        if len(points) == 0:
+            return np.zeros(0, dtype=np.intp)
+        direction = ends - starts
+        t = np.einsum("bkd,kd->bk", points[:, None, :] - starts[None], direction) / np.einsum("kd,kd->k", direction,
+                                                                                             direction)
+        nearest = starts[None] + np.clip(t, 0, 1)[..., None] * direction[None]
+        return np.argmin(np.linalg.norm(points[:, None, :] - nearest, axis=2), axis=1)
+
+    @staticmethod
+    def _circumcenters(a, b, c):
+        # Relative to the first site
+        b, c = b - a, c - a
+        d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+        b2, c2 = (b ** 2).sum(axis=1), (c ** 2).sum(axis=1)
+        return a + np.stack((c[:, 1] * b2 - b[:, 1] * c2, b[:, 0] * c2 - c[:, 0] * b2), axis=1) / d[:, None]
+
+    @staticmethod
+    def _crossings(i, j, start, end):
+        # Where the difference of the squared distances to both sites is zero, as a part of the side
+        power_start = ((start - i) ** 2).sum(axis=1) - ((start - j) ** 2).sum(axis=1)
+        power_end = ((end - i) ** 2).sum(axis=1) - ((end - j) ** 2).sum(axis=1)
+        t = power_start / (power_start - power_end)
+        return start + t[:, None] * (end - start), t
+
+    def update(self, positions):
+        """
+        Compute the vertices for new positions of the sites, and find the sites around the edges that flipped.
+
+        The inner vertices are the circumcenters of their sites, and the border vertices are the crossings of the
+        bisectors of their sites with their sides. The structure is still valid when every edge keeps a positive
+        length in the direction of its bisector (or side), every border vertex stays on its side, and the sites around
+        every degenerate vertex stay at the same distance from it (see :attr:`tolerance`).
+
+        Parameters
+        ----------
+        positions: numpy.ndarray
+            The (N, 2) array of the new positions of the sites
+
+        Returns
+        -------
+        coordinates: numpy.ndarray
+            The (V, 2) array of the new vertex coordinates
+        flipped: numpy.ndarray
+            The indices of the sites whose cells change structure
+        """
+        coordinates = self.coordinates.copy()
+        flipped = []
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centers = self._circumcenters(*(positions[self.inner_sites[:, i]] for i in range(3)))
+            coordinates[self.inner] = centers
+            flipped.append(self.inner_sites[~np.isfinite(centers).all(axis=1)].ravel())
+
+            crossings, t = self._crossings(positions[self.border_sites[:, 0]], positions[self.border_sites[:, 1]],
+                                           self.border_sides[:, 0], self.border_sides[:, 1])
+            coordinates[self.border] = crossings
+            flipped.append(self.border_sites[~((t > 0) & (t < 1))].ravel())
+
+            # A degenerate vertex follows from its first sites, and stays while the other sites stay on its circle
+            sites = self.degenerate_sites
+            present = sites >= 0
+            around = positions[np.maximum(sites, 0)]
+            on_side = ~np.isnan(self.degenerate_sides[:, 0, 0])
+            centers = self._circumcenters(around[:, 0], around[:, 1], around[:, 2])
+            crossings, t = self._crossings(around[:, 0], around[:, 1], self.degenerate_sides[:, 0],
+                                           self.degenerate_sides[:, 1])
+            points = np.where(on_side[:, None], crossings, centers)
+            distance = np.linalg.norm(around - points[:, None, :], axis=2)
+            spread = np.where(present, distance, -np.inf).max(axis=1, initial=-np.inf) - \
+                np.where(present, distance, np.inf).min(axis=1, initial=np.inf)
+            valid = np.isfinite(points).all(axis=1) & (spread <= self.tolerance * np.where(present, distance, 0).max(axis=1, initial=0))
+            valid &= present.sum(axis=1) >= np.where(on_side, 3, 4)
+            valid &= ~on_side | ((t > 0) & (t < 1))
+            coordinates[self.degenerate[valid]] = points[valid]
+            flipped.append(sites[~valid][present[~valid]])
+
+        # The length of every edge along the direction in which it runs
+        right, left = self.edge_sites[:, 0], self.edge_sites[:, 1]
+        between = positions[left] - positions[right]
+        direction = np.where((left >= 0)[:, None], np.stack((between[:, 1], -between[:, 0]), axis=1), self.edge_sides)
+        length = ((coordinates[self.edges[:, 1]] - coordinates[self.edges[:, 0]]) * direction).sum(axis=1)
+        checked = (left >= 0) | self.edge_sides.any(axis=1)
+        wrong = checked & ~(length > 0)
+        flipped.append(right[wrong])
+        flipped.append(left[wrong & (left >= 0)])
+
+        return coordinates, np.unique(np.concatenate(flipped).astype(np.intp))
+
+    def cell_metrics(self, count) -> CellMetrics:
+        """
+        Calculate the area, centroid, perimeter and bounding box of all cells at once, from the edges alone. The
+        borders of a cell run clockwise, so that every edge runs along the cell on its right and against the cell on
+        its left, and the shoelace sums over the edges do not need the order of the borders.
+
+        Parameters
+        ----------
+        count: int
+            The number of sites
+
+        Returns
+        -------
+        metrics: CellMetrics
+        """
+        start, end = self.coordinates[self.edges[:, 0]], self.coordinates[self.edges[:, 1]]
+        right, left = self.edge_sites[:, 0], self.edge_sites[:, 1]
+        inner = left >= 0
+
+        # Every edge once for the cell on its right, and reversed for the cell on its left
+        cells = np.concatenate((right, left[inner]))
+        start, end = np.concatenate((start, end[inner])), np.concatenate((end, start[inner]))
+        x, y = start.T
+        next_x, next_y = end.T
+
+        # Shoelace formula
+        cross = x * next_y - next_x * y
+        signed_area = 0.5 * np.bincount(cells, weights=cross, minlength=count)
+        area = np.abs(signed_area)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centroid = np.stack((
+                np.bincount(cells, weights=(x + next_x) * cross, minlength=count),
+                np.bincount(cells, weights=(y + next_y) * cross, minlength=count),
+            ), axis=1) / (6 * signed_area[:, None])
+        centroid[area == 0] = np.nan
+
+        perimeter = np.bincount(cells, weights=np.hypot(next_x - x, next_y - y), minlength=count)
+
+        bounding_box = np.repeat([[np.inf, np.inf, -np.inf, -np.inf]], count, axis=0)
+        np.minimum.at(bounding_box[:, 0], cells, x)
+        np.minimum.at(bounding_box[:, 1], cells, y)
+        np.maximum.at(bounding_box[:, 2], cells, x)
+        np.maximum.at(bounding_box[:, 3], cells, y)
+        bounding_box[np.bincount(cells, minlength=count) == 0] = np.nan
+
+        return CellMetrics(area=area, centroid=centroid, perimeter=perimeter, bounding_box=bounding_box)
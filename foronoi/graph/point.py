@@ -5,6 +5,7 @@ from foronoi.graph.coordinate import Coordinate
 
 
 class Point(Coordinate):
+    __slots__ = ("name", "first_edge")
 
     def __init__(self, x=None, y=None, name=None, first_edge=None):
         """
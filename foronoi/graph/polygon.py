@@ -1,5 +1,10 @@
-from foronoi.graph import Coordinate, Vertex, HalfEdge
+import itertools
+import math
+
+from foronoi.graph import Coordinate, Vertex, HalfEdge, Numeric
 from foronoi.graph.algebra import Algebra
+from foronoi.graph.clipping import Clipping
+from foronoi.graph.prepared_polygon import PreparedPolygon
 import numpy as np
 
 from foronoi.observers.message import Message
@@ -7,6 +12,13 @@ from foronoi.observers.subject import Subject
 
 
 class Polygon(Subject):
+    # Polygons with at least this many vertices get a spatial index (see :class:`PreparedPolygon`)
+    prepare_threshold = 64
+
+    # Edges that are clipped at both ends to points closer together than this, relative to the size of the polygon,
+    # only touch the polygon
+    touch_tolerance = 1e-9
+
     def __init__(self, tuples):
         """
         A bounding polygon that will clip the edges and fit around the Voronoi diagram.
@@ -32,6 +44,18 @@ class Polygon(Subject):
         for point in self.points:
             self.polygon_vertices.append(Vertex(point.xd, point.yd))
 
+        self._prepared = None
+
+    def convert_coordinates(self):
+        """
+        Store all coordinates of the polygon in the active numeric backend (see :class:`foronoi.graph.Numeric`),
+        so that they can be combined with the coordinates of the diagram.
+        """
+        for coordinate in self.points + self.polygon_vertices + [self.center]:
+            coordinate.xd, coordinate.yd = coordinate.xd, coordinate.yd
+        self.min_y, self.min_x = Numeric.convert(self.min_y), Numeric.convert(self.min_x)
+        self.max_y, self.max_x = Numeric.convert(self.max_y), Numeric.convert(self.max_x)
+
     def _order_points(self, points):
         clockwise = sorted(points, key=lambda point: (-180 - Algebra.calculate_angle(point, self.center)) % 360)
         return clockwise
@@ -69,9 +93,11 @@ class Polygon(Subject):
             The list of all vertices including the
         """
         vertices = self._get_ordered_vertices(self.polygon_vertices)
+        chains = {vertex: self._get_chain(vertex) for vertex in vertices}
+        vertices = self._order_coincident(vertices, chains)
         vertices = list(vertices) + [vertices[0]]  # <- The extra vertex added here, should be removed later
         cell = self._get_closest_point(vertices[0], points)
-        previous_edge = None
+        previous_edge = first_edge = None
         for index in range(0, len(vertices) - 1):
 
             # Get origin
@@ -79,8 +105,8 @@ class Polygon(Subject):
             end = vertices[index + 1]
 
             # If vertex is connected to other edges, update the cell
-            if len(origin.connected_edges) > 0:
-                cell = origin.connected_edges[0].twin.incident_point
+            if chains[origin]:
+                cell = chains[origin][-1].twin.incident_point
 
             # Create the edge
             edge = HalfEdge(cell, origin=origin, twin=HalfEdge(None, origin=end))
@@ -92,12 +118,12 @@ class Polygon(Subject):
                 cell.first_edge = cell.first_edge or edge
 
             # Connect edges
-            if len(end.connected_edges) > 0:
-                edge.set_next(end.connected_edges[0])
+            if chains[end]:
+                edge.set_next(chains[end][0])
 
             # Connect to incoming edge, or previous edge
-            if len(origin.connected_edges) > 0:
-                origin.connected_edges[0].twin.set_next(edge)
+            if chains[origin]:
+                chains[origin][-1].twin.set_next(edge)
             elif previous_edge is not None:
                 previous_edge.set_next(edge)
 
@@ -106,11 +132,69 @@ class Polygon(Subject):
 
             # Set previous edge
             previous_edge = edge
+            first_edge = first_edge or edge
+
+        # Close the ring at a corner of the polygon
+        if not chains[vertices[0]]:
+            previous_edge.set_next(first_edge)
 
-        existing_vertices = [i for i in existing_vertices if self.inside(i)]
+        existing_vertices = list(existing_vertices)
+        inside = self._inside_all(existing_vertices)
+        existing_vertices = [vertex for vertex, is_inside in zip(existing_vertices, inside) if is_inside]
 
         return edges, vertices[:-1] + existing_vertices
 
+    def _order_coincident(self, vertices, chains):
+        """
+        Order the vertices on the polygon that lie at the same location, such as the clipped ends of edges that meet
+        exactly on the polygon, so that the edges that leave them follow each other around the cells between them.
+        The vertices without edges, such as the corners of the polygon, go first.
+        """
+        ordered = []
+        for _, group in itertools.groupby(vertices, key=lambda vertex: (vertex.xd, vertex.yd)):
+            group = list(group)
+            connected = [vertex for vertex in group if chains[vertex]]
+            if len(connected) > 1:
+                by_cell = {chains[vertex][0].incident_point: vertex for vertex in connected}
+                sides = {chains[vertex][-1].twin.incident_point for vertex in connected}
+                vertex = next((vertex for vertex in connected if chains[vertex][0].incident_point not in sides),
+                              connected[0])
+                chain = [vertex]
+                while len(chain) < len(connected):
+                    vertex = by_cell.get(chains[vertex][-1].twin.incident_point)
+                    if vertex is None or vertex in chain:
+                        break
+                    chain.append(vertex)
+                if len(chain) == len(connected):
+                    group = [vertex for vertex in group if not chains[vertex]] + chain
+            ordered.extend(group)
+        return ordered
+
+    @staticmethod
+    def _get_chain(vertex):
+        """
+        Order the edges that leave a vertex on the polygon into the polygon, so that every edge is followed by the
+        edge on the other side of the cell between them. The first edge belongs to the cell before the vertex along
+        the polygon, and the twin of the last edge to the cell after the vertex.
+        """
+        edges = [edge for edge in vertex.connected_edges if edge.twin.incident_point is not None]
+        if len(edges) < 2:
+            return edges
+
+        by_cell = {edge.incident_point: edge for edge in edges}
+        sides = {edge.twin.incident_point for edge in edges}
+        edge = next((edge for edge in edges if edge.incident_point not in sides), edges[0])
+        chain = [edge]
+        while edge.twin.incident_point in by_cell and len(chain) < len(edges):
+            edge = by_cell[edge.twin.incident_point]
+            chain.append(edge)
+        if len(chain) < len(edges):
+            return edges
+
+        for edge, next_edge in zip(chain, chain[1:]):
+            edge.twin.set_next(next_edge)
+        return chain
+
     def get_coordinates(self):
         return [(i.xd, i.yd) for i in self.points]
 
@@ -119,6 +203,9 @@ class Polygon(Subject):
         Clip the edges to the bounding box/polygon, and remove edges and vertices that are fully outside.
         Inserts vertices at the clipped edges' endings.
 
+        All edges are clipped at once by :class:`foronoi.graph.Clipping`: first the origins of the edges, and then
+        the origins of their twins, towards the clipped origins of the edges.
+
         Parameters
         ----------
         edges: list(HalfEdge)
@@ -129,63 +216,271 @@ class Polygon(Subject):
         clipped_edges: list(HalfEdge)
             A list of clipped edges
         """
-        resulting_edges = list()
-        for edge in edges:
+        polygon = np.array([(point.xd, point.yd) for point in self.points], dtype=float)
 
-            if edge.get_origin() is None or not self.inside(edge.get_origin()):
-                self._finish_edge(edge)
+        # The twins are clipped towards the clipped origins, so the edges have to go first
+        edge_vertices = self._finish_edges(edges, polygon)
+        twin_vertices = self._finish_edges([edge.twin for edge in edges], polygon)
 
-            if edge.twin.get_origin() is None or not self.inside(edge.twin.get_origin()):
-                self._finish_edge(edge.twin)
+        # Clipped ends that lie closer together than the rounding of the clipping are the same point
+        scale = max(abs(float(value)) for value in (self.min_x, self.max_x, self.min_y, self.max_y))
+        tolerance = self.touch_tolerance * max(scale, 1)
+        self._snap([vertex for vertex in edge_vertices + twin_vertices if vertex is not None and vertex.xd is not None],
+                   tolerance)
 
-            if edge.get_origin() is not None and edge.twin.get_origin() is not None:
+        resulting_edges = list()
+        on_polygon = {}
+        for edge, edge_vertex, twin_vertex in zip(edges, edge_vertices, twin_vertices):
+
+            # An edge that was clipped at both ends to the same point only touches the polygon from the outside
+            touching = (
+                edge_vertex is not None and twin_vertex is not None and edge_vertex.xd is not None
+                and twin_vertex.xd is not None and abs(float(edge_vertex.xd - twin_vertex.xd)) <= tolerance
+                and abs(float(edge_vertex.yd - twin_vertex.yd)) <= tolerance
+            )
+
+            # Store the new vertices in the same order as they would have been created one edge at a time
+            for vertex in (edge_vertex, twin_vertex):
+                if vertex is not None and not touching:
+                    self.polygon_vertices.append(vertex)
+
+            if edge.get_origin() is not None and edge.twin.get_origin() is not None and not touching:
                 resulting_edges.append(edge)
             else:
+                # A vertex that lies exactly on the polygon keeps its other edges, and becomes a vertex of the polygon
+                for half_edge, clipped in ((edge, edge_vertex), (edge.twin, twin_vertex)):
+                    if clipped is None and isinstance(half_edge.origin, Vertex) and self._on_edge(half_edge.origin):
+                        on_polygon[half_edge.origin] = None
+
                 edge.delete()
                 edge.twin.delete()
                 self.notify_observers(Message.DEBUG, payload=f"Edges {edge} and {edge.twin} deleted!")
 
+        self.polygon_vertices.extend(vertex for vertex in on_polygon if vertex.connected_edges)
         return resulting_edges
 
-    def _finish_edge(self, edge):
+    def _snap(self, vertices, tolerance):
+        """
+        Move clipped ends that lie within `tolerance` of a corner of the polygon, or of an earlier clipped end, to
+        exactly the same location, so that the cells that meet there are closed in the right order (see
+        :func:`finish_polygon`). The locations are looked up in a grid with cells of the size of the tolerance.
+
+        Parameters
+        ----------
+        vertices: list(Vertex)
+            The clipped ends
+        tolerance: float
+            The distance below which two locations are the same
+        """
+        def key(location):
+            return math.floor(float(location.xd) / tolerance), math.floor(float(location.yd) / tolerance)
+
+        grid = {}
+        for corner in self.points:
+            grid.setdefault(key(corner), []).append(corner)
+
+        for vertex in vertices:
+            column, row = key(vertex)
+            found = next((
+                other for cell in itertools.product((column - 1, column, column + 1), (row - 1, row, row + 1))
+                for other in grid.get(cell, ())
+                if abs(float(other.xd - vertex.xd)) <= tolerance and abs(float(other.yd - vertex.yd)) <= tolerance
+            ), None)
+            if found is None:
+                grid.setdefault((column, row), []).append(vertex)
+            else:
+                vertex.xd, vertex.yd = found.xd, found.yd
+
+    def _finish_edges(self, edges, polygon):
+        """
+        Clip the origins of the given half edges that are breakpoints or that lie outside of the polygon.
+
+        Parameters
+        ----------
+        edges: list(HalfEdge)
+            The half edges whose origins to clip
+        polygon: numpy.ndarray
+            The (K, 2) array of the polygon's vertices
+
+        Returns
+        -------
+        vertices: list(Vertex or None)
+            The new origin for every half edge that was clipped, and None for the other half edges
+        """
+        origins = [edge.get_origin() for edge in edges]
+        known = [index for index, origin in enumerate(origins) if origin is not None]
+        clip = np.ones(len(edges), dtype=bool)
+
+        if known:
+            clip[known] = ~self._inside_all([origins[index] for index in known])
+
         # Sweep line position
         sweep_line = self.min_y - abs(self.max_y)
 
-        # Start should be a breakpoint
-        start = edge.get_origin(y=sweep_line, max_y=self.max_y)
+        vertices = [None] * len(edges)
+        selected = np.flatnonzero(clip)
+        if len(selected) == 0:
+            return vertices
+
+        # The segments run from the (fixed) origin of the twin to the (moving) origin of the half edge
+        starts, ends, complete = [], [], []
+        for index in selected:
+            edge = edges[index]
+            start = edge.twin.get_origin(y=sweep_line, max_y=self.max_y)
+            end = edge.get_origin(y=sweep_line, max_y=self.max_y)
+            complete.append(start is not None and end is not None)
+            starts.append((start.xd, start.yd) if start is not None else (0, 0))
+            ends.append((end.xd, end.yd) if end is not None else (0, 0))
+
+        points, found = self._clip(np.array(starts, dtype=float), np.array(ends, dtype=float), polygon)
+        found &= np.array(complete)
+
+        # Create the vertices
+        for index, (x, y), has_point in zip(selected, points.tolist(), found.tolist()):
+            edge = edges[index]
+            v = Vertex(x, y) if has_point else Vertex(None, None)
+            v.connected_edges.append(edge)
+            edge.origin = v
+            vertices[index] = v
+
+        return vertices
+
+    def _clip(self, starts, ends, polygon):
+        """
+        Clip the segments from `starts` to `ends` against the polygon (see :func:`Clipping.clip`).
 
-        # End should be a vertex
-        end = edge.twin.get_origin(y=sweep_line, max_y=self.max_y)
+        Parameters
+        ----------
+        starts: numpy.ndarray
+            The (M, 2) array of segment starts
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends
+        polygon: numpy.ndarray
+            The (K, 2) array of the polygon's vertices
 
-        # Get point of intersection
-        point = self._get_intersection_point(end, start)
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        if self._is_large():
+            return self.prepare().clip(starts, ends)
+        return Clipping.clip(starts, ends, polygon)
 
-        # Create vertex
-        v = Vertex(point.x, point.y) if point is not None else Vertex(None, None)
-        v.connected_edges.append(edge)
-        edge.origin = v
-        self.polygon_vertices.append(v)
+    def _border_crossing(self, start, end, site, other):
+        """
+        Find where the border of a cell, between two of its vertices on the polygon, crosses the bisector of two
+        sites. Used to re-clip the cells that change when a site is inserted into a finished diagram.
 
-        return edge
+        Parameters
+        ----------
+        start: Vertex
+            The vertex on the side of `site`
+        end: Vertex
+            The vertex on the side of `other`
+        site: Point
+        other: Point
+
+        Returns
+        -------
+        crossing: (Decimal, Decimal)
+            The x,y-coordinates of the crossing
+        """
+        return Algebra.bisector_crossing(start, end, site, other)
 
     def _on_edge(self, point):
+        # Large polygons only test the sides near the point, which the spatial index of prepare() finds
+        if self._is_large():
+            sides = self.prepare().near_sides(np.array([float(point.xd), float(point.yd)])).tolist()
+        else:
+            sides = range(len(self.points))
+
         vertices = self.points + self.points[0:1]
-        for i in range(0, len(vertices) - 1):
-            dxc = point.xd - vertices[i].xd
-            dyc = point.yd - vertices[i].yd
-            dx1 = vertices[i + 1].xd - vertices[i].xd
-            dy1 = vertices[i + 1].yd - vertices[i].yd
+        for i in sides:
+            start, end = vertices[i], vertices[i + 1]
+            dxc = point.xd - start.xd
+            dyc = point.yd - start.yd
+            dx1 = end.xd - start.xd
+            dy1 = end.yd - start.yd
 
             cross = dxc * dy1 - dyc * dx1
 
-            if cross == 0:
+            # The point lies on the line through the side, and between its ends
+            if cross == 0 and min(start.xd, end.xd) <= point.xd <= max(start.xd, end.xd) \
+                    and min(start.yd, end.yd) <= point.yd <= max(start.yd, end.yd):
                 return True
         return False
 
+    def _outside(self, points):
+        """
+        Find the points that lie outside the polygon. Points on its border count as inside.
+
+        Parameters
+        ----------
+        points: list(Coordinate)
+
+        Returns
+        -------
+        outside: list(Coordinate)
+        """
+        return [point for point, inside in zip(points, self._inside_all(points))
+                if not inside and not self._on_edge(point)]
+
+    def prepare(self):
+        """
+        Build (once) the spatial index over the sides of the polygon, which is used automatically for polygons with
+        at least :attr:`prepare_threshold` vertices.
+
+        Returns
+        -------
+        prepared: PreparedPolygon
+        """
+        if self._prepared is None:
+            self._prepared = PreparedPolygon(np.array([(point.xd, point.yd) for point in self.points], dtype=float))
+        return self._prepared
+
+    def _is_large(self):
+        return len(self.points) >= self.prepare_threshold
+
+    def _inside_all(self, coordinates):
+        """
+        Test for many points at once whether they are inside the polygon, with the same outcome as :func:`inside`.
+
+        Parameters
+        ----------
+        coordinates: list(Coordinate)
+            The points to test
+
+        Returns
+        -------
+        inside: numpy.ndarray
+            A boolean for every point
+        """
+        values = [value for coordinate in coordinates for value in (coordinate.xd, coordinate.yd)]
+        points = np.fromiter(map(float, values), dtype=float, count=len(values)).reshape(-1, 2)
+
+        if self._is_large():
+            prepared = self.prepare()
+            inside, ambiguous = prepared.inside(points), prepared.ambiguous
+        else:
+            polygon = np.array([(point.xd, point.yd) for point in self.points], dtype=float)
+            inside, ambiguous = Clipping.inside(points, polygon), lambda p: Clipping.ambiguous(p, polygon)
+
+        # The float test is exact for floats, but coordinates in other backends are rounded to floats first
+        if not all(type(value) is float for value in values):
+            for position in np.flatnonzero(ambiguous(points)):
+                inside[position] = self._crossing_inside(coordinates[position])
+
+        return inside
+
     def inside(self, point):
         """Tests whether a point is inside a polygon.
         Based on the Javascript implementation from https://github.com/substack/point-in-polygon
 
+        Large polygons use the spatial index of :func:`prepare`, so that the test does not have to visit every side.
+
         Parameters
         ----------
         point: Point
@@ -196,7 +491,12 @@ class Polygon(Subject):
         inside: bool
             Whether the point is inside or not
         """
+        if self._is_large():
+            return bool(self._inside_all([point])[0])
 
+        return self._crossing_inside(point)
+
+    def _crossing_inside(self, point):
         vertices = self.points + self.points[0:1]
 
         x = point.xd
@@ -215,28 +515,3 @@ class Polygon(Subject):
                 inside = not inside
 
         return inside
-
-    def _get_intersection_point(self, orig, end):
-        p = self.points + [self.points[0]]
-        points = []
-
-        point = None
-
-        for i in range(0, len(p) - 1):
-            intersection_point = Algebra.get_intersection(orig, end, p[i], p[i + 1])
-            if intersection_point:
-                points.append(intersection_point)
-
-        if not points:
-            return None
-
-        max_distance = Algebra.distance(orig, end)
-
-        # Find the intersection point that is furthest away from the start
-        if points:
-            distances = [Algebra.distance(orig, p) for p in points]
-            distances = [i for i in distances if i <= max_distance]
-            if distances:
-                point = points[np.argmax(distances)]
-
-        return point
@@ -0,0 +1,150 @@
+import sys
+from fractions import Fraction
+
+# Shewchuk's machine epsilon: half the distance between 1.0 and the next float
+_EPSILON = sys.float_info.epsilon / 2
+
+# Error bounds for the float filters (Shewchuk, "Adaptive Precision Floating-Point Arithmetic and Fast Robust
+# Geometric Predicates", 1997)
+_CCW_ERROR_BOUND = (3 + 16 * _EPSILON) * _EPSILON
+_INCIRCLE_ERROR_BOUND = (10 + 96 * _EPSILON) * _EPSILON
+
+# Error bounds used when the inputs are not floats (i.e. Decimals), and are rounded when converted to floats
+_CCW_ROUNDED_ERROR_BOUND = 16 * _EPSILON
+_INCIRCLE_ROUNDED_ERROR_BOUND = 64 * _EPSILON
+
+
+class Predicates:
+    """
+    Robust geometric predicates.
+
+    Each predicate first evaluates its determinant in floating point and compares the result with an error bound.
+    Only when the sign of the determinant can not be trusted, the determinant is evaluated again in exact rational
+    arithmetic. This makes the predicates both fast and correct on (nearly) degenerate input.
+
+    Examples
+    --------
+    >>> Predicates.orientation(Coordinate(0, 0), Coordinate(1, 0), Coordinate(0, 1))
+    1
+    >>> Predicates.incircle(Coordinate(0, 0), Coordinate(1, 0), Coordinate(0, 1), Coordinate(1, 1))
+    0
+    """
+
+    @staticmethod
+    def orientation(a, b, c):
+        """
+        Determine the orientation of the triple (`a`, `b`, `c`).
+
+        Parameters
+        ----------
+        a: Coordinate
+        b: Coordinate
+        c: Coordinate
+
+        Returns
+        -------
+        sign: int
+            1 if the points are in counterclockwise order, -1 if they are in clockwise order and 0 if they are
+            collinear.
+        """
+        ax, ay, bx, by, cx, cy = a.xd, a.yd, b.xd, b.yd, c.xd, c.yd
+
+        if type(ax) is float and type(ay) is float and type(bx) is float and type(by) is float \
+                and type(cx) is float and type(cy) is float:
+            detleft = (ax - cx) * (by - cy)
+            detright = (ay - cy) * (bx - cx)
+            error_bound = _CCW_ERROR_BOUND * (abs(detleft) + abs(detright))
+        else:
+            ax, ay, bx, by, cx, cy = float(ax), float(ay), float(bx), float(by), float(cx), float(cy)
+            detleft = (ax - cx) * (by - cy)
+            detright = (ay - cy) * (bx - cx)
+            permanent = (abs(ax) + abs(cx)) * (abs(by) + abs(cy)) + (abs(ay) + abs(cy)) * (abs(bx) + abs(cx))
+            error_bound = _CCW_ROUNDED_ERROR_BOUND * permanent
+
+        det = detleft - detright
+        if det > error_bound:
+            return 1
+        if -det > error_bound:
+            return -1
+
+        return Predicates._sign(Predicates._exact_orientation(a, b, c))
+
+    @staticmethod
+    def incircle(a, b, c, d):
+        """
+        Determine whether `d` lies inside the circle through `a`, `b` and `c`.
+
+        Parameters
+        ----------
+        a: Coordinate
+        b: Coordinate
+        c: Coordinate
+        d: Coordinate
+
+        Returns
+        -------
+        sign: int
+            If `a`, `b` and `c` are in counterclockwise order, 1 if `d` lies inside the circle, -1 if it lies outside
+            and 0 if the four points are cocircular. The sign is reversed if `a`, `b` and `c` are in clockwise order.
+        """
+        coordinates = (a.xd, a.yd, b.xd, b.yd, c.xd, c.yd, d.xd, d.yd)
+        rounded = not all(type(value) is float for value in coordinates)
+        ax, ay, bx, by, cx, cy, dx, dy = (float(value) for value in coordinates) if rounded else coordinates
+
+        adx, ady = ax - dx, ay - dy
+        bdx, bdy = bx - dx, by - dy
+        cdx, cdy = cx - dx, cy - dy
+
+        bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+        cdxady, adxcdy = cdx * ady, adx * cdy
+        adxbdy, bdxady = adx * bdy, bdx * ady
+
+        alift = adx * adx + ady * ady
+        blift = bdx * bdx + bdy * bdy
+        clift = cdx * cdx + cdy * cdy
+
+        det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+
+        if rounded:
+            # Bound the error using absolute coordinates, since the differences themselves carry rounding errors
+            sax, say = abs(ax) + abs(dx), abs(ay) + abs(dy)
+            sbx, sby = abs(bx) + abs(dx), abs(by) + abs(dy)
+            scx, scy = abs(cx) + abs(dx), abs(cy) + abs(dy)
+            permanent = (sax * sax + say * say) * (sbx * scy + scx * sby) \
+                + (sbx * sbx + sby * sby) * (scx * say + sax * scy) \
+                + (scx * scx + scy * scy) * (sax * sby + sbx * say)
+            error_bound = _INCIRCLE_ROUNDED_ERROR_BOUND * permanent
+        else:
+            permanent = (abs(bdxcdy) + abs(cdxbdy)) * alift \
+                + (abs(cdxady) + abs(adxcdy)) * blift \
+                + (abs(adxbdy) + abs(bdxady)) * clift
+            error_bound = _INCIRCLE_ERROR_BOUND * permanent
+
+        if det > error_bound:
+            return 1
+        if -det > error_bound:
+            return -1
+
+        return Predicates._sign(Predicates._exact_incircle(a, b, c, d))
+
+    @staticmethod
+    def _exact_orientation(a, b, c):
+        ax, ay, bx, by, cx, cy = (Fraction(value) for value in (a.xd, a.yd, b.xd, b.yd, c.xd, c.yd))
+        return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+    @staticmethod
+    def _exact_incircle(a, b, c, d):
+        ax, ay, bx, by, cx, cy, dx, dy = (
+            Fraction(value) for value in (a.xd, a.yd, b.xd, b.yd, c.xd, c.yd, d.xd, d.yd)
+        )
+        adx, ady = ax - dx, ay - dy
+        bdx, bdy = bx - dx, by - dy
+        cdx, cdy = cx - dx, cy - dy
+        alift = adx * adx + ady * ady
+        blift = bdx * bdx + bdy * bdy
+        clift = cdx * cdx + cdy * cdy
+        return alift * (bdx * cdy - cdx * bdy) + blift * (cdx * ady - adx * cdy) + clift * (adx * bdy - bdx * ady)
+
+    @staticmethod
+    def _sign(value):
+        return (value > 0) - (value < 0)
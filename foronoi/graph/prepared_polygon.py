@@ -0,0 +1,261 @@
+import numpy as np
+
+from foronoi.graph.clipping import Clipping, _INSIDE_TOLERANCE
+
+
+def _expand(lower, upper):
+    """
+    Expand the inclusive integer ranges [lower, upper] into (owner, value) pairs.
+    """
+    counts = np.maximum(upper - lower + 1, 0)
+    owners = np.repeat(np.arange(len(lower)), counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, lower[owners] + np.arange(len(owners)) - offsets
+
+
+class PreparedPolygon:
+    def __init__(self, polygon, resolution=None):
+        """
+        A polygon with a uniform grid over its sides, for polygons with many vertices.
+
+        Every side is registered in the grid cells and rows that its bounding box overlaps. A point in a cell that is
+        far away from all sides takes over the precomputed location of the cell's center, so that most points are
+        located in constant time. The other points are tested against only the sides that overlap their row, and a
+        ray is only intersected with the sides in the cells along its path.
+
+        The results are identical to :func:`Clipping.inside` and :func:`Clipping.clip` on the full polygon.
+
+        Parameters
+        ----------
+        polygon: numpy.ndarray
+            The (K, 2) array of polygon vertices
+        resolution: int
+            The number of grid cells along each axis, by default the square root of the number of sides
+        """
+        polygon = np.asarray(polygon, dtype=float)
+        self.polygon = polygon
+        self.starts = polygon
+        self.ends = np.roll(polygon, -1, axis=0)
+        self.resolution = resolution or max(1, int(np.ceil(np.sqrt(len(polygon)))))
+        self.min = polygon.min(axis=0)
+        self.max = polygon.max(axis=0)
+        self.size = np.where(self.max > self.min, (self.max - self.min) / self.resolution, 1.0)
+
+        lower = np.minimum(self.starts, self.ends)
+        upper = np.maximum(self.starts, self.ends)
+        lower_cells, upper_cells = self._cells(lower), self._cells(upper)
+        cell_count = self.resolution * self.resolution
+
+        # Rows (CSR): the sides that overlap each row, sorted by their largest x-coordinate
+        sides, rows = _expand(lower_cells[:, 1], upper_cells[:, 1])
+        order = np.lexsort((upper[sides, 0], rows))
+        self._row_sides = sides[order]
+        self._row_max_x = upper[self._row_sides, 0]
+        self._row_offsets = np.searchsorted(rows[order], np.arange(self.resolution + 1))
+
+        # Cells (CSR): the sides that overlap each cell
+        pairs, columns = _expand(lower_cells[sides, 0], upper_cells[sides, 0])
+        cells = rows[pairs] * self.resolution + columns
+        order = np.argsort(cells, kind="stable")
+        self._cell_sides = sides[pairs][order]
+        self._cell_offsets = np.searchsorted(cells[order], np.arange(cell_count + 1))
+
+        # Cells that are at least one cell away from every side have the same location as their center
+        occupied = (np.diff(self._cell_offsets) > 0).reshape(self.resolution, self.resolution)
+        padded = np.pad(occupied, 1)
+        self._near = np.zeros_like(occupied)
+        for dy in range(3):
+            for dx in range(3):
+                self._near |= padded[dy:dy + self.resolution, dx:dx + self.resolution]
+        self._near = self._near.ravel()
+
+        indices = np.arange(cell_count)
+        centers = self.min + (np.stack((indices % self.resolution, indices // self.resolution), axis=1) + 0.5) * \
+            self.size
+        self._center_inside = self._row_inside(centers, indices // self.resolution)
+
+    def _cells(self, points):
+        cells = np.floor((points - self.min) / self.size).astype(np.intp)
+        return np.clip(cells, 0, self.resolution - 1)
+
+    def _row_pairs(self, points, rows):
+        # The sides that can be crossed by a ray to the right: the sides in the row that do not end left of the point
+        starts = self._row_offsets[rows].copy()
+        stops = self._row_offsets[rows + 1]
+        for row in np.unique(rows):
+            selected = rows == row
+            start, stop = self._row_offsets[row], self._row_offsets[row + 1]
+            starts[selected] = start + np.searchsorted(self._row_max_x[start:stop], points[selected, 0])
+
+        owners, positions = _expand(starts, stops - 1)
+        return owners, self._row_sides[positions]
+
+    def _row_inside(self, points, rows):
+        owners, sides = self._row_pairs(points, rows)
+        x, y = points[owners, 0], points[owners, 1]
+        xi, yi = self.starts[sides, 0], self.starts[sides, 1]
+        xj, yj = self.ends[sides, 0], self.ends[sides, 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intersect = ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+
+        return np.bincount(owners[intersect], minlength=len(points)) % 2 == 1
+
+    def _locate(self, points):
+        in_box = np.flatnonzero(np.all((points >= self.min) & (points <= self.max), axis=1))
+        cells = self._cells(points[in_box])
+        indices = cells[:, 1] * self.resolution + cells[:, 0]
+        near = self._near[indices]
+        return in_box, cells, indices, near
+
+    def inside(self, points):
+        """
+        Test for every point whether it lies inside the polygon.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            The (M, 2) array of points
+
+        Returns
+        -------
+        inside: numpy.ndarray
+            The (M,) boolean array
+        """
+        inside = np.zeros(len(points), dtype=bool)
+        in_box, cells, indices, near = self._locate(points)
+        inside[in_box[~near]] = self._center_inside[indices[~near]]
+        inside[in_box[near]] = self._row_inside(points[in_box[near]], cells[near, 1])
+        return inside
+
+    def ambiguous(self, points):
+        """
+        Find the points for which the float test of :func:`inside` could differ from an exact test (see
+        :func:`Clipping.ambiguous`). Only the sides that overlap the row of a point are taken into account.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            The (M, 2) array of points
+
+        Returns
+        -------
+        ambiguous: numpy.ndarray
+            The (M,) boolean array
+        """
+        ambiguous = np.zeros(len(points), dtype=bool)
+        in_box, cells, _, near = self._locate(points)
+        selected = in_box[near]
+
+        # All sides in the row and its neighboring rows are relevant, including the ones that end left of the point
+        rows = cells[near, 1]
+        lower = self._row_offsets[np.maximum(rows - 1, 0)]
+        upper = self._row_offsets[np.minimum(rows + 2, self.resolution)]
+        owners, positions = _expand(lower, upper - 1)
+        sides = self._row_sides[positions]
+
+        x, y = points[selected[owners], 0], points[selected[owners], 1]
+        xi, yi = self.starts[sides, 0], self.starts[sides, 1]
+        xj, yj = self.ends[sides, 0], self.ends[sides, 1]
+        tolerance = _INSIDE_TOLERANCE * (np.maximum(np.abs(x), np.abs(y)) + np.abs(self.polygon).max())
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = (xj - xi) * (y - yi) / (yj - yi) + xi
+
+        near_vertex = (np.abs(y - yi) <= tolerance) | (np.abs(y - yj) <= tolerance)
+        near_side = ((yi > y) != (yj > y)) & (np.abs(x - crossing) <= tolerance)
+        ambiguous[selected] = np.bincount(owners[near_vertex | near_side], minlength=len(selected)) > 0
+        return ambiguous
+
+    def _segment_sides(self, origins, ends):
+        """
+        Find the sides in the grid cells along every segment, as (segment, side) pairs without duplicates.
+        """
+        # Segments to infinity never intersect (see Clipping.clip)
+        selected = np.all(np.isfinite(origins) & np.isfinite(ends), axis=1)
+        delta = np.where(selected[:, None], ends - origins, 0.0)
+        origins = np.where(selected[:, None], origins, 0.0)
+
+        # Restrict the segments to the bounding box of the polygon (Liang-Barsky)
+        low, high = np.zeros(len(origins)), np.ones(len(origins))
+        for axis in range(2):
+            flat = delta[:, axis] == 0
+            step = np.where(flat, 1.0, delta[:, axis])
+            t0 = (self.min[axis] - origins[:, axis]) / step
+            t1 = (self.max[axis] - origins[:, axis]) / step
+            low = np.where(flat, low, np.maximum(low, np.minimum(t0, t1)))
+            high = np.where(flat, high, np.minimum(high, np.maximum(t0, t1)))
+            selected &= ~flat | ((self.min[axis] <= origins[:, axis]) & (origins[:, axis] <= self.max[axis]))
+
+        segments = np.flatnonzero(selected & (low <= high))
+        delta, origins = delta[segments], origins[segments]
+        a = origins + low[segments, None] * delta
+        b = origins + high[segments, None] * delta
+        first, last = self._cells(np.minimum(a, b)), self._cells(np.maximum(a, b))
+
+        # The columns that every segment passes, and the range of rows it passes in each of them. The neighboring
+        # cells are included as well, so that rounding errors never skip a cell, for example when the segment passes
+        # exactly through a corner.
+        owners, columns = _expand(np.maximum(first[:, 0] - 1, 0), np.minimum(last[:, 0] + 1, self.resolution - 1))
+        slope = np.divide(delta[owners, 1], delta[owners, 0], out=np.zeros(len(owners)), where=delta[owners, 0] != 0)
+        x = np.clip(self.min[0] + np.stack((columns, columns + 1), axis=1) * self.size[0],
+                    np.minimum(a[owners, 0], b[owners, 0])[:, None], np.maximum(a[owners, 0], b[owners, 0])[:, None])
+        y = a[owners, 1, None] + (x - a[owners, 0, None]) * slope[:, None]
+        row_range = self._cells(np.stack((np.zeros(y.size), y.ravel()), axis=1))[:, 1].reshape(-1, 2)
+        vertical = delta[owners, 0] == 0
+        lower = np.where(vertical, first[owners, 1], row_range.min(axis=1)) - 1
+        upper = np.where(vertical, last[owners, 1], row_range.max(axis=1)) + 1
+
+        # Every cell of a segment once, since the ranges of neighboring columns overlap
+        pairs, rows = _expand(np.maximum(lower, 0), np.minimum(upper, self.resolution - 1))
+        cell_count = self.resolution * self.resolution
+        keys = np.unique(owners[pairs] * cell_count + rows * self.resolution + columns[pairs])
+        owners, cells = keys // cell_count, keys % cell_count
+
+        cell_pairs, positions = _expand(self._cell_offsets[cells], self._cell_offsets[cells + 1] - 1)
+        keys = np.unique(segments[owners[cell_pairs]] * len(self.starts) + self._cell_sides[positions])
+        return keys // len(self.starts), keys % len(self.starts)
+
+    def near_sides(self, point):
+        """
+        Get the sides that overlap the grid cell of a point, or one of the cells around it.
+
+        Parameters
+        ----------
+        point: numpy.ndarray
+            The (2,) array of the point
+
+        Returns
+        -------
+        sides: numpy.ndarray
+            The indices of the sides, where side `i` runs from vertex `i` to the next vertex
+        """
+        column, row = self._cells(point[None, :])[0]
+        columns = np.arange(max(column - 1, 0), min(column + 2, self.resolution))
+        rows = np.arange(max(row - 1, 0), min(row + 2, self.resolution))
+        cells = (rows[:, None] * self.resolution + columns[None, :]).ravel()
+        _, positions = _expand(self._cell_offsets[cells], self._cell_offsets[cells + 1] - 1)
+        return np.unique(self._cell_sides[positions])
+
+    def clip(self, origins, ends):
+        """
+        For every segment from `origins` to `ends`, find the intersection with the boundary of the polygon that lies
+        furthest from the origin, without passing the end (see :func:`Clipping.clip`). All segments are intersected
+        at once with the sides in the grid cells along them.
+
+        Parameters
+        ----------
+        origins: numpy.ndarray
+            The (M, 2) array of segment origins, which lie inside the polygon
+        ends: numpy.ndarray
+            The (M, 2) array of segment ends, which lie outside the polygon
+
+        Returns
+        -------
+        points: numpy.ndarray
+            The (M, 2) array of clipped ends
+        found: numpy.ndarray
+            The (M,) boolean array that tells if an intersection was found
+        """
+        owners, sides = self._segment_sides(origins, ends)
+        return Clipping.clip_pairs(origins, ends, owners, self.starts[sides], self.ends[sides])
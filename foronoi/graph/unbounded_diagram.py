@@ -0,0 +1,149 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from foronoi.graph.vertex import Vertex
+
+
+class UnboundedDiagram(NamedTuple):
+    """
+    The raw result of the sweep, before it is clipped against any bounding polygon. The finite edges run between two
+    vertices, and the half-infinite edges are rays that start at a vertex and run off to infinity.
+
+    Examples
+    --------
+    Get the rays of the diagram
+
+    >>> v = Voronoi()
+    >>> v.create_diagram(points)
+    >>> diagram = v.get_unbounded()
+    >>> for origin, direction in zip(diagram.ray_origins, diagram.ray_directions):
+    ...     print(origin, direction)
+
+    Attributes
+    ----------
+    vertices: numpy.ndarray
+        The (V, 2) array of vertex coordinates
+    edges: numpy.ndarray
+        The (E, 2) array of vertex indices of the start and end of each finite edge
+    edge_sites: numpy.ndarray
+        The (E, 2) array of indices of the sites to the left and to the right of each finite edge, looking from its
+        start to its end
+    ray_origins: numpy.ndarray
+        The (R, 2) array of the coordinates where each ray starts
+    ray_directions: numpy.ndarray
+        The (R, 2) array of unit vectors in the direction of each ray
+    ray_vertices: numpy.ndarray
+        The (R,) array of the vertex index at the origin of each ray. An edge without any vertex (which separates two
+        sites that have no other neighbors on that side) is a full line, which is split into two rays starting at
+        the midpoint between its sites, with vertex index -1.
+    ray_sites: numpy.ndarray
+        The (R, 2) array of indices of the sites to the left and to the right of each ray, looking in its direction
+    hull: numpy.ndarray
+        The (N,) boolean array that tells for every site whether its cell is unbounded, i.e. whether it lies on the
+        convex hull of the sites
+    """
+
+    vertices: np.ndarray
+    edges: np.ndarray
+    edge_sites: np.ndarray
+    ray_origins: np.ndarray
+    ray_directions: np.ndarray
+    ray_vertices: np.ndarray
+    ray_sites: np.ndarray
+    hull: np.ndarray
+
+    @staticmethod
+    def ray_direction(breakpoint):
+        """
+        The direction in which a breakpoint moves when the sweep line goes down to infinity. The breakpoint runs along
+        the bisector of its two sites, with the left site of the breakpoint on its right.
+
+        Parameters
+        ----------
+        breakpoint: Breakpoint
+
+        Returns
+        -------
+        direction: (float, float)
+            A unit vector
+        """
+        i, j = breakpoint.breakpoint
+        dx, dy = float(j.yd - i.yd), float(i.xd - j.xd)
+        length = np.hypot(dx, dy)
+        return dx / length, dy / length
+
+    @classmethod
+    def from_edges(cls, sites, edges):
+        """
+        Collect the arrays from the half edges of a swept diagram.
+
+        Parameters
+        ----------
+        sites: list(Point)
+            The sites, in the order of the input points
+        edges: list(HalfEdge)
+            One half edge of every edge
+
+        Returns
+        -------
+        diagram: UnboundedDiagram
+        """
+        site_indices = {site: index for index, site in enumerate(sites)}
+        vertex_indices = {}
+
+        def vertex_index(vertex):
+            return vertex_indices.setdefault(vertex, len(vertex_indices))
+
+        def site_pair(edge):
+            # The site of a half edge lies to its right
+            return site_indices.get(edge.twin.incident_point, -1), site_indices.get(edge.incident_point, -1)
+
+        finite, finite_sites = [], []
+        ray_origins, ray_directions, ray_vertices, ray_sites = [], [], [], []
+
+        for edge in edges:
+            starts_at_vertex, ends_at_vertex = isinstance(edge.origin, Vertex), isinstance(edge.twin.origin, Vertex)
+
+            if starts_at_vertex and ends_at_vertex:
+                finite.append((vertex_index(edge.origin), vertex_index(edge.twin.origin)))
+                finite_sites.append(site_pair(edge))
+                continue
+
+            # Rays run from the vertex towards the breakpoint, or from the midpoint of the sites for full lines
+            if not starts_at_vertex and not ends_at_vertex:
+                i, j = edge.incident_point, edge.twin.incident_point
+                middle = (float(i.xd + j.xd) / 2, float(i.yd + j.yd) / 2)
+                half_edges = ((edge, middle, -1), (edge.twin, middle, -1))
+            elif starts_at_vertex:
+                half_edges = ((edge, None, vertex_index(edge.origin)),)
+            else:
+                half_edges = ((edge.twin, None, vertex_index(edge.twin.origin)),)
+
+            for half_edge, origin, index in half_edges:
+                if origin is None:
+                    origin = (float(half_edge.origin.xd), float(half_edge.origin.yd))
+                ray_origins.append(origin)
+                ray_directions.append(cls.ray_direction(half_edge.twin.origin))
+                ray_vertices.append(index)
+                ray_sites.append(site_pair(half_edge))
+
+        vertices = np.array([(float(vertex.xd), float(vertex.yd)) for vertex in vertex_indices], dtype=float)
+        ray_sites = np.array(ray_sites, dtype=np.intp).reshape(-1, 2)
+
+        # Sites on the hull have an unbounded cell, and so does a single site
+        hull = np.zeros(len(sites), dtype=bool)
+        hull[ray_sites[ray_sites >= 0]] = True
+        if len(sites) == 1:
+            hull[:] = True
+
+        return cls(
+            vertices=vertices.reshape(-1, 2),
+            edges=np.array(finite, dtype=np.intp).reshape(-1, 2),
+            edge_sites=np.array(finite_sites, dtype=np.intp).reshape(-1, 2),
+            ray_origins=np.array(ray_origins, dtype=float).reshape(-1, 2),
+            ray_directions=np.array(ray_directions, dtype=float).reshape(-1, 2),
+            ray_vertices=np.array(ray_vertices, dtype=np.intp),
+            ray_sites=ray_sites,
+            hull=hull,
+        )
@@ -2,6 +2,8 @@ from foronoi.graph.coordinate import Coordinate
 
 
 class Vertex(Coordinate):
+    __slots__ = ("connected_edges",)
+
     def __init__(self, x, y, connected_edges=None):
         """
         A vertex is a fixed cross point between borders. Extends the :class:`Coordinate` class.
@@ -0,0 +1,168 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from foronoi.graph.dcel import DCEL
+
+
+class CellMetrics(NamedTuple):
+    """
+    Geometric properties of all cells of a diagram, in the order of the input points.
+
+    Attributes
+    ----------
+    area: numpy.ndarray
+        The (N,) array of cell areas
+    centroid: numpy.ndarray
+        The (N, 2) array of cell centroids, NaN for cells without area
+    perimeter: numpy.ndarray
+        The (N,) array of cell perimeters
+    bounding_box: numpy.ndarray
+        The (N, 4) array of (min x, min y, max x, max y) per cell, NaN for cells without vertices
+    """
+
+    area: np.ndarray
+    centroid: np.ndarray
+    perimeter: np.ndarray
+    bounding_box: np.ndarray
+
+
+class VoronoiArrays(NamedTuple):
+    """
+    A columnar view of a finished Voronoi diagram, for pipelines that work with NumPy arrays instead of the
+    doubly connected edge list.
+
+    Examples
+    --------
+    Get the polygon of the cell that belongs to the third input point
+
+    >>> arrays = v.get_arrays()
+    >>> start, stop = arrays.cell_offsets[2], arrays.cell_offsets[3]
+    >>> polygon = arrays.vertices[arrays.cell_vertices[start:stop]]
+
+    Attributes
+    ----------
+    vertices: numpy.ndarray
+        The (V, 2) array of vertex coordinates
+    edges: numpy.ndarray
+        The (E, 2) array of vertex indices of the start and end of each edge
+    edge_sites: numpy.ndarray
+        The (E, 2) array of indices of the sites to the left and to the right of each edge, looking from its start to
+        its end. The index is -1 at the side of the bounding polygon.
+    cell_offsets: numpy.ndarray
+        The (N + 1,) array of offsets into `cell_vertices`. The vertices of the cell of site `i` are
+        `cell_vertices[cell_offsets[i]:cell_offsets[i + 1]]`, in clockwise order.
+    cell_vertices: numpy.ndarray
+        The vertex indices of all cells, concatenated in the order of the input points
+    """
+
+    vertices: np.ndarray
+    edges: np.ndarray
+    edge_sites: np.ndarray
+    cell_offsets: np.ndarray
+    cell_vertices: np.ndarray
+
+    @classmethod
+    def from_sites(cls, sites):
+        """
+        Collect the arrays from the borders of the sites of a finished diagram.
+
+        Parameters
+        ----------
+        sites: list(Point)
+            The sites, in the order of the input points
+
+        Returns
+        -------
+        arrays: VoronoiArrays
+        """
+        return cls.from_dcel(DCEL.from_sites(sites))
+
+    @classmethod
+    def from_dcel(cls, dcel):
+        """
+        Derive the arrays from an array-backed doubly connected edge list.
+
+        Parameters
+        ----------
+        dcel: DCEL
+
+        Returns
+        -------
+        arrays: VoronoiArrays
+        """
+        cell_offsets, cell_edges = dcel.cells()
+
+        # Half edges that do not start at a vertex (i.e. during construction) are left out of the cells
+        cell_origins = dcel.origin[cell_edges]
+        keep = cell_origins >= 0
+        cells = np.repeat(np.arange(len(cell_offsets) - 1), np.diff(cell_offsets))
+        cell_offsets = np.concatenate(([0], np.cumsum(np.bincount(cells[keep], minlength=len(cell_offsets) - 1))))
+        cell_vertices = cell_origins[keep].astype(np.intp)
+
+        # Every edge is added once: by its half edge on a cell border, or by the first of the two if both are
+        edges = cell_edges[keep]
+        twin = dcel.twin[edges]
+        position = np.full(len(dcel), -1, dtype=np.intp)
+        position[edges] = np.arange(len(edges))
+        twin_position = position[np.maximum(twin, 0)]
+        duplicate = (twin >= 0) & (twin_position >= 0) & (twin_position < np.arange(len(edges)))
+
+        target = dcel.target()[edges]
+        valid = ~duplicate & (target >= 0)
+        edges, twin, target = edges[valid], twin[valid], target[valid]
+
+        # The borders run clockwise, so the site of a half edge lies to its right
+        left = np.where(twin >= 0, dcel.site[np.maximum(twin, 0)], -1)
+
+        return cls(
+            vertices=dcel.vertices,
+            edges=np.stack((dcel.origin[edges], target), axis=1).astype(np.intp).reshape(-1, 2),
+            edge_sites=np.stack((left, dcel.site[edges]), axis=1).astype(np.intp).reshape(-1, 2),
+            cell_offsets=cell_offsets.astype(np.intp),
+            cell_vertices=cell_vertices,
+        )
+
+    def cell_metrics(self) -> CellMetrics:
+        """
+        Calculate the area, centroid, perimeter and bounding box of all cells at once. All cells are flattened into
+        one ring array, so that every metric takes a constant number of vectorized operations.
+
+        Returns
+        -------
+        metrics: CellMetrics
+        """
+        count = len(self.cell_offsets) - 1
+        sizes = np.diff(self.cell_offsets)
+        cells = np.repeat(np.arange(count), sizes)
+
+        # The next vertex of every vertex in its ring, where the last vertex wraps around to the first
+        following = np.arange(1, len(self.cell_vertices) + 1)
+        following[self.cell_offsets[1:][sizes > 0] - 1] = self.cell_offsets[:-1][sizes > 0]
+
+        x, y = self.vertices[self.cell_vertices].T
+        next_x, next_y = x[following], y[following]
+
+        # Shoelace formula
+        cross = x * next_y - next_x * y
+        signed_area = 0.5 * np.bincount(cells, weights=cross, minlength=count)
+        area = np.abs(signed_area)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centroid = np.stack((
+                np.bincount(cells, weights=(x + next_x) * cross, minlength=count),
+                np.bincount(cells, weights=(y + next_y) * cross, minlength=count),
+            ), axis=1) / (6 * signed_area[:, None])
+        centroid[area == 0] = np.nan
+
+        perimeter = np.bincount(cells, weights=np.hypot(next_x - x, next_y - y), minlength=count)
+
+        bounding_box = np.full((count, 4), np.nan)
+        starts = self.cell_offsets[:-1][sizes > 0]
+        if len(starts):
+            bounding_box[sizes > 0] = np.stack((
+                np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts),
+                np.maximum.reduceat(x, starts), np.maximum.reduceat(y, starts),
+            ), axis=1)
+
+        return CellMetrics(area=area, centroid=centroid, perimeter=perimeter, bounding_box=bounding_box)
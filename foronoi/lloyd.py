@@ -0,0 +1,131 @@
+import copy
+from typing import NamedTuple
+
+import numpy as np
+
+from foronoi.algorithm import Algorithm
+from foronoi.graph.numeric import Numeric
+from foronoi.graph.diagram_editor import DiagramEditor
+
+
+class LloydResult(NamedTuple):
+    """
+    The outcome of :func:`Lloyd.relax`.
+
+    Attributes
+    ----------
+    points: numpy.ndarray
+        The (N, 2) array of the relaxed sites, in the order of the input points
+    centroids: numpy.ndarray
+        The (N, 2) array of the centroids of the cells of the relaxed sites
+    diagram: Algorithm
+        The finished diagram of the relaxed sites
+    iterations: int
+        The number of times that the sites were moved to the centroids of their cells
+    shift: float
+        The largest distance between a relaxed site and the centroid of its cell
+    converged: bool
+        Whether the shift dropped to the tolerance within the iterations
+    """
+
+    points: np.ndarray
+    centroids: np.ndarray
+    diagram: Algorithm
+    iterations: int
+    shift: float
+    converged: bool
+
+
+class Lloyd:
+    # The diagram is built again instead of repaired when more than this part of the sites would change
+    rebuild_fraction = 0.1
+
+    def __init__(self, polygon, numeric=Numeric.FLOAT64):
+        """
+        Lloyd's algorithm, which moves every site to the centroid of its cell until the sites stop moving, which
+        leaves a centroidal Voronoi diagram.
+
+        The diagram is not built again in every iteration, but moved along with the sites (see
+        :func:`foronoi.graph.DiagramEditor.move_sites`), so that only the cells of which the structure changes are
+        repaired. The first iterations, which move the sites so far that most cells change, build the diagram again
+        instead. The centroids of all cells are calculated at once, from the edges of the diagram.
+
+        Examples
+        --------
+        >>> lloyd = Lloyd(BoundingBox(0, 10, 0, 10))
+        >>> result = lloyd.relax(points, iterations=100, tol=1e-6)
+        >>> result.points, result.converged
+
+        Parameters
+        ----------
+        polygon: Polygon
+            The straight bounding polygon. Every diagram that is built gets a copy of it.
+        numeric: str
+            The numeric backend of the diagrams, "float64" (the default) or "decimal"
+
+        Attributes
+        ----------
+        diagram: Algorithm
+            The diagram of the last relaxation. The next relaxation of as many sites starts from it.
+        """
+        if not polygon.points:
+            raise ValueError("Lloyd's algorithm needs a straight bounding polygon.")
+
+        self.polygon = copy.deepcopy(polygon)
+        self.numeric = numeric
+        self.diagram = None
+        self._editor = None
+
+    def relax(self, points, iterations=100, tol=1e-6) -> LloydResult:
+        """
+        Move the sites to the centroids of their cells, until no site moves further than the tolerance, or until the
+        number of iterations is reached.
+
+        Parameters
+        ----------
+        points: numpy.ndarray
+            The (N, 2) array of the sites to start from
+        iterations: int
+            The largest number of times to move the sites
+        tol: float
+            The distance between every site and the centroid of its cell below which the sites have converged
+
+        Returns
+        -------
+        result: LloydResult
+        """
+        points = np.array(points, dtype=float)
+        self._move(points)
+
+        iteration = 0
+        while True:
+            centroids = self._editor.cell_metrics().centroid
+
+            # A cell without area keeps its site
+            centroids = np.where(np.isnan(centroids), points, centroids)
+            shift = float(np.linalg.norm(centroids - points, axis=1).max(initial=0))
+            if shift <= tol or iteration == iterations:
+                break
+
+            points = centroids
+            self._move(points)
+            iteration += 1
+
+        return LloydResult(points=points, centroids=centroids, diagram=self.diagram, iterations=iteration, shift=shift,
+                           converged=shift <= tol)
+
+    def _move(self, points):
+        """
+        Move the sites of the diagram to the given points, or build a new diagram when there is none yet or when
+        too many edges would flip. The flips are estimated from the current structure of the diagram (see
+        :func:`foronoi.graph.KineticTopology.update`).
+        """
+        if self.diagram is not None and len(self.diagram.sites) == len(points):
+            _, flipped = self._editor._get_topology().update(points)
+            if len(flipped) <= self.rebuild_fraction * len(points):
+                self._editor.move_sites(points)
+                return
+
+        self.diagram = Algorithm(copy.deepcopy(self.polygon), numeric=self.numeric)
+        self.diagram.create_diagram(points)
+        self._editor = DiagramEditor(self.diagram)
@@ -4,6 +4,8 @@ from foronoi.graph.coordinate import Coordinate
 
 
 class Arc:
+    __slots__ = ("origin", "circle_event")
+
     def __init__(self, origin: Coordinate, circle_event=None):
         """
         Each leaf of beach line, representing an arc `α`, stores one pointer to a node in the event queue, namely, the
@@ -1,7 +1,5 @@
-import math
-from decimal import Decimal
-
 from foronoi.graph.coordinate import Coordinate
+from foronoi.graph.numeric import Numeric
 
 
 class Breakpoint:
@@ -9,6 +7,8 @@ class Breakpoint:
     A breakpoint between two arcs.
     """
 
+    __slots__ = ("_breakpoint", "edge", "_key", "_key_sweep_line")
+
     def __init__(self, breakpoint: tuple, edge=None):
         """
         The breakpoint is stored by an ordered tuple of sites (:obj:`p_i`, :obj:`p_j`) where :obj:`p_i` defines the
@@ -23,16 +23,30 @@ class Breakpoint:
             A point where two arcs intersect, represented as a tuple of the two site points that the arcs refer to
         """
 
+        # The x-coordinate of the breakpoint, cached for the sweep line position it was calculated for
+        self._key = None
+        self._key_sweep_line = None
+
         # The tuple of the points whose arcs intersect
         self.breakpoint = breakpoint
 
         # The edge this breakpoint is tracing out
-        self._edge = None
         self.edge = edge
 
     def __repr__(self):
         return f"Breakpoint({self.breakpoint[0].name}, {self.breakpoint[1].name})"
 
+    @property
+    def breakpoint(self):
+        return self._breakpoint
+
+    @breakpoint.setter
+    def breakpoint(self, value):
+        # The cached key belongs to the old pair of sites
+        self._breakpoint = value
+        self._key = None
+        self._key_sweep_line = None
+
     def does_intersect(self):
         """
         A guard that handles the edge-case where two arcs were initialized at the same time due to their sites
@@ -48,6 +62,62 @@ class Breakpoint:
         i, j = self.breakpoint
         return not (i.yd == j.yd and j.xd < i.xd)
 
+    def get_intersection_x(self, l):
+        """
+        Calculate the x-coordinate of the intersection, without allocating a :class:`Coordinate`. The result is cached
+        until the sweep line moves or the breakpoint gets a new pair of sites, so that searching the status tree
+        evaluates every breakpoint at most once per event.
+
+        Parameters
+        ----------
+        l: float
+            The y-coordinate of the sweep line
+
+        Returns
+        --------
+        x: Decimal or float
+            The current x-coordinate of the breakpoint
+        """
+        if self._key is not None and self._key_sweep_line == l:
+            return self._key
+
+        # Get the points
+        i, j = self.breakpoint
+
+        # Handle the case where the two points have the same y-coordinate (breakpoint is in the middle)
+        if i.yd == j.yd:
+            x = (i.xd + j.xd) / 2
+
+        # Handle cases where one point's y-coordinate is the same as the sweep line
+        elif i.yd == l:
+            x = i.xd
+        elif j.yd == l:
+            x = j.xd
+        else:
+            # First we replace some stuff to make it easier
+            a = i.xd
+            b = i.yd
+            c = j.xd
+            d = j.yd
+            u = 2 * (b - l)
+            v = 2 * (d - l)
+
+            # We now need to solve for x
+            # 1/u * (x**2 - 2*a*x + a**2 + b**2 - l**2) = 1/v * (x**2 - 2*c*x + c**2 + d**2 - l**2)
+            # Then we let Wolfram alpha do the heavy work for us, and we put it here in the code :D
+            discriminant = v * (a ** 2 * u - 2 * a * c * u + b ** 2 * (u - v) + c ** 2 * u) + d ** 2 * u * (v - u) + \
+                l ** 2 * (u - v) ** 2
+
+            # Rounding errors (mostly in the float64 backend) can push the discriminant slightly below zero
+            if discriminant < 0:
+                discriminant = 0 * discriminant
+
+            x = -(Numeric.sqrt(discriminant) + a * v - c * u) / (u - v)
+
+        self._key = x
+        self._key_sweep_line = l
+        return x
+
     def get_intersection(self, l, max_y=None):
         """
         Calculate the coordinates of the intersection
@@ -71,40 +141,16 @@ class Breakpoint:
 
         # Initialize the resulting point
         result = Coordinate()
-        p: Coordinate = i
-
-        # First we replace some stuff to make it easier
-        a = i.xd
-        b = i.yd
-        c = j.xd
-        d = j.yd
-        u = 2 * (b - l)
-        v = 2 * (d - l)
+        result.xd = self.get_intersection_x(l)
 
         # Handle the case where the two points have the same y-coordinate (breakpoint is in the middle)
-        if i.yd == j.yd:
-            result.xd = (i.xd + j.xd) / 2
-
-            if j.xd < i.xd:
-                result.yd = max_y or float('inf')
-                return result
+        if i.yd == j.yd and j.xd < i.xd:
+            result.yd = max_y or float('inf')
+            return result
 
-        # Handle cases where one point's y-coordinate is the same as the sweep line
-        elif i.yd == l:
-            result.xd = i.xd
-            p = j
-        elif j.yd == l:
-            result.xd = j.xd
-        else:
-            # We now need to solve for x
-            # 1/u * (x**2 - 2*a*x + a**2 + b**2 - l**2) = 1/v * (x**2 - 2*c*x + c**2 + d**2 - l**2)
-            # Then we let Wolfram alpha do the heavy work for us, and we put it here in the code :D
-            x = -(Decimal.sqrt(
-                v * (a ** 2 * u - 2 * a * c * u + b ** 2 * (u - v) + c ** 2 * u) + d ** 2 * u * (v - u) + l ** 2 * (
-                    u - v) ** 2) + a * v - c * u) / (u - v)
-            result.xd = x
+        # The y-coordinate follows from the parabola of i, unless that parabola is degenerate
+        p: Coordinate = j if i.yd != j.yd and i.yd == l else i
 
-        # We have to re-evaluate this, since the point might have been changed
         a = p.xd
         b = p.yd
         x = result.xd
@@ -3,8 +3,24 @@ from foronoi.tree.node import Node
 
 
 class LeafNode(Node):
+    __slots__ = ("_predecessor", "_successor", "right_breakpoint")
+
     def __init__(self, data: "Arc"):
+        """
+        A leaf of the beach line, representing an arc. The leaves are threaded in a doubly linked list from left to
+        right, so that the neighboring arcs are available in constant time. Each link in the list also stores the
+        breakpoint between the two leaves, so that the breakpoints on both sides of an arc are available in constant
+        time as well.
+
+        Parameters
+        ----------
+        data: Arc
+            The arc that this leaf represents
+        """
         super().__init__(data)
+        self._predecessor = None
+        self._successor = None
+        self.right_breakpoint = None
 
     def __repr__(self):
         return f"Leaf({self.data}, left={self.left}, right={self.right})"
@@ -18,4 +34,85 @@ class LeafNode(Node):
     def get_label(self):
         return f"{self.data.origin.name}"
 
+    @property
+    def predecessor(self):
+        """
+        The leaf directly left of this leaf, or None if this is the leftmost leaf.
+        """
+        return self._predecessor
+
+    @property
+    def successor(self):
+        """
+        The leaf directly right of this leaf, or None if this is the rightmost leaf.
+        """
+        return self._successor
+
+    @property
+    def left_breakpoint(self):
+        """
+        The breakpoint between the predecessor and this leaf, or None if this is the leftmost leaf.
+        """
+        if self._predecessor is None:
+            return None
+        return self._predecessor.right_breakpoint
+
+    def link(self, successor, breakpoint=None):
+        """
+        Make `successor` the leaf directly right of this leaf.
+
+        :param successor: (LeafNode) The next leaf, or None
+        :param breakpoint: (Breakpoint) The breakpoint between this leaf and the next leaf, or None
+        """
+        self._successor = successor
+        self.right_breakpoint = breakpoint
+        if successor is not None:
+            successor._predecessor = self
+
+    def unlink(self, breakpoint=None):
+        """
+        Remove this leaf from the doubly linked list of leaves, by linking its predecessor and successor.
+
+        :param breakpoint: (Breakpoint) The breakpoint that will separate the predecessor and successor
+        """
+        if self._predecessor is not None:
+            self._predecessor.link(self._successor, breakpoint)
+        elif self._successor is not None:
+            self._successor._predecessor = None
+        self._predecessor = None
+        self._successor = None
+        self.right_breakpoint = None
+
+    def replace_leaf(self, replacement, root, update_heights=True):
+        """
+        Replace the leaf by a replacement tree, and thread the replacement's leaves in its place.
+
+        :param replacement: (Node) The root node of the replacement sub tree
+        :param root: (Node) The root of the tree
+        :param update_heights: (bool) Update the heights of the ancestors
+        :return: (Node) The root of the updated tree
+        """
+        predecessor, successor, right_breakpoint = self._predecessor, self._successor, self.right_breakpoint
+        self._predecessor = self._successor = self.right_breakpoint = None
+
+        if replacement is not None:
+
+            # In the beach line every internal node has two children, so an in-order walk alternates between leaves
+            # and the internal nodes that hold the breakpoints between them
+            nodes = replacement.in_order()
+            leaves, breakpoints = nodes[0::2], [node.data for node in nodes[1::2]]
+            for leaf, next_leaf, breakpoint in zip(leaves, leaves[1:], breakpoints):
+                leaf.link(next_leaf, breakpoint)
+
+            if predecessor is not None:
+                predecessor.link(leaves[0], predecessor.right_breakpoint)
+            else:
+                leaves[0]._predecessor = None
+            leaves[-1].link(successor, right_breakpoint)
+
+        elif predecessor is not None:
+            predecessor.link(successor, predecessor.right_breakpoint)
+        elif successor is not None:
+            successor._predecessor = None
 
+        return super().replace_leaf(replacement, root, update_heights=update_heights)
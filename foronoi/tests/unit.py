@@ -1,9 +1,20 @@
 import collections
+import threading
+from decimal import Decimal
 
-from foronoi import Coordinate
+import numpy as np
+import pytest
+
+from foronoi import Coordinate, Point, Lloyd
 from foronoi.algorithm import Algorithm
-from foronoi.graph import Polygon
+from foronoi.graph import Polygon, Predicates, Numeric, Clipping, Algebra, PreparedPolygon, Vertex
 from foronoi.graph.bounding_box import BoundingBox
+from foronoi.contrib import BoundingCircle
+from foronoi.observers.message import Message
+from foronoi.observers.observer import Observer
+from foronoi.nodes import Breakpoint
+from foronoi.events import HeapEventQueue, PriorityEventQueue, SiteStreamEventQueue, SiteEvent, CircleEvent
+from foronoi.visualization import Visualizer
 
 
 # -----------------
@@ -26,8 +37,8 @@ def _check_duplicates(vertices):
     return num_duplicates
 
 
-def _execute(polygon, points, sizes):
-    v = Algorithm(polygon)
+def _execute(polygon, points, sizes, numeric="decimal"):
+    v = Algorithm(polygon, numeric=numeric)
     v.create_diagram(points=points)
     calculated = [p.area(2) for p in v.sites]
     assert sizes == calculated, f"\nResult=\n{calculated}\n\n Expected=\n{sizes}"
@@ -72,6 +83,42 @@ def test_grid():
     _execute(polygon, points, sizes)
 
 
+def test_cocircular_vertices():
+    points = [(x, y) for x in range(0, 25, 5) for y in range(0, 25, 5)]
+    v = Algorithm(BoundingBox(-5, 30, -5, 30), remove_zero_length_edges=False)
+    v.sweep(points)
+
+    # Every interior grid corner is a single vertex of degree four, without zero length edges
+    assert len(v.vertices) == 16
+    assert all(len(vertex.connected_edges) == 4 for vertex in v.vertices)
+    assert all(not edge.removed for edge in v.edges)
+
+
+def test_cocircular_vertices_float64():
+    # The centers of the circle events of a grid with non-integer spacing differ by rounding errors in float64
+    points = [(x * 0.1, y * 0.1) for x in range(10) for y in range(10)]
+    v = Algorithm(BoundingBox(-0.1, 1, -0.1, 1), remove_zero_length_edges=False, numeric="float64")
+    v.sweep(points)
+
+    assert len(v.vertices) == 81
+    assert all(len(vertex.connected_edges) == 4 for vertex in v.vertices)
+
+
+@pytest.mark.parametrize("queue_class", [HeapEventQueue, PriorityEventQueue, SiteStreamEventQueue])
+def test_first_row(queue_class):
+    # The first row is built as a balanced beach line at once
+    v = Algorithm(event_queue_class=queue_class)
+    v.sweep([(x, 5) for x in range(32)])
+    assert v.status_tree.height == 6
+    assert [leaf.data.origin.xd for leaf in v.status_tree.leaves()] == list(range(32))
+
+    points = [(x, 5) for x in range(32)] + [(10.5, 2), (3, 1)]
+    v = Algorithm(BoundingBox(-0.5, 31.5, 0, 10), event_queue_class=queue_class)
+    v.create_diagram(points)
+    assert v.sites[31].area() == pytest.approx(10)
+    assert sum(site.area() for site in v.sites) == pytest.approx(320)
+
+
 def test_diamond():
     # Polygon
     polygon = BoundingBox(0, 10, 0, 10)
@@ -460,6 +507,698 @@ def test_large_grid():
     _execute(polygon, points, sizes)
 
 
+def test_float64_backend():
+    # Polygon
+    polygon = BoundingBox(0, 25, 0, 25)
+
+    # Points (same as test_desmos)
+    points = [
+        (4.6, 11.44),
+        (10, 15.44),
+        (10, 3),
+        (12.7, 10.6),
+        (8.7, 7.7),
+        (13.9, 6.76),
+        (7.1, 4.24),
+        (2.3, 12),
+        (12, 1.20),
+        (5.3, 2),
+        (3.4, 2.9),
+        (7.8, 8.4),
+    ]
+
+    # Expected sizes
+    sizes = [26.01, 202.48, 15.87, 95.95, 12.32, 108.89, 14.05, 57.78, 31.34, 12.08, 31.21, 17.03]
+
+    # Execute test
+    _execute(polygon, points, sizes, numeric="float64")
+
+
+def test_float64_backend_grid():
+    # Polygon
+    polygon = BoundingBox(-5, 30, -5, 30)
+
+    # Points
+    points = [(j, i) for i in range(25, 0, -5) for j in range(0, 25, 5)]
+
+    # Expected sizes
+    sizes = [56.25, 37.5, 37.5, 37.5, 93.75, 37.5, 25.0, 25.0, 25.0, 62.5, 37.5, 25.0, 25.0, 25.0, 62.5, 37.5, 25.0,
+             25.0, 25.0, 62.5, 93.75, 62.5, 62.5, 62.5, 156.25]
+
+    # Execute test
+    _execute(polygon, points, sizes, numeric="float64")
+
+
+def test_backends_in_threads():
+    points = np.random.default_rng(2).uniform(0, 100, (300, 2))
+
+    def build(numeric):
+        v = Algorithm(BoundingBox(-1, 101, -1, 101), numeric=numeric)
+        v.create_diagram(points)
+        return v
+
+    expected = {numeric: [site.area() for site in build(numeric).sites] for numeric in ("decimal", "float64")}
+
+    # Every thread has its own active backend, so that the diagrams do not mix their number types
+    results = {}
+    threads = [threading.Thread(target=lambda numeric=numeric: results.setdefault(numeric, build(numeric)))
+               for numeric in ("decimal", "float64") * 3]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert type(results["decimal"].vertices[0].xd) is Decimal
+    assert type(results["float64"].vertices[0].xd) is float
+    for numeric, v in results.items():
+        assert [site.area() for site in v.sites] == pytest.approx(expected[numeric])
+    assert Numeric.get_mode() == Numeric.DECIMAL
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        Algorithm(BoundingBox(0, 1, 0, 1), numeric="float16")
+
+
+def test_predicates():
+    a, b, c = Coordinate(0, 0), Coordinate(1, 0), Coordinate(0, 1)
+
+    assert Predicates.orientation(a, b, c) == 1
+    assert Predicates.orientation(a, c, b) == -1
+    assert Predicates.orientation(a, b, Coordinate(2, 0)) == 0
+    assert Predicates.incircle(a, b, c, Coordinate(1, 1)) == 0
+    assert Predicates.incircle(a, b, c, Coordinate(0.5, 0.5)) == 1
+    assert Predicates.incircle(a, b, c, Coordinate(2, 2)) == -1
+
+
+def test_predicates_near_degenerate():
+    with Numeric.use(Numeric.FLOAT64):
+        # The float determinant of these points is smaller than its error bound, so it is evaluated exactly
+        a, b, c = Coordinate(0.1, 0.1), Coordinate(0.2, 0.2), Coordinate(0.30000000000000004, 0.3)
+        assert Predicates.orientation(a, b, c) == -1
+        assert Predicates.orientation(Coordinate(0.5, 0.5), Coordinate(12, 12), Coordinate(24, 24)) == 0
+
+
+def test_clipping_matches_scalar():
+    polygon = Polygon([(2.5, 10), (5, 10), (10, 5), (10, 2.5), (5, 0), (2.5, 0), (0, 2.5), (0, 5)])
+    corners = np.array([(point.x, point.y) for point in polygon.points])
+    rng = np.random.default_rng(0)
+    origins, ends = rng.uniform(-5, 15, (200, 2)), rng.uniform(-5, 15, (200, 2))
+
+    inside = Clipping.inside(origins, corners)
+    assert inside.tolist() == [polygon.inside(Coordinate(x, y)) for x, y in origins]
+
+    points, hit = Clipping.ray_intersections(origins, ends, corners)
+    for i in range(len(origins)):
+        for k in range(len(corners)):
+            expected = Algebra.line_ray_intersection_point(origins[i], ends[i], corners[k], corners[(k + 1) % 8])
+            assert hit[i, k] == bool(expected)
+            if expected:
+                assert points[i, k].tolist() == expected[0].tolist()
+
+    # Rays parallel to a side, or of length zero, miss it without warnings
+    with np.errstate(all="raise"):
+        points, hit = Clipping.ray_intersections(np.array([(1.0, 12), (1, 1)]), np.array([(0.0, 12), (1, 1)]), corners)
+    assert not hit.any() and np.isfinite(points).all()
+
+
+def test_prepared_polygon():
+    angles = np.linspace(2 * np.pi, 0, 400, endpoint=False)
+    radii = 40 + 10 * np.sin(7 * angles)
+    corners = np.stack((50 + radii * np.cos(angles), 50 + radii * np.sin(angles)), axis=1)
+    prepared = PreparedPolygon(corners)
+
+    # Random points, and points exactly on the corners and sides
+    rng = np.random.default_rng(1)
+    points = np.vstack((rng.uniform(-10, 110, (2000, 2)), corners, (corners + np.roll(corners, -1, axis=0)) / 2))
+    assert (prepared.inside(points) == Clipping.inside(points, corners)).all()
+
+    # Random segments, and vertical, horizontal, infinite and zero length segments, and segments from the corners
+    origins, ends = rng.uniform(30, 70, (100, 2)), rng.uniform(-200, 300, (100, 2))
+    ends[:10, 0], ends[10:20, 1], ends[20:25], ends[25:30] = origins[:10, 0], origins[10:20, 1], np.inf, origins[25:30]
+    origins[30:40], ends[30:40] = corners[:10], 2 * corners[:10] - 50
+    points, found = prepared.clip(origins, ends)
+    expected_points, expected_found = Clipping.clip(origins, ends, corners)
+    assert (found == expected_found).all() and (points[found] == expected_points[found]).all()
+
+    # A diagram in a large polygon is the same with or without the spatial index
+    polygon = Polygon(corners.tolist())
+    sites = rng.uniform(35, 65, (50, 2))
+    v = Algorithm(polygon)
+    v.create_diagram(sites)
+    assert polygon._prepared is not None
+    expected = Algorithm(Polygon(corners.tolist()))
+    expected.bounding_poly.prepare_threshold = len(corners) + 1
+    expected.create_diagram(sites)
+    assert [site.area() for site in v.sites] == [site.area() for site in expected.sites]
+
+    # Points on the sides are found with the spatial index as well
+    points = [Coordinate(x, y) for x, y in np.vstack((corners, (corners + np.roll(corners, -1, axis=0)) / 2,
+                                                      rng.uniform(0, 100, (100, 2))))]
+    assert [polygon._on_edge(point) for point in points] == \
+           [expected.bounding_poly._on_edge(point) for point in points]
+
+
+def test_bounding_box_fast_path():
+    box = BoundingBox(-2, 7, -1, 5)
+    polygon = Polygon([(-2, 5), (7, 5), (7, -1), (-2, -1)])
+    corners = np.array([(-2, 5), (7, 5), (7, -1), (-2, -1)], dtype=float)
+
+    # Containment, including points on the sides and corners
+    rng = np.random.default_rng(3)
+    points = [Coordinate(x, y) for x, y in rng.uniform(-4, 9, (200, 2))]
+    points += [Coordinate(x, y) for x in (-2, 0, 7) for y in (-1, 2, 5)]
+    assert [box.inside(point) for point in points] == [polygon.inside(point) for point in points]
+
+    origins, ends = rng.uniform(-1, 6, (200, 2)), rng.uniform(-20, 20, (200, 2))
+    clipped, found = Clipping.clip_box(origins, ends, (-2, -1, 7, 5))
+    expected, expected_found = Clipping.clip(origins, ends, corners)
+    assert (found == expected_found).all()
+    assert np.allclose(clipped[found], expected[found])
+
+    # The border vertices are ordered the same as by their angle
+    vertices = [Vertex(x, y) for x, y in [(-2, 2), (-2, 3), (0, 5), (7, 5), (7, 0), (1, -1), (-2, -1), (-2, 1)]]
+    shuffled = [vertices[i] for i in rng.permutation(len(vertices))]
+    assert box._get_ordered_vertices(shuffled) == polygon._get_ordered_vertices(shuffled) == vertices
+
+
+@pytest.mark.filterwarnings("ignore:\\s+Warning! The bounding circle")
+def test_bounding_circle():
+    origins = np.array([(0, 0), (0, 0), (3, 4), (-10, 0)], dtype=float)
+    ends = np.array([(10, 0), (1, 1), (6, 8), (10, 0)], dtype=float)
+    points, found = Clipping.clip_circle(origins, ends, (0, 0), 5)
+    assert found.tolist() == [True, False, False, True]
+    assert np.allclose(points[found], [(5, 0), (5, 0)])
+
+    rng = np.random.default_rng(4)
+    radii, angles = 9 * np.sqrt(rng.uniform(0, 1, 40)), rng.uniform(0, 2 * np.pi, 40)
+    points = np.stack((5 + radii * np.cos(angles), 5 + radii * np.sin(angles)), axis=1)
+
+    for sites in (points, [(5, 5)], [(3, 5), (7, 5)]):
+        circle = BoundingCircle(5, 5, 9)
+        v = Algorithm(circle)
+        v.create_diagram(sites)
+        assert sum(circle.cell_area(site) for site in v.sites) == pytest.approx(np.pi * 81)
+
+
+def test_clip_one_sweep():
+    rng = np.random.default_rng(5)
+    points = rng.uniform(30, 60, (60, 2))
+    polygons = [lambda: BoundingBox(0, 100, 0, 100), lambda: BoundingBox(25, 65, 25, 65),
+                lambda: Polygon([(0, 0), (50, 120), (100, 0)])]
+
+    v = Algorithm()
+    v.sweep(points)
+    for polygon in polygons + polygons[:1]:
+        expected = Algorithm(polygon())
+        expected.create_diagram(points)
+        clipped = v.clip(polygon())
+        assert [site.area() for site in clipped.sites] == [site.area() for site in expected.sites]
+
+    # The sweep result is never touched by clipping
+    assert all(site is not clipped_site for site, clipped_site in zip(v.sites, clipped.sites))
+    with pytest.raises(ValueError):
+        clipped.clip(BoundingBox(0, 100, 0, 100))
+
+    # The region has to contain all sites, where sites on its border are allowed
+    for polygon in [BoundingBox(40, 100, 0, 100), Polygon([(0, 0), (50, 80), (100, 0)]), BoundingCircle(45, 45, 15)]:
+        with pytest.raises(ValueError, match="does not contain all sites"):
+            v.clip(polygon)
+
+    v = Algorithm()
+    v.sweep([(0, 5), (5, 5), (10, 5), (5, 0)])
+    for polygon in [BoundingBox(0, 10, 0, 10), BoundingCircle(5, 5, 5)]:
+        assert len(v.clip(polygon).sites) == 4
+
+
+def test_unbounded_diagram():
+    rng = np.random.default_rng(6)
+    points = rng.uniform(0, 10, (40, 2))
+    v = Algorithm()
+    v.create_diagram(points)
+    diagram = v.get_unbounded()
+
+    def nearest_sites(positions, sites):
+        distances = np.linalg.norm(positions[:, None, :] - points[None, :, :], axis=2)
+        own = np.take_along_axis(distances, sites, axis=1)
+        return np.allclose(own[:, 0], own[:, 1]) and np.allclose(own[:, 0], distances.min(axis=1))
+
+    # Points on the edges and far away on the rays lie closest to the sites on both sides
+    middles = diagram.vertices[diagram.edges].mean(axis=1)
+    assert nearest_sites(middles, diagram.edge_sites)
+    assert nearest_sites(diagram.ray_origins + 1000 * diagram.ray_directions, diagram.ray_sites)
+    assert (diagram.ray_vertices >= 0).all()
+
+    # The sites on the hull have unbounded cells
+    assert diagram.hull.sum() == len(diagram.ray_origins)
+    center = points.mean(axis=0)
+    assert diagram.hull[np.argmax(np.linalg.norm(points - center, axis=1))]
+
+    # Two sites are separated by a full line
+    v = Algorithm()
+    v.create_diagram([(0, 0), (2, 0)])
+    diagram = v.get_unbounded()
+    assert diagram.ray_origins.tolist() == [[1, 0], [1, 0]]
+    assert diagram.ray_directions.tolist() == [[0, 1], [0, -1]]
+    assert diagram.ray_sites.tolist() == [[0, 1], [1, 0]]
+
+
+@pytest.mark.parametrize("numeric", [Numeric.DECIMAL, Numeric.FLOAT64])
+def test_plot_unbounded_diagram(numeric):
+    points = np.random.default_rng(6).uniform(0, 10, (20, 2))
+    v = Algorithm(numeric=numeric)
+    v.create_diagram(points)
+
+    # Without a bounding polygon, the canvas fits the sites and the vertices
+    visualizer = Visualizer(v, canvas_offset=1).plot_all(polygon=True, outgoing_edges=True, border_to_site=True)
+    assert visualizer.min_x == min(point.xd for point in v.sites + v.vertices) - 1
+    assert visualizer.max_y == max(point.yd for point in v.sites + v.vertices) + 1
+    assert not visualizer.canvas.patches
+    assert len(visualizer.canvas.lines) > len(v.edges)
+    visualizer.get_canvas()
+
+    # Before the sweep, there are no sites yet
+    visualizer = Visualizer(Algorithm(numeric=numeric), canvas_offset=1).plot_all()
+    assert (visualizer.min_x, visualizer.max_x) == (-1, 2)
+    visualizer.get_canvas()
+
+
+def test_insert_site():
+    rng = np.random.default_rng(8)
+    points, inserted = rng.uniform(1, 9, (30, 2)), rng.uniform(0.5, 9.5, (20, 2))
+    polygons = [lambda: BoundingBox(0, 10, 0, 10), lambda: Polygon([(-5, 0), (5, 15), (15, 0)])]
+
+    for polygon in polygons:
+        v = Algorithm(polygon())
+        v.create_diagram(points)
+        sites = [v.insert_site(x, y) for x, y in inserted]
+        assert v.sites[-len(sites):] == sites
+
+        expected = Algorithm(polygon())
+        expected.create_diagram(np.vstack([points, inserted]))
+        assert [site.area() for site in v.sites] == pytest.approx([site.area() for site in expected.sites])
+        assert np.allclose(sorted(vertex.xy for vertex in v.vertices), sorted(vertex.xy for vertex in expected.vertices))
+        assert len(v.edges) == len(expected.edges)
+
+    with pytest.raises(ValueError):
+        v.insert_site(*points[0])
+    with pytest.raises(ValueError):
+        v.insert_site(20, 20)
+
+
+def test_remove_and_move_site():
+    rng = np.random.default_rng(9)
+    polygons = [lambda: BoundingBox(0, 10, 0, 10), lambda: Polygon([(-5, 0), (5, 15), (15, 0)])]
+
+    for polygon in polygons:
+        points = rng.uniform(1, 9, (30, 2))
+        v = Algorithm(polygon())
+        v.create_diagram(points)
+        for index in rng.choice(len(points), 5, replace=False):
+            points[index] = rng.uniform(1, 9, 2)
+            v.move_site(v.sites[index], *points[index])
+        for index in sorted(rng.choice(len(points), 5, replace=False), reverse=True):
+            v.remove_site(v.sites[index])
+            points = np.delete(points, index, axis=0)
+
+        expected = Algorithm(polygon())
+        expected.create_diagram(points)
+        assert [site.area() for site in v.sites] == pytest.approx([site.area() for site in expected.sites])
+        assert np.allclose(sorted(vertex.xy for vertex in v.vertices), sorted(vertex.xy for vertex in expected.vertices))
+        assert len(v.edges) == len(expected.edges)
+
+    # The cell of a removed grid site is divided among four neighbors that meet in one vertex
+    grid = [(x + 0.5, y + 0.5) for x in range(5) for y in range(5)]
+    v = Algorithm(BoundingBox(0, 5, 0, 5))
+    v.create_diagram(grid)
+    removed = v.sites[12]
+    v.remove_site(removed)
+    assert removed not in v.sites and removed.first_edge is None
+    assert sorted(site.area() for site in v.sites) == [1] * 20 + [1.25] * 4
+    assert len(v.vertices) == 36 + 1
+
+    with pytest.raises(ValueError):
+        v.remove_site(removed)
+    with pytest.raises(ValueError):
+        v.move_site(v.sites[0], *v.sites[1].xy)
+
+
+@pytest.mark.parametrize("numeric", [Numeric.DECIMAL, Numeric.FLOAT64])
+def test_remove_site_at_border_vertex(numeric):
+    # Three cells meet exactly on the left side (0, 30) and on the top side (40, 100) of the box
+    for points in [[(10, 20), (10, 40), (2, 16), (50, 50), (60, 80), (80, 20)],
+                   [(20, 90), (60, 90), (50, 80), (10, 60), (40, 50), (80, 30)]]:
+        v = Algorithm(BoundingBox(0, 100, 0, 100), numeric=numeric)
+        v.create_diagram(points)
+        assert sum(site.area() for site in v.sites) == pytest.approx(10000)
+
+        for index in range(len(points)):
+            v = Algorithm(BoundingBox(0, 100, 0, 100), numeric=numeric)
+            v.create_diagram(points)
+            v.remove_site(v.sites[index])
+
+            expected = Algorithm(BoundingBox(0, 100, 0, 100), numeric=numeric)
+            expected.create_diagram(points[:index] + points[index + 1:])
+            assert [site.area() for site in v.sites] == pytest.approx([site.area() for site in expected.sites])
+
+
+@pytest.mark.parametrize("numeric", [Numeric.DECIMAL, Numeric.FLOAT64])
+def test_edit_falls_back_to_rebuild(numeric):
+    # After these edits of a grid, the cell of (10, 50) can not be divided among its neighbors locally when it is
+    # moved, after which the diagram is built again instead of being left half edited
+    points = [(10, 80), (20, 30), (20, 20), (60, 20), (30, 40), (50, 40), (40, 60), (40, 10), (10, 50), (30, 30),
+              (70, 20), (60, 60), (80, 30), (60, 30), (70, 30), (80, 20), (40, 80), (90, 10), (80, 80), (10, 20),
+              (30, 60), (40, 30), (80, 90), (30, 70), (90, 20), (40, 70), (90, 70)]
+    edits = [("move", 7, (23, 31)), ("insert", None, (23, 42)), ("insert", None, (18, 66)), ("move", 21, (47, 66)),
+             ("move", 25, (24, 58)), ("remove", 24, None), ("remove", 11, None), ("remove", 12, None),
+             ("move", 20, (95, 60)), ("move", 8, (32, 63))]
+
+    v = Algorithm(BoundingBox(0, 100, 0, 100), numeric=numeric)
+    v.create_diagram(points)
+    for edit, index, target in edits:
+        if edit == "insert":
+            v.insert_site(*target)
+            points = points + [target]
+        elif edit == "remove":
+            v.remove_site(v.sites[index])
+            points = points[:index] + points[index + 1:]
+        else:
+            v.move_site(v.sites[index], *target)
+            points = points[:index] + [target] + points[index + 1:]
+
+        expected = Algorithm(BoundingBox(0, 100, 0, 100), numeric=numeric)
+        expected.create_diagram(points)
+        assert [site.xy for site in v.sites] == pytest.approx(points)
+        assert all(edge.incident_point is site for site in v.sites for edge in site.borders())
+        assert [site.area() for site in v.sites] == pytest.approx([site.area() for site in expected.sites])
+        assert len(v.vertices) == len(expected.vertices)
+
+
+@pytest.mark.parametrize("numeric", [Numeric.DECIMAL, Numeric.FLOAT64])
+def test_edits_match_rebuild(numeric):
+    # Random edits on a grid, where many sites are cocircular, give the same cells as building the diagram again
+    rng = np.random.default_rng(2)
+    polygons = [lambda: BoundingBox(0, 100, 0, 100), lambda: Polygon([(50, 0), (100, 30), (90, 90), (30, 100), (0, 40)]),
+                lambda: BoundingCircle(50, 50, 50)]
+
+    for polygon in polygons:
+        grid = [(x, y) for x in range(10, 100, 10) for y in range(10, 100, 10) if polygon().inside(Coordinate(x, y))]
+        points = [grid[index] for index in rng.choice(len(grid), 20, replace=False)]
+        v = Algorithm(polygon(), numeric=numeric)
+        v.create_diagram(points)
+
+        for edit in rng.choice(["insert", "remove", "move"], 20):
+            index = int(rng.integers(len(points)))
+            target = tuple(5 * int(value) for value in rng.integers(1, 20, 2))
+            if edit != "remove" and (target in points or not polygon().inside(Coordinate(*target))):
+                continue
+            if edit == "insert":
+                v.insert_site(*target)
+                points = points + [target]
+            elif edit == "remove":
+                v.remove_site(v.sites[index])
+                points = points[:index] + points[index + 1:]
+            else:
+                v.move_site(v.sites[index], *target)
+                points = points[:index] + [target] + points[index + 1:]
+
+            expected = Algorithm(polygon(), numeric=numeric)
+            expected.create_diagram(points)
+            area = getattr(v.bounding_poly, "cell_area", Point.area)
+            assert [area(site) for site in v.sites] == pytest.approx([area(site) for site in expected.sites])
+
+
+def test_move_sites():
+    rng = np.random.default_rng(4)
+    polygons = [lambda: BoundingBox(0, 10, 0, 10), lambda: Polygon([(-5, 0), (5, 15), (15, 0)])]
+
+    for polygon in polygons:
+        points = rng.uniform(2, 8, (30, 2))
+        velocities = rng.normal(0, 0.05, points.shape)
+        v = Algorithm(polygon(), numeric="float64")
+        v.create_diagram(points)
+        changed = 0
+        for frame in range(10):
+            points = np.clip(points + velocities, 1, 9)
+            changed += len(v.move_sites(points))
+
+            expected = Algorithm(polygon(), numeric="float64")
+            expected.create_diagram(points)
+            assert [site.xy for site in v.sites] == pytest.approx([site.xy for site in expected.sites])
+            assert [site.area() for site in v.sites] == pytest.approx([site.area() for site in expected.sites])
+            assert len(v.vertices) == len(expected.vertices)
+
+        # Most cells keep their structure between the frames
+        assert 0 < changed < 10 * len(points)
+
+    with pytest.raises(ValueError):
+        v.move_sites(points[:-1])
+    with pytest.raises(ValueError):
+        v.move_sites(np.vstack((points[:-1], points[:1])))
+    with pytest.raises(ValueError):
+        v.move_sites(np.vstack((points[:-1], [(np.nan, 1)])))
+    assert all(site.first_edge is not None for site in v.sites)
+
+    # The sites around the vertices where four cells of a grid meet keep their cells
+    grid = np.array([(x + 0.5, y + 0.5) for x in range(3) for y in range(3)])
+    v = Algorithm(BoundingBox(0, 3, 0, 3), numeric="float64")
+    v.create_diagram(grid)
+    assert v.move_sites(grid) == []
+    assert [site.area() for site in v.sites] == pytest.approx([1] * 9)
+
+    # Moving many sites far builds the diagram again, with the same sites
+    points = rng.uniform(1, 9, (40, 2))
+    v = Algorithm(BoundingBox(0, 10, 0, 10), numeric="float64")
+    v.create_diagram(points)
+    sites = list(v.sites)
+    points = np.clip(points + rng.normal(0, 0.5, points.shape), 0.5, 9.5)
+    v.move_sites(points)
+    expected = Algorithm(BoundingBox(0, 10, 0, 10), numeric="float64")
+    expected.create_diagram(points)
+    assert all(site is other for site, other in zip(v.sites, sites))
+    assert [site.area() for site in v.sites] == pytest.approx([site.area() for site in expected.sites])
+    assert len(v.vertices) == len(expected.vertices)
+
+
+def test_lloyd():
+    rng = np.random.default_rng(6)
+    points = rng.uniform(1, 9, (40, 2))
+    result = Lloyd(BoundingBox(0, 10, 0, 10)).relax(points, iterations=15, tol=0)
+
+    # The same sites as building the diagram again in every iteration
+    expected = points
+    for _ in range(15):
+        v = Algorithm(BoundingBox(0, 10, 0, 10), numeric="float64")
+        v.create_diagram(expected)
+        expected = v.cell_metrics().centroid
+    assert np.allclose(result.points, expected)
+    assert np.allclose([site.xy for site in result.diagram.sites], expected)
+    assert result.iterations == 15 and not result.converged
+
+    # Four sites end up in the centers of the quarters of the box
+    result = Lloyd(BoundingBox(0, 10, 0, 10)).relax([(1, 1), (6, 2), (3, 7), (8, 9)], tol=1e-9)
+    assert result.converged and result.shift <= 1e-9
+    assert np.allclose(result.points, [(2.5, 2.5), (7.5, 2.5), (2.5, 7.5), (7.5, 7.5)])
+
+    with pytest.raises(ValueError):
+        Lloyd(BoundingCircle(5, 5, 5))
+
+
+def test_merge_vertices_with_tolerance():
+    vertices = [Vertex(0, 0), Vertex(1e-9, 0), Vertex(2e-9, 1e-9), Vertex(1, 1), Vertex(1, 1)]
+    exact = Algorithm.merge_vertices(vertices)
+    assert [exact[vertex] for vertex in vertices] == [vertices[0], vertices[1], vertices[2], vertices[3], vertices[3]]
+    merged = Algorithm.merge_vertices(vertices, tolerance=1e-6)
+    assert [merged[vertex] for vertex in vertices] == [vertices[0]] * 3 + [vertices[3]] * 2
+
+    # A grid with float noise only has the vertices of the exact grid left
+    grid = np.array([(x, y) for x in range(8) for y in range(8)], dtype=float)
+    noisy = grid + np.random.default_rng(7).uniform(-1e-10, 1e-10, grid.shape)
+    counts = []
+    for points, tolerance in ((grid, 0), (noisy, 1e-6)):
+        v = Algorithm(BoundingBox(-1, 8, -1, 8), numeric="float64", zero_length_tolerance=tolerance)
+        v.create_diagram(points)
+        counts.append(len(v.vertices))
+        assert sum(site.area() for site in v.sites) == pytest.approx(81)
+    assert counts[0] == counts[1]
+
+
+def test_event_queues_agree():
+    points = [(2.5, 2.5), (4, 7.5), (7.5, 2.5), (6, 7.5), (4, 4), (3, 3), (6, 3)]
+
+    results = []
+    for event_queue_class in [SiteStreamEventQueue, HeapEventQueue, PriorityEventQueue]:
+        v = Algorithm(BoundingBox(0, 10, 0, 10), event_queue_class=event_queue_class)
+        v.create_diagram(points)
+        results.append(sorted(vertex.xy for vertex in v.vertices))
+
+    assert results[0] == results[1] == results[2]
+
+
+def test_site_stream_event_queue_order():
+    # Sites that are added one by one follow their exact priority, also where the floats are equal
+    points = [Point(Decimal(2), Decimal("0.10000000000000000001")), Point(0, 5), Point(Decimal(1), Decimal("0.1")),
+              Point(1, 7)]
+    queue = SiteStreamEventQueue()
+    for point in points:
+        queue.put(SiteEvent(point))
+
+    assert [queue.get().point for _ in points] == [points[3], points[1], points[0], points[2]]
+    assert queue.empty()
+
+
+def test_heap_event_queue_compaction():
+    queue = HeapEventQueue(compaction_threshold=0.5, min_compaction_size=4)
+    events = [CircleEvent(Coordinate(i, 0), radius=Numeric.convert(1), arc_node=None) for i in range(8)]
+    for event in events:
+        queue.put(event)
+    queue.put(SiteEvent(Point(0, 5)))
+
+    # Invalidate more than half of the events
+    for event in events[:5]:
+        queue.remove(event)
+
+    assert len(queue.heap) == 4 and queue.invalid == 0
+    assert isinstance(queue.get(), SiteEvent)
+    assert [queue.get().xd for _ in range(3)] == [5, 6, 7]
+    assert queue.empty()
+
+
+def test_site_stream_event_queue():
+    queue = SiteStreamEventQueue()
+    queue.extend(SiteEvent(Point(x, y)) for x, y in [(2, 1), (1, 3), (0, 1), (5, 2)])
+
+    # A circle event at the same position as a site event goes first
+    circle_event = CircleEvent(Coordinate(1, 3), radius=Numeric.convert(0), arc_node=None)
+    queue.put(circle_event)
+
+    assert queue.get() is circle_event
+    assert [queue.get().point.xy for _ in range(4)] == [(1, 3), (5, 2), (0, 1), (2, 1)]
+    assert queue.empty()
+
+
+class _ThreadObserver(Observer):
+    def __init__(self):
+        self.steps = 0
+
+    def update(self, subject, message, **kwargs):
+        if message != Message.STEP_FINISHED or subject.status_tree is None:
+            return
+
+        # Walk the threaded leaves and compare them with the leaves of the tree
+        leaves = subject.status_tree.leaves()
+        threaded = [leaves[0]]
+        while threaded[-1].successor is not None:
+            threaded.append(threaded[-1].successor)
+        assert threaded == leaves
+        assert all(leaf.successor.predecessor is leaf for leaf in leaves[:-1])
+
+        # The breakpoints between the leaves should match the internal nodes
+        breakpoints = [node.data for node in subject.status_tree.in_order()[1::2]]
+        assert [leaf.right_breakpoint for leaf in leaves[:-1]] == breakpoints
+        self.steps += 1
+
+
+def test_threaded_leaves():
+    points = [(2.5, 2.5), (4, 7.5), (7.5, 2.5), (6, 7.5), (4, 4), (3, 3), (6, 3), (2.5, 7.5), (5, 5), (7.5, 7.5)]
+    observer = _ThreadObserver()
+
+    v = Algorithm(BoundingBox(0, 10, 0, 10))
+    v.attach_observer(observer)
+    v.create_diagram(points)
+
+    assert observer.steps > len(points)
+
+
+def test_breakpoint_key_cache():
+    a, b, c = Point(2, 5), Point(6, 3), Point(8, 4)
+    breakpoint = Breakpoint(breakpoint=(a, b))
+
+    for sweep_line in [Decimal(2), Decimal(1), Decimal(-3)]:
+        assert breakpoint.get_intersection_x(sweep_line) == breakpoint.get_intersection(sweep_line).xd
+        assert breakpoint.get_intersection_x(sweep_line) is breakpoint.get_intersection_x(sweep_line)
+
+    # A new pair of sites invalidates the cached key
+    breakpoint.breakpoint = (a, c)
+    assert breakpoint.get_intersection_x(Decimal(-3)) == Breakpoint(breakpoint=(a, c)).get_intersection_x(Decimal(-3))
+
+
+def test_array_api():
+    points = np.array([(2.5, 2.5), (4, 7.5), (7.5, 2.5), (6, 7.5), (4, 4), (3, 3), (6, 3)])
+    v = Algorithm(BoundingBox(0, 10, 0, 10))
+    v.create_diagram(points)
+    arrays = v.get_arrays()
+
+    # The cells follow the order of the input points
+    assert [site.xy for site in v.sites] == [tuple(point) for point in points]
+    assert len(arrays.cell_offsets) == len(points) + 1
+
+    for index, site in enumerate(v.sites):
+        cell = arrays.vertices[arrays.cell_vertices[arrays.cell_offsets[index]:arrays.cell_offsets[index + 1]]]
+        assert cell.tolist() == [list(vertex.xy) for vertex in site.vertices()]
+
+    # Every edge has its site on the right, and the edges between two cells appear once
+    assert len(arrays.edges) == len(arrays.edge_sites) == len(set(map(tuple, np.sort(arrays.edges, axis=1))))
+    assert (arrays.edge_sites[:, 1] >= 0).all()
+
+    with pytest.raises(ValueError):
+        Algorithm(BoundingBox(0, 10, 0, 10)).create_diagram(np.zeros((3, 3)))
+
+
+def test_cell_metrics():
+    points = [(2.5, 2.5), (7.5, 2.5), (2.5, 7.5), (7.5, 7.5)]
+    v = Algorithm(BoundingBox(0, 10, 0, 10))
+    v.create_diagram(points)
+    metrics = v.cell_metrics()
+
+    assert metrics.area.tolist() == [site.area() for site in v.sites] == [25.0] * 4
+    assert metrics.centroid.tolist() == [list(point) for point in points]
+    assert metrics.perimeter.tolist() == [20.0] * 4
+    assert metrics.bounding_box.tolist() == [[0, 0, 5, 5], [5, 0, 10, 5], [0, 5, 5, 10], [5, 5, 10, 10]]
+
+    # Irregular cells agree with the areas of the sites as well
+    v = Algorithm(BoundingBox(0, 25, 0, 25))
+    v.create_diagram([(4.6, 11.44), (10, 15.44), (10, 3), (12.7, 10.6), (8.7, 7.7), (13.9, 6.76), (7.1, 4.24)])
+    assert np.allclose(v.cell_metrics().area, [site.area() for site in v.sites])
+
+    # The arrays are kept until a site moves
+    assert v.get_arrays() is v.get_arrays()
+    v.move_site(v.sites[0], 5, 12)
+    assert np.allclose(v.cell_metrics().area, [site.area() for site in v.sites])
+
+
+def test_dcel_views():
+    points = [(2.5, 2.5), (4, 7.5), (7.5, 2.5), (6, 7.5), (4, 4), (3, 3), (6, 3)]
+    v = Algorithm(BoundingBox(0, 10, 0, 10))
+    v.create_diagram(points)
+    dcel = v.get_dcel()
+
+    for index, site in enumerate(v.sites):
+        border, view = site.first_edge, dcel.site_edge_view(index)
+        for _ in site.borders():
+            assert view.incident_point is site
+            assert view.origin.xy == border.origin.xy
+            assert view.twin.twin == view
+            assert len(view.origin.connected_edges) == len(border.origin.connected_edges)
+            border, view = border.next, view.next
+
+    # The cells follow the borders of the sites, starting at their first edge
+    cell_offsets, cell_edges = dcel.cells()
+    for index, site in enumerate(v.sites):
+        edges = cell_edges[cell_offsets[index]:cell_offsets[index + 1]]
+        assert [dcel.vertex(dcel.origin[edge]).xy for edge in edges] == [border.origin.xy for border in site.borders()]
+
+
+def test_compact_instances():
+    point = Point(1, 2)
+    for instance in [point, Coordinate(1, 2), SiteEvent(point), Breakpoint(breakpoint=(point, point))]:
+        assert not hasattr(instance, "__dict__")
+
+    # Values that are already stored in the active backend are not converted again
+    value = Decimal("0.1")
+    assert Coordinate(value, 0).xd is value
+
+
 def _test_vertices_correct(polygon, points, expected, remove_zero_length_edges):
     # Initialize the algorithm
     v = Algorithm(polygon, remove_zero_length_edges=remove_zero_length_edges)
@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ("data", "_left", "_right", "_height", "parent")
+
     def __init__(self, data):
         """
         A smart tree node with some extra functionality over standard nodes.
@@ -87,15 +89,21 @@ class Node:
 
     def update_heights(self):
         """
-        Recalculate the heights of this node and all ancestor nodes.
+        Recalculate the heights of this node and its ancestor nodes. Walks up iteratively, and stops as soon as the
+        height of an ancestor does not change, because the heights above it will not change either.
         """
 
         # Calculate height
         self.update_height()
 
-        # Update parent
-        if self.parent is not None:
-            self.parent.update_heights()
+        # Update ancestors
+        node = self.parent
+        while node is not None:
+            height = node._height
+            node.update_height()
+            if node._height == height:
+                break
+            node = node.parent
 
     def is_left_child(self):
         """
@@ -188,13 +196,40 @@ class Node:
         # Step over to the left branch, and take the maximum
         return current.parent.left.maximum()
 
-    def replace_leaf(self, replacement, root):
+    def in_order(self):
+        """
+        Collects the nodes in the subtree rooted by this node in order, without recursion.
+        :return: (list) The nodes of the subtree, from left to right
+        """
+        nodes = []
+        stack = []
+        node = self
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                nodes.append(node)
+                node = node.right
+        return nodes
+
+    def leaves(self):
+        """
+        Collects the leaves in the subtree rooted by this node, from left to right.
+        :return: (list) The leaves of the subtree
+        """
+        return [node for node in self.in_order() if node.is_leaf()]
+
+    def replace_leaf(self, replacement, root, update_heights=True):
         """
         Replace the node by a replacement tree.
         Requires the current node to be a leaf.
 
         :param replacement: (Node) The root node of the replacement sub tree
         :param root: (Node) The root of the tree
+        :param update_heights: (bool) Update the heights of the ancestors. Can be disabled when the caller calls
+        Tree.balance_and_propagate() afterwards, which updates the heights itself.
         :return: (Node) The root of the updated tree
         """
 
@@ -214,13 +249,15 @@ class Node:
         else:
             root = replacement
 
-        # For non-empty replacement, start updating heights from replacement's root
-        if replacement is not None:
-            replacement.update_heights()
+        if update_heights:
+
+            # For non-empty replacement, start updating heights from replacement's root
+            if replacement is not None:
+                replacement.update_heights()
 
-        # For empty replacement, start updating heights from the parent
-        elif self.parent is not None:
-            self.parent.update_heights()
+            # For empty replacement, start updating heights from the parent
+            elif self.parent is not None:
+                self.parent.update_heights()
 
         # Return the new tree. No need to return the replacement, because the
         # reference remains the same.
@@ -35,32 +35,32 @@ class Tree:
         :return: (Node or None) Returns the node that corresponds to the query or None
         """
         key = query.get_key(**kwargs)
-        node = root
-        while node is not None:
-            if key == node.get_key(**kwargs):
-
-                if compare(node.data, query.data):
-                    return node
 
-                left = Tree.find_value(node.left, query, compare, **kwargs)
-                if left is None:
-                    right = Tree.find_value(node.right, query, compare, **kwargs)
-                    return right
+        # Depth-first search with an explicit stack. The branch that the key points to is searched first.
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
 
-                return left
+            node_key = node.get_key(**kwargs)
+            if key == node_key and compare(node.data, query.data):
+                return node
 
-            elif key < node.get_key(**kwargs):
-                # Normally, the three should go left and find the correct value there,
+            if key <= node_key:
+                # Normally, the tree should go left and find the correct value there,
                 # but due to rounding errors, it sometimes takes the wrong turn. So if the left
                 # branch doesn't get a result, we try the other branch.
-                return Tree.find_value(node.left, query, compare, **kwargs) or \
-                       Tree.find_value(node.right, query, compare, **kwargs)
+                stack.append(node.right)
+                stack.append(node.left)
             else:
-                # Normally, the three should go right and find the correct value there,
+                # Normally, the tree should go right and find the correct value there,
                 # but due to rounding errors, it sometimes takes the wrong turn. So if the right
                 # branch doesn't get a result, we try the other branch.
-                return Tree.find_value(node.right, query, compare, **kwargs) or \
-                       Tree.find_value(node.left, query, compare, **kwargs)
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return None
 
     @staticmethod
     def find_leaf_node(root: Node, key, **kwargs):
@@ -82,8 +82,11 @@ class Tree:
             if node.is_leaf():
                 return node
 
+            # Evaluate the key of the node only once
+            node_key = node.get_key(**kwargs)
+
             # If we found the key, we choose a direction
-            elif key == node.get_key(**kwargs) and not node.is_leaf():
+            if key == node_key:
 
                 # We take the left path if possible
                 if node.left is not None:
@@ -93,7 +96,7 @@ class Tree:
                 return node.right.minimum()
 
             # Normal binary search
-            elif key < node.get_key(**kwargs):
+            elif key < node_key:
                 node = node.left
             else:
                 node = node.right
@@ -178,21 +181,65 @@ class Tree:
 
         return root
 
+    @staticmethod
+    def build(leaves, internal_nodes):
+        """
+        Build a balanced tree from its leaves and internal nodes at once, without any rotations. In the in-order walk
+        of the result, the leaves and the internal nodes alternate.
+
+        :param leaves: (list) The leaves, from left to right
+        :param internal_nodes: (list) The internal nodes between the leaves, one less than the number of leaves
+        :return: The root of the tree
+        """
+
+        def build(start, stop):
+            if stop - start == 1:
+                leaf = leaves[start]
+                leaf.update_height()
+                return leaf
+
+            middle = (start + stop) // 2
+            node = internal_nodes[middle - 1]
+            node.left = build(start, middle)
+            node.right = build(middle, stop)
+            node.update_height()
+            return node
+
+        root = build(0, len(leaves))
+        root.parent = None
+        return root
+
     @staticmethod
     def balance_and_propagate(node):
         """
-        Walks up the tree recursively to rebalance all nodes, until it reaches the new root.
+        Walks up the tree to update the heights and rebalance all nodes, until it reaches the new root. The walk is
+        iterative, and stops early as soon as the height of a (rebalanced) subtree did not change, because nothing
+        above it changes either.
 
         :param node: The starting point, everything below this point is assumed to be balanced.
         :return: The root of the balanced tree
         """
 
-        node = Tree.balance(node)
+        start = node
+        while True:
+            height = node._height
+            node.update_height()
+            node = Tree.balance(node)
 
-        if node.parent is None:
-            return node
+            if node.parent is None:
+                return node
 
-        return Tree.balance_and_propagate(node.parent)
+            # The height of the starting point is unknown beforehand, so we can only stop above it
+            if node is not start and node.height == height:
+                break
+
+            node = node.parent
+
+        # Nothing changes above this point, so we only need to find the root
+        while node.parent is not None:
+            node = node.parent
+
+        return node
 
     @staticmethod
     def balance(node):
@@ -313,14 +360,5 @@ class Tree:
         if leaves is None:
             leaves = []
 
-        # Base case
-        if root.is_leaf():
-            leaves.append(root)
-            return leaves
-
-        # Step
-        if root.left is not None:
-            leaves += Tree.get_leaves(root.left, None)
-        if root.right is not None:
-            leaves += Tree.get_leaves(root.right, None)
+        leaves += root.leaves()
         return leaves
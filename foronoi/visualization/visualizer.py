@@ -1,12 +1,11 @@
 from copy import copy
-from decimal import Decimal
 
 import numpy as np
 from matplotlib import patches
 
-from foronoi import Coordinate
 from foronoi.algorithm import Algorithm
 from foronoi.events import CircleEvent
+from foronoi.graph.numeric import Numeric
 import matplotlib.pyplot as plt
 
 
@@ -83,7 +82,7 @@ class Visualizer:
             Width, height in inches
         """
         self.voronoi = voronoi
-        self.min_x, self.max_x, self.min_y, self.max_y = self._canvas_size(voronoi.bounding_poly, canvas_offset)
+        self.min_x, self.max_x, self.min_y, self.max_y = self._canvas_size(voronoi, canvas_offset)
         plt.close("all")  # Prevents previous created plots from showing up
         fig, ax = plt.subplots(figsize=figsize)
         self.canvas = ax
@@ -193,16 +192,19 @@ class Visualizer:
     def plot_polygon(self):
         """
         Display the polygon outline.
-        *Only useful during construction.*
+        *Only useful during construction.* An unbounded diagram has no polygon to display.
 
         Returns
         -------
         self: Visualizer
         """
+        if self.voronoi.bounding_poly is None:
+            return self
+
         if hasattr(self.voronoi.bounding_poly, 'radius'):
             # Draw bounding box
             self.canvas.add_patch(
-                patches.Circle((self.voronoi.bounding_poly.xd, self.voronoi.bounding_poly.xd),
+                patches.Circle((self.voronoi.bounding_poly.xd, self.voronoi.bounding_poly.yd),
                                self.voronoi.bounding_poly.radius,
                                fill=False,
                                edgecolor=Colors.BOUNDING_BOX)
@@ -255,7 +257,6 @@ class Visualizer:
         self: Visualizer
         """
         vertices = vertices or self.voronoi.vertices
-        scale = Decimal(str(scale))
 
         for vertex in vertices:
             for edge in vertex.connected_edges:
@@ -264,20 +265,19 @@ class Visualizer:
                 if start is None or end is None:
                     continue
 
-                # Direction vector
-                x_diff = end.xd - start.xd
-                y_diff = end.yd - start.yd
-                length = Decimal.sqrt(x_diff ** 2 + y_diff ** 2)
+                # Direction vector (in floats, so that it works for every numeric backend)
+                x_diff = end.x - start.x
+                y_diff = end.y - start.y
+                length = np.sqrt(x_diff ** 2 + y_diff ** 2)
 
                 if length == 0:
                     continue
 
                 direction = (x_diff / length, y_diff / length)
-                new_end = Coordinate(start.xd + direction[0] * scale, start.yd + direction[1] * scale)
+                new_end = (start.x + direction[0] * scale, start.y + direction[1] * scale)
 
                 props = dict(arrowstyle="->", color=Colors.EDGE_DIRECTION, linewidth=3, **kwargs)
-                self.canvas.annotate(text='', xy=(new_end.xd, new_end.yd), xytext=(start.xd, start.yd),
-                                     arrowprops=props)
+                self.canvas.annotate(text='', xy=new_end, xytext=(start.x, start.y), arrowprops=props)
 
         return self
 
@@ -300,7 +300,7 @@ class Visualizer:
         -------
         self: Visualizer
         """
-        points = points or self.voronoi.sites
+        points = points or self.voronoi.sites or []
 
         xs = [point.xd for point in points]
         ys = [point.yd for point in points]
@@ -537,14 +537,31 @@ class Visualizer:
         # Get axis limits
         max_y = self.max_y
 
-        # Get start and end of edges
-        start = edge.get_origin(sweep_line, max_y)
-        end = edge.twin.get_origin(sweep_line, max_y)
+        # Get start and end of edges, where the breakpoints of unfinished edges use the backend of the diagram
+        with Numeric.use(self.voronoi.numeric):
+            start = edge.get_origin(sweep_line, max_y)
+            end = edge.twin.get_origin(sweep_line, max_y)
 
         return start, end
 
     @staticmethod
-    def _canvas_size(bounding_polygon, offset):
+    def _canvas_size(voronoi, offset):
+        bounding_polygon = voronoi.bounding_poly
+
+        # Without a bounding polygon, the canvas fits the sites and the vertices
+        if bounding_polygon is None:
+            points = (voronoi.sites or []) + voronoi.vertices
+
+            # Before the sweep, there is nothing to fit
+            if not points:
+                return -offset, 1 + offset, -offset, 1 + offset
+
+            max_y = max(point.yd for point in points) + offset
+            max_x = max(point.xd for point in points) + offset
+            min_x = min(point.xd for point in points) - offset
+            min_y = min(point.yd for point in points) - offset
+            return min_x, max_x, min_y, max_y
+
         max_y = bounding_polygon.max_y + offset
         max_x = bounding_polygon.max_x + offset
         min_x = bounding_polygon.min_x - offset